@@ -1,6 +1,7 @@
 # botsmith/core/base/agent.py
 
-from typing import Dict, Any, List
+import asyncio
+from typing import Callable, Dict, Any, List, Optional
 from abc import ABC
 from botsmith.core.interfaces.agent_interface import IAgent
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
@@ -54,50 +55,83 @@ class BaseAgent(IAgent, ABC):
         """
         Safe execution wrapper with guaranteed persistence and scoped memory.
         """
-        self._execution_count += 1
-        
-        # STEP 3: Execution Context (Ephemeral)
-        exec_context = ExecutionContext(agent_id=self.agent_id)
+        exec_context = self._begin_execution()
         
         result = None
         success = False
 
         try:
-            # We pass the execution context into _execute if the subclass supports it,
-            # but for now we keep the interface IAgent for compatibility.
-            # Subclasses can access self._current_exec_context if needed.
-            self._current_exec_context = exec_context
-            
             result = self._execute(task, context)
             success = True
             self._success_count += 1
             return result
 
         except Exception as e:
-            self._failure_count += 1
             result = str(e)
-            exec_context.add_error(result)
-            raise AgentExecutionError(
-                f"Agent '{self.agent_id}' failed to execute task: {str(e)}"
-            ) from e
+            raise self._execution_failed(exec_context, e) from e
 
         finally:
-            # STEP 7: Propose interaction log to Session Memory
-            proposal = MemoryUpdateProposal(
-                key=f"interaction_{self._execution_count}",
-                value={
-                    "task": task,
-                    "result": result,
-                    "success": success,
-                    "exec_context": exec_context.to_dict()
-                },
-                confidence=1.0, # High confidence in own record
-                justification="Agent execution log",
-                suggested_scope=MemoryScope.PROJECT,
-                source=f"agent:{self.agent_id}"
-            )
-            self._memory_manager.propose(proposal)
-            self._current_exec_context = None
+            self._finish_execution(task, result, success, exec_context)
+
+    async def execute_async(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of execute() with the same bookkeeping and memory proposal.
+        """
+        exec_context = self._begin_execution()
+
+        result = None
+        success = False
+
+        try:
+            result = await self._execute_async(task, context)
+            success = True
+            self._success_count += 1
+            return result
+
+        except Exception as e:
+            result = str(e)
+            raise self._execution_failed(exec_context, e) from e
+
+        finally:
+            self._finish_execution(task, result, success, exec_context)
+
+    def _begin_execution(self) -> ExecutionContext:
+        self._execution_count += 1
+        
+        # STEP 3: Execution Context (Ephemeral)
+        exec_context = ExecutionContext(agent_id=self.agent_id)
+
+        # We pass the execution context into _execute if the subclass supports it,
+        # but for now we keep the interface IAgent for compatibility.
+        # Subclasses can access self._current_exec_context if needed.
+        self._current_exec_context = exec_context
+        return exec_context
+
+    def _execution_failed(self, exec_context: ExecutionContext, error: Exception) -> AgentExecutionError:
+        self._failure_count += 1
+        exec_context.add_error(str(error))
+        return AgentExecutionError(
+            f"Agent '{self.agent_id}' failed to execute task: {str(error)}"
+        )
+
+    def _finish_execution(self, task: str, result: Any, success: bool, exec_context: ExecutionContext):
+        # STEP 7: Propose interaction log to Session Memory
+        proposal = MemoryUpdateProposal(
+            # Unique per execution, grouped per agent (retention keeps the latest N per agent)
+            key=f"interaction:{self.agent_id}:{exec_context.step_id}",
+            value={
+                "task": task,
+                "result": result,
+                "success": success,
+                "exec_context": exec_context.to_dict()
+            },
+            confidence=1.0, # High confidence in own record
+            justification="Agent execution log",
+            suggested_scope=MemoryScope.PROJECT,
+            source=f"agent:{self.agent_id}"
+        )
+        self._memory_manager.propose(proposal)
+        self._current_exec_context = None
 
     def propose_memory_update(self, key: str, value: Any, confidence: float, justification: str, scope: MemoryScope = None):
         """
@@ -120,7 +154,37 @@ class BaseAgent(IAgent, ABC):
         """
         raise NotImplementedError
 
+    async def _execute_async(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async task execution logic.
+        Defaults to running _execute in a worker thread; LLM-backed agents
+        override it to await the LLM without holding a thread.
+        """
+        return await asyncio.to_thread(self._execute, task, context)
 
+    def _llm_generate(self, prompt: str, system_prompt: str = "", on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Generate with the agent's LLM.
+        With on_chunk, the response is streamed and on_chunk(text) called per chunk.
+        """
+        if on_chunk is None:
+            return self._llm.generate(prompt, system_prompt)
+
+        chunks = []
+        for chunk in self._llm.stream(prompt, system_prompt):
+            chunks.append(chunk)
+            on_chunk(chunk)
+        return "".join(chunks)
+
+    async def _llm_agenerate(self, prompt: str, system_prompt: str = "", on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        if on_chunk is None:
+            return await self._llm.agenerate(prompt, system_prompt)
+
+        chunks = []
+        async for chunk in self._llm.astream(prompt, system_prompt):
+            chunks.append(chunk)
+            on_chunk(chunk)
+        return "".join(chunks)
 
     def get_capabilities(self) -> List[str]:
         return self._capabilities
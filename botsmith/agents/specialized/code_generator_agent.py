@@ -1,6 +1,10 @@
 import ast
+import posixpath
+from collections import Counter
 from typing import Dict, Any
 from botsmith.agents.base_agent import BaseAgent
+from botsmith.llm.prompt_budget import PromptBudget, truncate
+from botsmith.llm.usage import UsageMeter
 
 
 class CodeGeneratorAgent(BaseAgent):
@@ -9,63 +13,16 @@ class CodeGeneratorAgent(BaseAgent):
     - No filesystem access
     - Uses LLMRouter (inherits from BaseAgent)
     - Validates syntax
+    - Keeps each prompt within the model's context window (PromptBudget)
+    - Sends what every file of a project shares as one stable system prompt
     """
 
-    def _execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    STRUCTURE_HEADER = "Project Structure (other files available):\n"
+    # Part of the prompt budget kept for the per-file prompt (name, purpose)
+    FILE_PROMPT_TOKENS = 256
 
-        filename = context.get("filename")
-        description = context.get("description")
-        files = context.get("files")
-        request = context.get("original_request")
-
-        # Case 1: Batch Mode (from FilePlanAgent)
-        if files and isinstance(files, list):
-            results = []
-            for f in files:
-                fname = f.get("filename")
-                desc = f.get("description")
-                if not fname: 
-                    continue
-                
-                # Recursive call or inline? Inline is safer for now
-                try:
-                    # Pass the full list of files so the LLM knows what to import
-                    project_structure = [x.get("filename") for x in files if x.get("filename")]
-                    res = self._generate_single_file(fname, desc, request, project_structure)
-                    results.append(res)
-                except Exception as e:
-                    results.append({"filename": fname, "error": str(e), "validated": False})
-            
-            return {
-                "generated_files": results,
-                "count": len(results),
-                "status": "success"
-            }
-
-        # Case 2: Single Mode
-        if not filename or not description:
-            raise ValueError("filename/description OR files list required in context")
-
-        project_structure = context.get("project_structure")
-        return self._generate_single_file(filename, description, request, project_structure)
-
-    def _generate_single_file(self, filename: str, description: str, request: str, project_files: list = None) -> Dict[str, Any]:
-        # Context string for other files
-        context_str = ""
-        if project_files:
-            context_str = "Project Structure (other files available):\n" + "\n".join([f"- {f}" for f in project_files])
-
-        # Prompt for code
-        prompt = f"""
-You are a Senior Python Engineer. Generate production-grade code for: {filename}
-
-Project Request:
-{request}
-
-File Purpose:
-{description}
-
-{context_str}
+    # Start of the project prefix (see _project_prefix)
+    SYSTEM_PROMPT = """You are a Senior Python Engineer generating one file of a Python project.
 
 Rules:
 1.  **Architecture**: Follow SOLID principles strictly.
@@ -88,11 +45,169 @@ Rules:
 5.  **Output**:
     -   Output ONLY the raw code/content.
     -   NO markdown blocking (```python).
-    -   NO explanations.
-"""
+    -   NO explanations."""
+
+    def _execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+
+        filename = context.get("filename")
+        description = context.get("description")
+        files = context.get("files")
+        request = context.get("original_request")
+
+        # Case 1: Batch Mode (from FilePlanAgent)
+        if files and isinstance(files, list):
+            batch, prefix, prompts = self._batch_prompts(files, request)
+            return self._batch_results(batch, self._llm.generate_many(prompts, prefix["prompt"]))
+
+        # Case 2: Single Mode
+        if not filename or not description:
+            raise ValueError("filename/description OR files list required in context")
+
+        project_structure = context.get("project_structure")
+        return self._generate_single_file(filename, description, request, project_structure, context.get("on_progress"))
+
+    async def _execute_async(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+
+        filename = context.get("filename")
+        description = context.get("description")
+        files = context.get("files")
+        request = context.get("original_request")
+
+        # Case 1: Batch Mode (from FilePlanAgent)
+        if files and isinstance(files, list):
+            batch, prefix, prompts = self._batch_prompts(files, request)
+            return self._batch_results(batch, await self._llm.agenerate_many(prompts, prefix["prompt"]))
+
+        # Case 2: Single Mode
+        if not filename or not description:
+            raise ValueError("filename/description OR files list required in context")
+
+        project_structure = context.get("project_structure")
+        return await self._agenerate_single_file(filename, description, request, project_structure, context.get("on_progress"))
+
+    def _batch_prompts(self, files: list, request: str):
+        """
+        (files with a filename, project prefix, their prompts). The project
+        prefix is the same for the whole batch, so it is built once here and
+        shared by every prompt.
+        """
+        batch = [f for f in files if f.get("filename")]
+        project_structure = [f["filename"] for f in batch]
+        prefix = self._project_prefix(request, project_structure)
+        prompts = [
+            self._build_prompt(f["filename"], f.get("description"), prefix, project_structure)["prompt"]
+            for f in batch
+        ]
+        return batch, prefix, prompts
+
+    def _batch_results(self, batch: list, outcomes: list) -> Dict[str, Any]:
+        # The LLM batch runs prompts concurrently (per-backend limits apply);
+        # a failed file is reported in place without failing the others
+        results = []
+        for f, outcome in zip(batch, outcomes):
+            if outcome.ok:
+                results.append(self._finalize(f["filename"], outcome.text))
+            else:
+                results.append({"filename": f["filename"], "error": str(outcome.error), "validated": False})
+
+        return {
+            "generated_files": results,
+            "count": len(results),
+            "status": "success"
+        }
+
+    def _generate_single_file(self, filename: str, description: str, request: str, project_files: list = None, on_chunk=None) -> Dict[str, Any]:
+        prefix = self._project_prefix(request, project_files)
+        built = self._build_prompt(filename, description, prefix, project_files)
+        with UsageMeter.tagged(**self._prompt_tags(built)):
+            code = self._llm_generate(built["prompt"], prefix["prompt"], on_chunk=on_chunk)
+        return {**self._finalize(filename, code), "prompt": self._prompt_report(built)}
+
+    async def _agenerate_single_file(self, filename: str, description: str, request: str, project_files: list = None, on_chunk=None) -> Dict[str, Any]:
+        prefix = self._project_prefix(request, project_files)
+        built = self._build_prompt(filename, description, prefix, project_files)
+        with UsageMeter.tagged(**self._prompt_tags(built)):
+            code = await self._llm_agenerate(built["prompt"], prefix["prompt"], on_chunk=on_chunk)
+        return {**self._finalize(filename, code), "prompt": self._prompt_report(built)}
+
+    def _project_prefix(self, request: str, project_files: list = None) -> Dict[str, Any]:
+        """
+        System prompt shared by every file of a project: the rules, the
+        request and the project structure. It depends only on the project,
+        so consecutive files start with the same tokens and Ollama reuses
+        the evaluated prefix from its prompt cache instead of re-reading it.
+
+        FILE_PROMPT_TOKENS of the budget are left for the per-file part.
+        Over budget, the structure is summarised first, then the request
+        is cut.
+        """
+        window = PromptBudget.for_llm(self._llm).max_tokens
+        budget = PromptBudget(window - self.FILE_PROMPT_TOKENS)
+        budget.add("rules", self.SYSTEM_PROMPT, required=True)
+        budget.add("request", f"Project Request:\n{request}" if request else "", priority=2, shrink=truncate)
+        if project_files:
+            budget.add(
+                "project_structure",
+                self.STRUCTURE_HEADER + "\n".join(f"- {f}" for f in project_files),
+                priority=1,
+                shrink=lambda text, max_tokens: truncate(self._summarize_structure(project_files), max_tokens),
+            )
+        return budget.build()
+
+    def _build_prompt(self, filename: str, description: str, prefix: Dict[str, Any], project_files: list = None) -> Dict[str, Any]:
+        """
+        Per-file prompt, sent after the project prefix (see
+        PromptBudget.build() for the returned fields; "tokens" and "budget"
+        cover prefix and file prompt together). When the prefix only has a
+        summary of the structure, the files next to this one are listed here.
+        """
+        budget = PromptBudget.for_llm(self._llm, prefix["prompt"])
+        budget.add(
+            "task",
+            f"Generate production-grade code for: {filename}\n\nFile Purpose:\n{description}",
+            required=True,
+        )
+        if project_files and "project_structure" in prefix["trimmed"] + prefix["dropped"]:
+            directory = posixpath.dirname(filename)
+            siblings = [f for f in project_files if posixpath.dirname(f) == directory and f != filename]
+            budget.add("siblings", "Files in the same directory:\n" + "\n".join(f"- {f}" for f in siblings) if siblings else "", shrink=truncate)
+
+        built = budget.build()
+        return {
+            "prompt": built["prompt"],
+            "tokens": prefix["tokens"] + built["tokens"],
+            "shared_tokens": prefix["tokens"],
+            "budget": prefix["tokens"] + built["budget"],
+            "trimmed": prefix["trimmed"] + built["trimmed"],
+            "dropped": prefix["dropped"] + built["dropped"],
+        }
+
+    def _summarize_structure(self, project_files: list) -> str:
+        """
+        Top-level files by name, every directory as a file count.
+        """
+        top_level = [f for f in project_files if not posixpath.dirname(f)]
+        directories = Counter(posixpath.dirname(f) for f in project_files if posixpath.dirname(f))
+
+        lines = [f"- {f}" for f in top_level]
+        lines += [f"- {d}/ ({count} files)" for d, count in sorted(directories.items())]
+        return self.STRUCTURE_HEADER + "\n".join(lines)
+
+    @staticmethod
+    def _prompt_report(built: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: built[key] for key in ("tokens", "shared_tokens", "budget", "trimmed", "dropped")}
+
+    @staticmethod
+    def _prompt_tags(built: Dict[str, Any]) -> Dict[str, Any]:
+        # Shows up on the call's metrics next to the tokens the backend counted
+        return {
+            "prompt_estimate": built["tokens"],
+            "prompt_shared": built["shared_tokens"],
+            "prompt_budget": built["budget"],
+            "prompt_cut": built["trimmed"] + built["dropped"],
+        }
 
-        code = self._llm.generate(prompt)
-        
+    def _finalize(self, filename: str, code: str) -> Dict[str, Any]:
         # Clean markdown if present
         if code.startswith("```python"):
             code = code.replace("```python", "").replace("```", "")
@@ -5,6 +5,15 @@ from botsmith.agents.base_agent import BaseAgent
 class CostEstimatorAgent(BaseAgent):
     """
     Estimates cost of a compiled workflow before execution.
+
+    With context["usage_history"] (a WorkflowRepository), each step is
+    estimated from the tokens and cost it actually used in recent runs;
+    generate_all_files scales with context["file_count"] from plan_files.
+    Steps without history fall back to the COST_PER_STEP constants.
+
+    The workflow runs it twice: before plan_files, when the file count is
+    not known yet (DEFAULT_FILE_COUNT is assumed), and again once the plan
+    is, before any file is generated.
     """
 
     COST_PER_STEP = {
@@ -16,26 +25,49 @@ class CostEstimatorAgent(BaseAgent):
         "deployment": 3.0,
     }
 
+    # Steps whose usage grows with the number of files they generate
+    PER_FILE_STEPS = ("generate_all_files",)
+    # Assumed file count when the plan is not known yet
+    DEFAULT_FILE_COUNT = 5
+
     def _execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         steps: List[Dict[str, Any]] | None = context.get("steps")
         budget = context.get("budget", 10.0)
+        token_budget = context.get("token_budget")
+        history = context.get("usage_history")
 
         if not steps:
             raise ValueError("No workflow steps provided for cost estimation")
 
+        # Only the plan's count: context["files"] may hold scaffold output
+        file_count = context.get("file_count") or self.DEFAULT_FILE_COUNT
+
         total_cost = 0.0
+        total_tokens = 0
         breakdown = []
 
         for step in steps:
             step_name = step["step"]
-            cost = self.COST_PER_STEP.get(step_name, 1.0)
+            units = file_count if step_name in self.PER_FILE_STEPS else 1
+            average = history.average_step_usage(step_name) if history else None
+
+            if average:
+                cost = average["cost_per_unit"] * units
+                tokens = int(average["tokens_per_unit"] * units)
+                breakdown.append({"step": step_name, "cost": cost, "tokens": tokens, "source": "history"})
+                total_tokens += tokens
+            else:
+                cost = self.COST_PER_STEP.get(step_name, 1.0)
+                breakdown.append({"step": step_name, "cost": cost, "source": "default"})
             total_cost += cost
-            breakdown.append({"step": step_name, "cost": cost})
 
         approved = total_cost <= budget
+        if token_budget is not None:
+            approved = approved and total_tokens <= token_budget
 
         return {
             "estimated_cost": total_cost,
+            "estimated_tokens": total_tokens,
             "budget": budget,
             "approved": approved,
             "breakdown": breakdown,
@@ -8,11 +8,19 @@ class DocumentationAgent(BaseAgent):
     """
 
     def _execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        content = self._llm_generate(self._build_prompt(context), on_chunk=context.get("on_progress"))
+        return self._finalize(context.get("filename"), content)
+
+    async def _execute_async(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        content = await self._llm_agenerate(self._build_prompt(context), on_chunk=context.get("on_progress"))
+        return self._finalize(context.get("filename"), content)
+
+    def _build_prompt(self, context: Dict[str, Any]) -> str:
         filename = context.get("filename")
         description = context.get("description")
         request = context.get("original_request", "")
 
-        prompt = f"""
+        return f"""
 You are a technical writer for a Python project.
 Generate the file content for: {filename}
 
@@ -27,8 +35,8 @@ Rules:
 2. No markdown code blocks (unless the file itself is a markdown file, then use them appropriately for the content).
 3. Be professional and detailed.
 """
-        content = self._llm.generate(prompt)
-        
+
+    def _finalize(self, filename: str, content: str) -> Dict[str, Any]:
         # Cleanup
         if filename.endswith(".txt") and content.startswith("```"):
              content = content.replace("```", "")
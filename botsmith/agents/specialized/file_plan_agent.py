@@ -10,9 +10,40 @@ class FilePlanAgent(BaseAgent):
     - returns a clean file manifest
     - does NOT generate code
     - does NOT write to disk
+
+    The manifest is requested in JSON mode against FILE_PLAN_SCHEMA; a plan
+    that still fails validation after the repair re-ask fails the step
+    instead of silently degrading to a stub plan.
     """
 
+    FILE_PLAN_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "files": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "filename": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                    "required": ["filename", "description"],
+                },
+            },
+        },
+        "required": ["files"],
+    }
+
     def _execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        data = self._llm.generate_json(self._build_prompt(context), self.FILE_PLAN_SCHEMA)
+        return self._build_manifest(data, context)
+
+    async def _execute_async(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        data = await self._llm.agenerate_json(self._build_prompt(context), self.FILE_PLAN_SCHEMA)
+        return self._build_manifest(data, context)
+
+    def _build_prompt(self, context: Dict[str, Any]) -> str:
 
         request = context.get("original_request", "")
         plan = context.get("plan", [])
@@ -23,7 +54,7 @@ class FilePlanAgent(BaseAgent):
             pass
 
         # 1. Construct Prompt
-        prompt = f"""
+        return f"""
 You are an expert Python software architect.
 Your goal is to design the file structure for a Python bot project based on the user's request.
 
@@ -58,34 +89,11 @@ Example JSON Structure:
 Give me the JSON now.
 """
 
-        # 2. Call LLM
-        response = self._llm.generate(prompt)
-
-        # 3. Parse JSON
-        import json
-        import re
-
-        files = []
-        try:
-            # Clean up potential markdown code blocks
-            clean_response = response.strip()
-            if clean_response.startswith("```json"):
-                clean_response = clean_response.replace("```json", "").replace("```", "")
-            elif clean_response.startswith("```"):
-                clean_response = clean_response.replace("```", "")
-            
-            data = json.loads(clean_response)
-            files = data.get("files", [])
-        except json.JSONDecodeError:
-            # Fallback if LLM fails (should rely on a retry or better parser, but for now simple fallback)
-            # Log error ideally
-            print(f"FilePlanAgent: Failed to parse JSON. Response: {response[:100]}...")
-            files = [
-                {"filename": "main.py", "description": "Main entry point (fallback due to parse error)."},
-                {"filename": "requirements.txt", "description": "Dependencies."}
-            ]
-
-        # 4. Post-processing / Validation
+    def _build_manifest(self, data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        # 2. The response was parsed and validated against FILE_PLAN_SCHEMA
+        files = data["files"]
+
+        # 3. Post-processing / Validation
         # Ensure main.py exists
         if not any(f["filename"].endswith("main.py") for f in files):
              p_name = context.get("project_name", "bot")
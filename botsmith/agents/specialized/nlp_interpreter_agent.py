@@ -18,7 +18,12 @@ class NLPInterpreterAgent(BaseAgent):
         self._normalizer = IntentNormalizer()
 
     def _execute(self, task: str, context):
-        parsed = self._parser.parse(task)
+        return self._to_result(self._parser.parse(task), task)
+
+    async def _execute_async(self, task: str, context):
+        return self._to_result(await self._parser.aparse(task), task)
+
+    def _to_result(self, parsed: dict, task: str):
         intent = self._normalizer.normalize(parsed, task)
 
         return {
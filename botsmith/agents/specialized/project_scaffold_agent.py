@@ -6,6 +6,10 @@ class ProjectScaffoldAgent(BaseAgent):
     """
     Deterministic agent that creates a clean, scalable bot project structure.
     No LLM calls. Pure filesystem operations.
+
+    Template files are only written where nothing exists yet: on a re-run
+    the project already holds generated code (e.g. src/<project>/main.py,
+    README.md, requirements.txt), which must not be replaced by stubs.
     """
 
     def _execute(self, task: str, context):
@@ -27,10 +31,11 @@ class ProjectScaffoldAgent(BaseAgent):
         fs.mkdir(package_path)
 
         # __init__.py (required for importable package)
-        fs.write_file(os.path.join(package_path, "__init__.py"), "")
+        self._write_new(fs, os.path.join(package_path, "__init__.py"), "")
 
         # main.py (inside package)
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(package_path, "main.py"),
             f'''"""
 Entry point of the {project_name} bot.
@@ -47,7 +52,8 @@ if __name__ == "__main__":
         )
 
         # run.py (at project root for easy execution)
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, "run.py"),
             f'''#!/usr/bin/env python3
 """
@@ -72,7 +78,8 @@ if __name__ == "__main__":
         )
 
         # requirements.txt (common dependencies)
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, "requirements.txt"),
             f"""# Dependencies for {project_name}
 # Generated by BotSmith
@@ -83,7 +90,8 @@ python-dotenv>=1.0.0
         )
 
         # README.md (comprehensive)
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, "README.md"),
             f'''# {project_name}
 
@@ -134,13 +142,15 @@ MIT License - Generated by BotSmith
         )
 
         # .gitignore
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, ".gitignore"),
             "__pycache__/\\n*.pyc\\n.env\\nbuild/\\ndist/\\n*.egg-info/\\n.venv/\\nvenv/\\n"
         )
 
         # LICENSE
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, "LICENSE"),
             "MIT License\\n\\nCopyright (c) 2024 BotSmith Generated Project\\n..."
         )
@@ -148,14 +158,16 @@ MIT License - Generated by BotSmith
         # tests/ directory
         tests_path = os.path.join(project_name, "tests")
         fs.mkdir(tests_path)
-        fs.write_file(os.path.join(tests_path, "__init__.py"), "")
-        fs.write_file(
+        self._write_new(fs, os.path.join(tests_path, "__init__.py"), "")
+        self._write_new(
+            fs,
             os.path.join(tests_path, "test_basic.py"),
             f"def test_import():\\n    import {project_name}\\n    assert True\\n"
         )
 
         # pyproject.toml
-        fs.write_file(
+        self._write_new(
+            fs,
             os.path.join(project_name, "pyproject.toml"),
             f'''[build-system]
 requires = ["setuptools>=61.0"]
@@ -192,3 +204,9 @@ dependencies = [
             ],
             "scaffolded": True,
         }
+
+    @staticmethod
+    def _write_new(fs, path: str, content: str):
+        if hasattr(fs, "exists") and fs.exists(path):
+            return
+        fs.write_file(path, content)
@@ -1,11 +1,27 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from botsmith.api.deps import get_botsmith_app
 from botsmith.api.routers import health, bot, stream
+from botsmith.persistence.database import ConnectionManager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the BotSmith app at startup rather than on the first request;
+    # this also starts the background model warm-up
+    await asyncio.to_thread(get_botsmith_app)
+    yield
+    ConnectionManager.close_all()
+
 
 app = FastAPI(
     title="BotSmith API",
     description="REST API for BotSmith - AI-powered bot generator",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -6,7 +6,7 @@ from botsmith.app import BotSmithApp
 router = APIRouter()
 
 @router.post("/create", response_model=BotResponse)
-def create_bot(
+async def create_bot(
     request: CreateBotRequest,
     app: BotSmithApp = Depends(get_botsmith_app)
 ):
@@ -16,7 +16,7 @@ def create_bot(
         # and Python package naming conventions (lowercase, underscores).
         project_name = project_name.strip().lower().replace(" ", "_")
 
-        result = app.create_bot(request.prompt, project_name)
+        result = await app.create_bot_async(request.prompt, project_name)
         
         # Extract relevant info for response
         res_data = result.get("result", {})
@@ -1,8 +1,41 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response
 from botsmith.api.schemas import GenericResponse
+from botsmith.api.deps import get_botsmith_app
+from botsmith.app import BotSmithApp
 
 router = APIRouter()
 
 @router.get("/health", response_model=GenericResponse)
 def health_check():
     return GenericResponse(status="ok", message="BotSmith API is running")
+
+@router.get("/health/llm", response_model=GenericResponse)
+def llm_health(app: BotSmithApp = Depends(get_botsmith_app)):
+    """
+    Circuit breaker state per LLM backend (and response cache counters).
+    """
+    backends = app.llm.health()
+    data = {"backends": backends}
+    if app.llm_cache:
+        data["cache"] = app.llm_cache.stats()
+
+    degraded = any(b["state"] != "closed" for b in backends.values())
+    return GenericResponse(
+        status="degraded" if degraded else "ok",
+        message="Some LLM backends are failing" if degraded else "All LLM backends healthy",
+        data=data,
+    )
+
+@router.get("/health/ready", response_model=GenericResponse)
+def readiness(response: Response, app: BotSmithApp = Depends(get_botsmith_app)):
+    """
+    Ready once every configured Ollama model is resident; 503 while warming up.
+    """
+    status = app.warmer.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return GenericResponse(
+        status="ok" if status["ready"] else "warming",
+        message="All models loaded" if status["ready"] else "Models are not loaded yet",
+        data=status,
+    )
@@ -5,10 +5,13 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from botsmith.app import BotSmithApp
 from botsmith.api.deps import get_botsmith_app
-import concurrent.futures
 
 router = APIRouter()
 
+# Strong references to running builds so they are not garbage collected
+# if the client disconnects before the build finishes.
+_background_builds = set()
+
 @router.get("/stream")
 async def stream_bot_creation(prompt: str, project_name: str = "stream_bot", app: BotSmithApp = Depends(get_botsmith_app)):
     """
@@ -18,16 +21,17 @@ async def stream_bot_creation(prompt: str, project_name: str = "stream_bot", app
     # Capture the main event loop
     main_loop = asyncio.get_running_loop()
     
-    # We use a queue to bridge the sync executor callback to the async generator
+    # Events are queued by the build task and drained by the SSE generator
     queue = asyncio.Queue()
     
     def on_event(event_type: str, data: dict):
-        # This runs in the thread pool, so we use the captured main_loop to schedule updates
+        # Usually called on the loop itself, but agents running in worker
+        # threads may emit too, so always go through call_soon_threadsafe
         main_loop.call_soon_threadsafe(queue.put_nowait, {"type": event_type, "data": data})
 
-    def run_bot():
+    async def run_bot():
         try:
-            app.create_bot(prompt, project_name, on_event)
+            await app.create_bot_async(prompt, project_name, on_event)
             # Signal done
             on_event("done", {"status": "success"})
         except Exception as e:
@@ -35,9 +39,10 @@ async def stream_bot_creation(prompt: str, project_name: str = "stream_bot", app
             on_event("done", {"status": "failed"})
 
     async def event_generator() -> AsyncGenerator[str, None]:
-        # Start bot creation in a separate thread
-        # Fire and forget (in thread pool)
-        main_loop.run_in_executor(None, run_bot)
+        # Run bot creation as a task on this event loop (no worker thread)
+        build = asyncio.create_task(run_bot())
+        _background_builds.add(build)
+        build.add_done_callback(_background_builds.discard)
         
         while True:
             # Wait for next event
@@ -1,19 +1,33 @@
 import os
 import json
+import asyncio
 from typing import Dict, Any, List
 from pathlib import Path
 from botsmith.config import settings
 
 from botsmith.utils.config_loader import ConfigLoader
-from botsmith.memory import MemoryManager, SQLiteMemoryManager
+from botsmith.memory import ArtifactStore, MemoryCompactor, MemoryManager, SQLiteMemoryManager
 
 from botsmith.llm import LLMRouter, OllamaLLM, GeminiLLM, GroqLLM
+from botsmith.llm.concurrency import BackendLimiter
+from botsmith.llm.rate_limiter import RateLimiter
+from botsmith.llm.cache import CachedLLM, ResponseCache
+from botsmith.llm.single_flight import CoalescingLLM
+from botsmith.llm.fallback import ModelFallbackLLM
+from botsmith.llm.prompt_budget import PromptBudget
+from botsmith.llm.usage import UsageMeter
+from botsmith.llm.warmup import ModelWarmer
 
 from botsmith.factory.agent_factory import AgentFactory
+from botsmith.persistence.database import ConnectionManager, init_db
+from botsmith.persistence.repository import WorkflowRepository
 from botsmith.workflows.workflow_executor import WorkflowExecutor
 from botsmith.workflows.workflow_factory import WorkflowFactory
 
 from botsmith.agents.registry import AgentRegistry
+from botsmith.core.exceptions.custom_exceptions import ConfigurationError
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.utils.async_utils import run_sync
 
 
 class BotSmithApp:
@@ -27,6 +41,9 @@ class BotSmithApp:
     - WorkflowExecutor
     """
 
+    # Agent types WorkflowExecutor generates files with
+    FILE_AGENT_TYPES = ("coder", "doc_writer")
+
     def __init__(self, config_path: str = None):
         # -------------------------
         # Load configuration
@@ -41,18 +58,67 @@ class BotSmithApp:
         # -------------------------
         # Memory system
         # -------------------------
+        ConnectionManager.configure(
+            busy_timeout_ms=getattr(self.config, "sqlite_busy_timeout_ms", None),
+            synchronous=getattr(self.config, "sqlite_synchronous", None),
+            mmap_size=getattr(self.config, "sqlite_mmap_size", None),
+            cached_statements=getattr(self.config, "sqlite_cached_statements", None),
+        )
+        artifact_path = getattr(self.config, "artifact_store_path", None)
+        artifacts = None
+        if artifact_path:
+            artifacts = ArtifactStore(artifact_path, getattr(self.config, "artifact_inline_limit", 4096))
+
         if getattr(self.config, "use_sqlite_memory", False):
             self.memory_manager = SQLiteMemoryManager(
-                db_path=self.config.sqlite_memory_path
+                db_path=self.config.sqlite_memory_path,
+                durability=getattr(self.config, "memory_durability", "buffered"),
+                flush_interval=getattr(self.config, "memory_flush_interval", 1.0),
+                flush_batch=getattr(self.config, "memory_flush_batch", 64),
+                artifact_store=artifacts,
+                cache_size=getattr(self.config, "memory_cache_size", None),
+                prefetch_prefixes=getattr(self.config, "memory_prefetch_prefixes", ()),
             )
         else:
-            self.memory_manager = MemoryManager()
+            self.memory_manager = MemoryManager(artifact_store=artifacts)
+
+        # Memory retention and VACUUM, in the background
+        self.memory_compactor = MemoryCompactor.from_config(
+            self.config,
+            repository=self.memory_manager.repository,
+            artifact_store=artifacts,
+            stores=[self.memory_manager.preference, self.memory_manager.knowledge],
+        )
+        compaction_interval = getattr(self.config, "memory_compaction_interval", None)
+        if compaction_interval:
+            self.memory_compactor.start(compaction_interval)
 
         # -------------------------
         # LLM Setup (Router)
         # -------------------------
+        BackendLimiter.configure(getattr(self.config, "llm_backend_concurrency", {}))
+        RateLimiter.configure(getattr(self.config, "cloud_rate_limits", {}))
+        UsageMeter.configure(getattr(self.config, "llm_token_prices", {}))
+        PromptBudget.configure(getattr(self.config, "model_context_windows", {}))
+        OllamaLLM.configure(
+            pool_size=getattr(self.config, "ollama_pool_size", None),
+            keepalive_expiry=getattr(self.config, "ollama_keepalive_expiry", None),
+            availability_ttl=getattr(self.config, "ollama_availability_ttl", None),
+            keep_alive=getattr(self.config, "ollama_keep_alive", None),
+        )
+
+        self.llm_cache = None
+        cache_bypass = getattr(self.config, "llm_cache_bypass", False)
+        if getattr(self.config, "llm_cache_enabled", False):
+            self.llm_cache = ResponseCache(
+                db_path=getattr(self.config, "llm_cache_path", "data/llm_cache.db"),
+                max_entries=getattr(self.config, "llm_cache_max_entries", None),
+                max_bytes=getattr(self.config, "llm_cache_max_bytes", None),
+                ttl_seconds=getattr(self.config, "llm_cache_ttl_seconds", None),
+            )
+
         self.local_llm = OllamaLLM(model=self.config.local_model)
-        self.code_llm_instance = OllamaLLM(model=getattr(self.config, "code_model", "qwen2.5-coder"))
+        coalesce = getattr(self.config, "llm_coalescing_enabled", False)
 
         # Cloud backups (optional)
         try:
@@ -65,11 +131,20 @@ class BotSmithApp:
         except Exception:
             self.groq_llm = None
 
-        self.llm = LLMRouter(
-            local_llm=self.local_llm,
-            gemini_llm=self.gemini_llm,
-            groq_llm=self.groq_llm,
+        self.llm = self._router(self.local_llm, cache_bypass, coalesce)
+
+        # File generation gets its own routers, with the code model (or the
+        # agent's tier model) as primary, so it is hedged and falls back too
+        self.code_llm_instance = self._router(
+            OllamaLLM(model=getattr(self.config, "code_model", "qwen2.5-coder")), cache_bypass, coalesce
         )
+        self.tier_llms = self._build_tier_llms(cache_bypass, coalesce)
+
+        # Load the Ollama models in the background so the first request
+        # does not pay the model-load time
+        self.warmer = ModelWarmer([self.local_llm, self.code_llm_instance, *self.tier_llms.values()])
+        if getattr(self.config, "ollama_warmup_enabled", False):
+            self.warmer.start()
 
         # -------------------------
         # Factories
@@ -78,7 +153,8 @@ class BotSmithApp:
         self.agent_factory = AgentFactory(
             local_llm=self.llm, 
             memory_manager=self.memory_manager,
-            code_llm=self.code_llm_instance
+            code_llm=self.code_llm_instance,
+            tier_llms=self.tier_llms,
         )
 
         # Planner instance for WorkflowFactory
@@ -97,26 +173,109 @@ class BotSmithApp:
 
         self.workflow_factory = WorkflowFactory(self.planner, plugin_manager=self.plugin_manager)
 
+        # Run checkpoints
+        self.workflow_repo = None
+        if getattr(self.config, "checkpoint_runs", False):
+            db_path = getattr(self.config, "sqlite_memory_path", None)
+            if db_path:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            init_db(db_path)
+            self.workflow_repo = WorkflowRepository(db_path)
+
         # Executor
-        self.executor = WorkflowExecutor(self.agent_factory)
+        self.executor = WorkflowExecutor(
+            self.agent_factory,
+            workflow_repo=self.workflow_repo,
+            max_file_workers=getattr(self.config, "file_generation_workers", 1),
+            max_parallel_steps=getattr(self.config, "max_parallel_steps", 1),
+            token_budget=getattr(self.config, "run_token_budget", None),
+            cost_budget=getattr(self.config, "run_cost_budget", None),
+        )
+
+    def _router(self, local_llm: ILLMWrapper, cache_bypass: bool, coalesce: bool) -> LLMRouter:
+        """LLMRouter with `local_llm` as primary and the cloud backends as fallbacks."""
+        return LLMRouter(
+            local_llm=local_llm,
+            gemini_llm=self.gemini_llm,
+            groq_llm=self.groq_llm,
+            cache=self.llm_cache,
+            cache_bypass=cache_bypass,
+            failure_threshold=getattr(self.config, "llm_breaker_failure_threshold", 3),
+            cooldown_seconds=getattr(self.config, "llm_breaker_cooldown_seconds", 30),
+            hedging=getattr(self.config, "llm_hedging_enabled", False),
+            hedge_min_delay=getattr(self.config, "llm_hedge_min_delay", 2.0),
+            latency_routing=getattr(self.config, "llm_latency_routing", False),
+            coalesce=coalesce,
+        )
+
+    def _wrap_llm(self, llm: ILLMWrapper, cache_bypass: bool, coalesce: bool) -> ILLMWrapper:
+        """Apply the response cache and request coalescing to a direct backend."""
+        if self.llm_cache:
+            llm = CachedLLM(llm, self.llm_cache, cache_bypass)
+        if coalesce:
+            llm = CoalescingLLM(llm)
+        return llm
+
+    def _build_tier_llms(self, cache_bypass: bool, coalesce: bool) -> Dict[str, ILLMWrapper]:
+        """
+        Build one LLM per configured model tier (agent type -> model).
+        Cloud tiers whose backend is unavailable are skipped, so those agents
+        fall back to the default selection, and so do local tiers whose model
+        is not installed (checked now if Ollama is up, otherwise on first use).
+        Local tiers of the agents that generate files are routed (hedging,
+        cloud fallbacks).
+        """
+        tier_llms: Dict[str, ILLMWrapper] = {}
+        backends = {"ollama": OllamaLLM, "gemini": GeminiLLM, "groq": GroqLLM}
+
+        for agent_type, tier in (getattr(self.config, "model_tiers", {}) or {}).items():
+            backend = tier.get("backend", "ollama")
+            if backend not in backends:
+                raise ConfigurationError(f"Unknown backend '{backend}' for model tier '{agent_type}'")
+            if not tier.get("model"):
+                raise ConfigurationError(f"Model tier '{agent_type}' has no model")
+
+            try:
+                if backend == "ollama":
+                    llm = OllamaLLM(model=tier["model"], options=tier.get("options"), keep_alive=tier.get("keep_alive"))
+                else:
+                    llm = backends[backend](model=tier["model"])
+            except Exception as e:
+                print(f"[Tiers] {agent_type}: {backend} unavailable ({e}), using default LLM")
+                continue
+
+            if backend == "ollama":
+                if llm.is_installed() is False:
+                    print(f"[Tiers] {agent_type}: {llm.model} is not installed (ollama pull {llm.model}), using default LLM")
+                    continue
+                llm = ModelFallbackLLM(llm, fallback=self.local_llm)
+
+            if backend == "ollama" and agent_type in self.FILE_AGENT_TYPES:
+                tier_llms[agent_type] = self._router(llm, cache_bypass, coalesce)
+            else:
+                tier_llms[agent_type] = self._wrap_llm(llm, cache_bypass, coalesce)
+
+        return tier_llms
 
     # ----------------------------------------------------------------------
     # MAIN ENTRY POINT
     # ----------------------------------------------------------------------
-    def create_bot(self, user_request: str, project_name: str, on_event=None) -> Dict[str, Any]:
+    def create_bot(self, user_request: str, project_name: str, on_event=None, force_regenerate: bool = False) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around create_bot_async().
+        """
+        return run_sync(self.create_bot_async(user_request, project_name, on_event, force_regenerate))
+
+    async def create_bot_async(self, user_request: str, project_name: str, on_event=None, force_regenerate: bool = False) -> Dict[str, Any]:
         """
         Full end-to-end pipeline:
         1. Build workflow
         2. Execute workflow
         3. Return results + generated files
-        """
 
-        from botsmith.utils.filesystem import LocalFileSystem
-        
-        # Determine output root. For dev, relative to CWD/generated
-        # or use a configured path.
-        fs_root = Path("generated")
-        fs = LocalFileSystem(str(fs_root))
+        Re-running with the same project name only regenerates files whose
+        inputs changed; force_regenerate=True regenerates every file.
+        """
 
         # Sanitize project name: strip trailing spaces, replace spaces with underscores, lowercase
         sanitized_name = project_name.strip().lower().replace(" ", "_")
@@ -125,7 +284,8 @@ class BotSmithApp:
             "original_request": user_request,
             "project_name": sanitized_name,
             "dry_run": False,
-            "filesystem": fs,
+            "force_regenerate": force_regenerate,
+            **self._runtime_context(),
         }
 
         workflow_def = self.workflow_factory.create_workflow(
@@ -137,9 +297,50 @@ class BotSmithApp:
         if on_event:
              on_event("workflow_start", {"name": workflow_def.get("workflow_name"), "steps": len(workflow_def.get("steps", []))})
 
-        result = self.executor.execute(workflow_def, context, on_event)
+        result = await self.executor.execute_async(workflow_def, context, on_event)
+        await self._flush_memory()
 
         return {
             "workflow": workflow_def,
             "result": result,
         }
+
+    def resume_bot(self, run_id: int, on_event=None) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around resume_bot_async().
+        """
+        return run_sync(self.resume_bot_async(run_id, on_event))
+
+    async def resume_bot_async(self, run_id: int, on_event=None) -> Dict[str, Any]:
+        """
+        Continue an interrupted create_bot() run from its last checkpoint.
+        """
+        result = await self.executor.resume_async(run_id, self._runtime_context(), on_event)
+        await self._flush_memory()
+
+        return {
+            "workflow": self.workflow_repo.get_run(run_id).workflow_def,
+            "result": result,
+        }
+
+    async def _flush_memory(self):
+        """
+        Commit the agents' buffered memory writes once the workflow is done.
+        """
+        await asyncio.to_thread(self.memory_manager.flush)
+
+    def _runtime_context(self) -> Dict[str, Any]:
+        """
+        Context entries that are live objects rather than data; they are not
+        checkpointed and must be rebuilt when a run is resumed.
+        """
+        from botsmith.utils.filesystem import LocalFileSystem
+
+        # Determine output root. For dev, relative to CWD/generated
+        # or use a configured path.
+        fs_root = Path("generated")
+        runtime = {"filesystem": LocalFileSystem(str(fs_root))}
+        if self.workflow_repo:
+            # Past step usage, for CostEstimatorAgent
+            runtime["usage_history"] = self.workflow_repo
+        return runtime
@@ -42,14 +42,33 @@ def create_bot(args):
     console.print(Panel(f"[bold blue]Creating bot:[/bold blue] {project_name}\n[bold blue]Request:[/bold blue] {user_request}", title="BotSmith"))
 
     try:
-        result = app.create_bot(user_request, project_name)
+        result = app.create_bot(user_request, project_name, force_regenerate=args.force)
     except Exception as e:
         console.print(f"[error]Failed to create bot: {e}[/error]")
         if args.debug:
             console.print_exception()
         return
 
-    # Show summary
+    show_result(result, args)
+
+def resume_bot(args):
+    """Handle `botsmith resume` command."""
+    app = BotSmithApp()
+
+    console.print(Panel(f"[bold blue]Resuming run:[/bold blue] {args.run_id}", title="BotSmith"))
+
+    try:
+        result = app.resume_bot(args.run_id)
+    except Exception as e:
+        console.print(f"[error]Failed to resume run: {e}[/error]")
+        if args.debug:
+            console.print_exception()
+        return
+
+    show_result(result, args)
+
+def show_result(result, args):
+    """Print the summary of a create/resume run."""
     res_data = result.get("result", {})
     status = res_data.get("status", "unknown")
     
@@ -77,7 +96,18 @@ def create_bot(args):
         console.print("[error]Bot creation failed![/error]")
         console.print(f"Error: {res_data.get('error')}")
 
-    if args.save_workflow:
+    usage = res_data.get("usage")
+    if usage and usage.get("calls"):
+        console.print(
+            f"[dim]LLM usage: {usage['total_tokens']} tokens "
+            f"({usage['prompt_tokens']} prompt, {usage['completion_tokens']} completion) "
+            f"in {usage['calls']} calls, cost {usage['cost']:.4f}[/dim]"
+        )
+
+    if res_data.get("run_id") is not None:
+        console.print(f"[dim]Run id: {res_data['run_id']} (botsmith resume {res_data['run_id']})[/dim]")
+
+    if getattr(args, "save_workflow", False):
         out = Path("workflow_output.json")
         out.write_text(json.dumps(result.get("workflow", {}), indent=2))
         console.print(f"[dim]Workflow saved to {out.resolve()}[/dim]")
@@ -126,6 +156,26 @@ def init_project(args):
     except Exception as e:
          console.print(f"[error]Init failed: {e}[/error]")
 
+def compact_memory(args):
+    """Apply the memory retention policies and reclaim disk space."""
+    from botsmith.config import settings
+    from botsmith.memory.retention import MemoryCompactor
+
+    compactor = MemoryCompactor.from_config(settings)
+    result = compactor.compact(vacuum_db=not args.no_vacuum)
+
+    table = Table(title="Memory Compaction")
+    table.add_column("Policy", style="green")
+    table.add_column("Deleted", justify="right")
+    for entry in result["policies"]:
+        table.add_row(entry["policy"], str(entry["deleted"]))
+    console.print(table)
+
+    console.print(
+        f"[success]Deleted {result['deleted']} entries and {result['artifacts_deleted']} artifacts, "
+        f"reclaimed {result['reclaimed_bytes']} bytes[/success]"
+    )
+
 def version(args):
     try:
         ver = importlib.metadata.version("botsmith")
@@ -147,8 +197,14 @@ def main():
     create_p.add_argument("prompt", type=str, help="Natural language bot request")
     create_p.add_argument("--name", type=str, help="Project name")
     create_p.add_argument("--save-workflow", action="store_true", help="Save workflow JSON")
+    create_p.add_argument("--force", action="store_true", help="Regenerate every file, even if its inputs are unchanged")
     create_p.set_defaults(func=create_bot)
 
+    # resume
+    resume_p = sub.add_parser("resume", help="Resume an interrupted run from its last checkpoint")
+    resume_p.add_argument("run_id", type=int, help="Run id printed by `botsmith create`")
+    resume_p.set_defaults(func=resume_bot)
+
     # list
     list_p = sub.add_parser("list", help="List generated projects")
     list_p.set_defaults(func=list_projects)
@@ -158,6 +214,11 @@ def main():
     init_p.add_argument("name", type=str, help="Project name")
     init_p.set_defaults(func=init_project)
 
+    # compact-memory
+    compact_p = sub.add_parser("compact-memory", help="Apply memory retention policies and VACUUM the memory database")
+    compact_p.add_argument("--no-vacuum", action="store_true", help="Only delete entries, do not VACUUM")
+    compact_p.set_defaults(func=compact_memory)
+
     # version
     ver_p = sub.add_parser("version", help="Show CLI version")
     ver_p.set_defaults(func=version)
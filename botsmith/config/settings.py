@@ -3,10 +3,131 @@
 # Memory Settings
 use_sqlite_memory = True
 sqlite_memory_path = "data/botsmith.db"
+# Record workflow runs, steps and generated files in sqlite_memory_path so an
+# interrupted run can be resumed (`botsmith resume <run_id>`)
+checkpoint_runs = True
+# SQLite connections are kept open per thread in WAL mode. How long a writer
+# waits for the lock before "database is locked", the fsync level, the bytes
+# read through mmap and the prepared statements cached per connection
+sqlite_busy_timeout_ms = 5000
+sqlite_synchronous = "NORMAL"
+sqlite_mmap_size = 64 * 1024 * 1024
+sqlite_cached_statements = 256
+# Agent memory writes: "buffered" queues them and commits in batches of
+# memory_flush_batch or every memory_flush_interval seconds (a crash loses at
+# most that interval); "write_through" commits each write before returning
+memory_durability = "buffered"
+memory_flush_interval = 1.0
+memory_flush_batch = 64
+# Memory values (generated code) longer than artifact_inline_limit bytes are
+# stored once, by content hash, under artifact_store_path; memory entries keep
+# a reference (hash, size, summary). artifact_store_path = None keeps
+# everything inline
+artifact_store_path = "data/artifacts"
+artifact_inline_limit = 4096
+# USER/PROJECT memory is read on demand; this many entries per scope stay
+# cached in memory. Keys starting with a prefetch prefix are loaded at startup
+memory_cache_size = 1024
+memory_prefetch_prefixes = []
+# Retention for USER/PROJECT memory, per scope and key prefix: max_age_days,
+# max_entries_per_agent (the newest per source are kept) and max_bytes.
+# Applied by the background compaction job and `botsmith compact-memory`
+memory_retention = [
+    {"scope": "project", "prefix": "interaction", "max_age_days": 30, "max_entries_per_agent": 200},
+    {"scope": "project", "max_bytes": 64 * 1024 * 1024},
+]
+# Seconds between background compactions (None = only on demand)
+memory_compaction_interval = 6 * 3600
 
 local_model = "qwen2.5-coder:7b"
 code_model = "qwen2.5-coder:7b"
 
+# Model tiers: agent type -> {"model", "backend", "options"}.
+# backend is "ollama" (default), "gemini" or "groq"; options (and an
+# optional keep_alive) apply to Ollama only. Agent types without a tier use code_model (code
+# agents) or the local router (everything else). Ollama tiers whose model
+# is not installed (`ollama pull <model>`) fall back to the default LLM.
+model_tiers = {
+    "nlp": {"model": "qwen2.5:3b", "options": {"num_predict": 512, "num_ctx": 2048}},
+    "file_planner": {"model": "qwen2.5:3b", "options": {"num_predict": 1024, "num_ctx": 4096}},
+    "doc_writer": {"model": "qwen2.5:3b", "options": {"num_predict": 1536, "num_ctx": 4096}},
+    "coder": {"model": "qwen2.5-coder:7b", "options": {"num_ctx": 8192}},
+}
+# Context window (tokens) per model, used to fit prompts when a tier does not
+# set num_ctx; unknown models get 4096
+model_context_windows = {
+    "qwen2.5-coder:7b": 8192,
+    "qwen2.5:3b": 4096,
+    "models/gemini-1.5-flash": 1000000,
+}
+
+# Concurrency Settings
+# Independent workflow steps run in parallel by WorkflowExecutor (1 = linear)
+max_parallel_steps = 4
+# Files generated in parallel by the generate_all_files step (1 = serial)
+file_generation_workers = 4
+# Max in-flight requests per LLM backend, shared by every caller in the process
+llm_backend_concurrency = {
+    "ollama": 2,
+    "gemini": 4,
+    "groq": 4,
+}
+# Cloud provider quotas, shared by every caller in the process (token buckets);
+# requests wait for budget instead of bursting into 429s
+cloud_rate_limits = {
+    "gemini": {"requests_per_minute": 15, "tokens_per_minute": 1000000},
+    "groq": {"requests_per_minute": 30, "tokens_per_minute": 6000},
+}
+# Price per 1K tokens by backend, for run cost accounting (local Ollama is free)
+llm_token_prices = {
+    "gemini": {"prompt": 0.000075, "completion": 0.0003},
+    "groq": {"prompt": 0.00005, "completion": 0.00008},
+}
+# Per-run LLM usage limits; a run that exceeds one stops after the current
+# step (None = unlimited)
+run_token_budget = None
+run_cost_budget = None
+
+# Ollama HTTP connections, pooled per server and shared by all wrappers
+ollama_pool_size = 10
+# Seconds an idle keep-alive connection stays open (async client)
+ollama_keepalive_expiry = 60
+# Seconds a /api/tags availability probe result is reused
+ollama_availability_ttl = 30
+# How long Ollama keeps a model loaded after each request ("30m", -1 = forever);
+# a tier can override it with its own "keep_alive"
+ollama_keep_alive = "30m"
+# Preload the Ollama models in the background when the app starts
+ollama_warmup_enabled = True
+
+# LLM circuit breakers (per backend, in LLMRouter): consecutive failures that
+# open a backend's circuit, and seconds before a trial request is let through
+llm_breaker_failure_threshold = 3
+llm_breaker_cooldown_seconds = 30
+
+# Hedged requests: an async code request (including streamed file
+# generation, until its first chunk) still unanswered after the backend's
+# p95 latency (never sooner than the min delay) is also sent to the next
+# backend; the first answer wins
+llm_hedging_enabled = True
+llm_hedge_min_delay = 2.0
+# Order fallback backends by observed latency instead of the fixed priority
+llm_latency_routing = False
+
+# Identical LLM requests in flight at the same time share one backend call
+llm_coalescing_enabled = True
+
+# LLM Response Cache
+# Identical requests (model + system prompt + prompt + options) are answered
+# from an SQLite cache; least recently used entries are evicted first
+llm_cache_enabled = True
+llm_cache_path = "data/llm_cache.db"
+llm_cache_max_entries = 5000
+llm_cache_max_bytes = 200 * 1024 * 1024
+llm_cache_ttl_seconds = 7 * 24 * 3600
+# Skip cache reads (responses are still refreshed), e.g. to resample a prompt
+llm_cache_bypass = False
+
 import os
 from dotenv import load_dotenv
 
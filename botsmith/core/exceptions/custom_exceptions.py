@@ -15,6 +15,16 @@ class LLMUnavailableError(BotSmithError):
     pass
 
 
+class ModelNotFoundError(LLMUnavailableError):
+    """Raised when the backend does not have the requested model (e.g. not pulled)."""
+    pass
+
+
+class StructuredOutputError(BotSmithError):
+    """Raised when an LLM response does not parse or match the requested schema."""
+    pass
+
+
 class AgentExecutionError(BotSmithError):
     """Raised when an agent fails during execution."""
     pass
@@ -1,6 +1,27 @@
 # botsmith/core/interfaces/llm_interface.py
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from botsmith.core.exceptions.custom_exceptions import StructuredOutputError
+from botsmith.utils.async_utils import run_sync
+from botsmith.utils.json_schema import extract_json, schema_instructions, validate
+
+
+@dataclass
+class GenerationResult:
+    """
+    Outcome of one prompt in a generate_many() batch.
+    Exactly one of `text` / `error` is set.
+    """
+    text: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class ILLMWrapper(ABC):
@@ -8,6 +29,13 @@ class ILLMWrapper(ABC):
     Abstraction over any LLM provider (Groq, Gemini, OpenAI, local).
     """
 
+    # In-flight requests of a generate_many() batch when the backend has no
+    # BackendLimiter cap and the caller gives no max_in_flight
+    DEFAULT_BATCH_CONCURRENCY = 4
+
+    # How much of a rejected response is quoted back in the repair prompt
+    REPAIR_RESPONSE_CHARS = 4000
+
     @abstractmethod
     def generate(self, prompt: str, system_prompt: str = "") -> str:
         """
@@ -22,6 +50,129 @@ class ILLMWrapper(ABC):
         """
         raise NotImplementedError
 
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        Async variant of generate().
+
+        The default runs generate() in a worker thread; providers with a
+        native async client override it so no thread is held per request.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt)
+
+    def generate_many(self, prompts: List[str], system_prompt: str = "", max_in_flight: Optional[int] = None) -> List[GenerationResult]:
+        """
+        Synchronous wrapper around agenerate_many().
+        """
+        return run_sync(self.agenerate_many(prompts, system_prompt, max_in_flight))
+
+    async def agenerate_many(self, prompts: List[str], system_prompt: str = "", max_in_flight: Optional[int] = None) -> List[GenerationResult]:
+        """
+        Generate a response for every prompt, up to `max_in_flight` at once.
+
+        Results are returned in input order; a failing prompt yields a
+        GenerationResult with `error` set instead of failing the batch.
+        The default in-flight limit is the backend's BackendLimiter cap.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight or self._batch_concurrency())
+
+        async def one(prompt: str) -> GenerationResult:
+            async with semaphore:
+                try:
+                    return GenerationResult(text=await self.agenerate(prompt, system_prompt))
+                except Exception as e:
+                    return GenerationResult(error=e)
+
+        return list(await asyncio.gather(*(one(prompt) for prompt in prompts)))
+
+    def generate_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> Any:
+        """
+        Generate a JSON value matching `schema` (a JSON Schema dict).
+
+        The request goes through complete_json(), which uses the backend's
+        JSON mode where it has one. A response that does not parse or
+        validate gets one repair re-ask quoting the problem; if that fails
+        too, StructuredOutputError is raised.
+        """
+        response = self.complete_json(prompt, schema, system_prompt)
+        try:
+            return self._decode_json(response, schema)
+        except StructuredOutputError as e:
+            response = self.complete_json(self._repair_prompt(prompt, response, e), schema, system_prompt)
+        return self._decode_json(response, schema)
+
+    async def agenerate_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> Any:
+        response = await self.acomplete_json(prompt, schema, system_prompt)
+        try:
+            return self._decode_json(response, schema)
+        except StructuredOutputError as e:
+            response = await self.acomplete_json(self._repair_prompt(prompt, response, e), schema, system_prompt)
+        return self._decode_json(response, schema)
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        """
+        Raw response text for a JSON request.
+
+        The default adds the schema to the system prompt and calls
+        generate(); backends with a JSON mode override it to constrain
+        decoding as well.
+        """
+        return self.generate(prompt, schema_instructions(schema, system_prompt))
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self.agenerate(prompt, schema_instructions(schema, system_prompt))
+
+    def _decode_json(self, response: str, schema: Dict[str, Any]) -> Any:
+        try:
+            data = extract_json(response)
+        except ValueError as e:
+            raise StructuredOutputError(f"Response is not valid JSON: {e}") from e
+
+        errors = validate(data, schema)
+        if errors:
+            raise StructuredOutputError("Response does not match the schema: " + "; ".join(errors[:5]))
+        return data
+
+    def _repair_prompt(self, prompt: str, response: str, error: StructuredOutputError) -> str:
+        return (
+            f"{prompt}\n\n"
+            f"Your previous response was rejected: {error}\n"
+            f"Previous response:\n{(response or '')[:self.REPAIR_RESPONSE_CHARS]}\n\n"
+            "Return the corrected JSON only."
+        )
+
+    def _batch_concurrency(self) -> int:
+        # botsmith.llm imports this module, so import lazily
+        from botsmith.llm.concurrency import BackendLimiter
+
+        backend = getattr(self, "BACKEND", None)
+        return (backend and BackendLimiter.limit(backend)) or self.DEFAULT_BATCH_CONCURRENCY
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        """
+        Yield the response in chunks as the backend produces it.
+
+        The default yields the whole generate() result as a single chunk;
+        providers with native streaming override it.
+        """
+        yield self.generate(prompt, system_prompt)
+
+    async def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """
+        Async variant of stream(). Defaults to one chunk from agenerate().
+        """
+        yield await self.agenerate(prompt, system_prompt)
+
+    @property
+    def model_id(self) -> str:
+        """
+        Backend and model behind this wrapper, e.g. "ollama:qwen2.5-coder:7b".
+        Used to key outputs derived from the model (generation manifests),
+        so wrappers with the same id must be interchangeable.
+        """
+        model = getattr(self, "model", None) or getattr(self, "model_name", None)
+        backend = getattr(self, "BACKEND", type(self).__name__)
+        return f"{backend}:{model}" if model else backend
+
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -1,7 +1,7 @@
 # botsmith/core/interfaces/memory_store.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Tuple, Union
 from botsmith.core.memory.models import MemoryScope
 
 
@@ -32,6 +32,9 @@ class MemoryStore(ABC):
         pass
 
     @abstractmethod
-    def snapshot(self) -> Dict[str, Any]:
-        """Return a full snapshot of the store's current state."""
+    def snapshot(self) -> Union[Dict[str, Any], Iterator[Tuple[str, Any]]]:
+        """
+        Return a full snapshot of the store's current state. Stores backed
+        by a database stream (key, entry) pairs instead of building a dict.
+        """
         pass
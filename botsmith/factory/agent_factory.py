@@ -8,6 +8,7 @@ from botsmith.core.interfaces.memory_interface import IMemoryManager
 
 from botsmith.agents.registry import AgentRegistry
 from botsmith.factory.abstract_factory import AbstractAgentFactory
+from botsmith.llm.router import LLMRouter
 
 
 class AgentFactory(AbstractAgentFactory):
@@ -17,7 +18,7 @@ class AgentFactory(AbstractAgentFactory):
     Responsibilities:
     - Instantiate agents from registry
     - Inject memory manager
-    - Select appropriate LLM per agent type
+    - Select appropriate LLM per agent type (model tiers first)
     - Keep agents dumb and factories smart
     """
 
@@ -26,6 +27,7 @@ class AgentFactory(AbstractAgentFactory):
         local_llm: ILLMWrapper,
         memory_manager: IMemoryManager,
         code_llm: ILLMWrapper | None = None,
+        tier_llms: Dict[str, ILLMWrapper] | None = None,
     ):
         # Local-first LLM (Devstral via Ollama)
         self.local_llm = local_llm
@@ -33,6 +35,9 @@ class AgentFactory(AbstractAgentFactory):
         # Code-capable LLM (can be same as local, or router)
         self.code_llm = code_llm or local_llm
 
+        # Per agent type overrides (e.g. a small fast model for "nlp")
+        self.tier_llms = dict(tier_llms or {})
+
         self.memory_manager = memory_manager
 
     def create_agent(self, config: Dict[str, Any]) -> IAgent:
@@ -61,15 +66,29 @@ class AgentFactory(AbstractAgentFactory):
             **params,
         )
 
+    def model_id_for(self, agent_type: str) -> str:
+        """
+        Id of the model agents of this type generate with (a router's
+        primary: fallbacks only stand in for it).
+        """
+        llm = self._select_llm(agent_type)
+        if isinstance(llm, LLMRouter):
+            llm = llm.primary
+        return llm.model_id
+
     def _select_llm(self, agent_type: str) -> ILLMWrapper:
         """
         Decide which LLM an agent receives.
 
         Rules:
+        - Agent types with a model tier → their tier LLM
         - Code-heavy agents → code_llm
         - Logic / governance agents → local_llm
         """
 
+        if agent_type in self.tier_llms:
+            return self.tier_llms[agent_type]
+
         code_agents = {
             "coder",
             "code_generator",
@@ -0,0 +1,367 @@
+# botsmith/llm/cache.py
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.llm.delegating import DelegatingLLM
+from botsmith.utils.json_schema import schema_instructions
+
+
+def request_key(llm: ILLMWrapper, prompt: str, system_prompt: str = "") -> str:
+    """
+    Identity of a request to `llm`: model id + system prompt + prompt + the
+    wrapper's generation options (its `options` attribute, if any).
+    Shared by the response cache and request coalescing.
+    """
+    options = getattr(llm, "options", None)
+    return ResponseCache.make_key(llm.model_id, system_prompt, prompt, options)
+
+
+def json_request_key(llm: ILLMWrapper, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+    """
+    request_key() of a complete_json() call. Marked separately from plain
+    generate() because JSON mode changes how the backend decodes.
+    """
+    return request_key(llm, prompt, "[json]" + schema_instructions(schema, system_prompt))
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of LLM responses.
+
+    Entries are evicted least-recently-used first once the cache exceeds
+    `max_entries` or `max_bytes`, and expire `ttl_seconds` after they were
+    stored. Limits set to None are not enforced.
+    Safe to share between threads (one connection guarded by a lock).
+
+    Hits do not write: their access times are kept in memory and written
+    with the next put() or eviction (or once ACCESS_FLUSH_THRESHOLD are
+    pending), which is when the LRU order is needed.
+    """
+
+    ACCESS_FLUSH_THRESHOLD = 256
+
+    def __init__(
+        self,
+        db_path: str = "data/llm_cache.db",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        # key -> last access time not written yet
+        self._accessed: Dict[str, float] = {}
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                size INTEGER,
+                created_at REAL,
+                last_access REAL
+            )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "system_prompt": system_prompt or "",
+                "prompt": prompt,
+                "options": options or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._accessed.pop(key, None)
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._accessed[key] = now
+            if len(self._accessed) >= self.ACCESS_FLUSH_THRESHOLD:
+                self._write_accesses()
+                self._conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key: str, model: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._write_accesses()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def evict(self):
+        """Drop expired entries and enforce the size limits."""
+        with self._lock:
+            self._write_accesses()
+            self._evict(time.time())
+            self._conn.commit()
+
+    def _write_accesses(self):
+        """Write the buffered access times (caller holds the lock and commits)."""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        if self.max_entries is not None:
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access").fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._write_accesses()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CachedLLM(DelegatingLLM):
+    """
+    Serves byte-identical requests from a ResponseCache.
+
+    Keyed by model id + system prompt + prompt + the wrapped LLM's generation
+    options (its `options` attribute, if any). With bypass=True the cache is
+    not read, but fresh responses still replace the stored ones; bypassing()
+    does the same for the calls made inside a block (e.g. a forced run).
+    """
+
+    _bypassed: ContextVar[bool] = ContextVar("botsmith_cache_bypassed", default=False)
+
+    def __init__(self, llm: ILLMWrapper, cache: ResponseCache, bypass: bool = False):
+        super().__init__(llm)
+        self.cache = cache
+        self.bypass = bypass
+
+    @classmethod
+    @contextmanager
+    def bypassing(cls, enabled: bool = True):
+        """
+        Skip cache reads for every CachedLLM called inside the block (tasks
+        and worker threads started in it included). Responses are still
+        stored, replacing the cached ones.
+        """
+        token = cls._bypassed.set(enabled or cls._bypassed.get())
+        try:
+            yield
+        finally:
+            cls._bypassed.reset(token)
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        key = self._key(prompt, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.generate(prompt, system_prompt)
+        self._store(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        key = self._key(prompt, system_prompt)
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.agenerate(prompt, system_prompt)
+        await self._astore(key, response)
+        return response
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        """
+        A hit is replayed as a single chunk; a miss is stored once the stream completes.
+        """
+        key = self._key(prompt, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.llm.stream(prompt, system_prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, "".join(chunks))
+
+    async def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        key = self._key(prompt, system_prompt)
+        cached = await self._alookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in self.llm.astream(prompt, system_prompt):
+            chunks.append(chunk)
+            yield chunk
+        await self._astore(key, "".join(chunks))
+
+    def generate_code(self, prompt: str) -> str:
+        if not hasattr(self.llm, "generate_code"):
+            return self.generate(prompt)
+
+        key = self._key(prompt, getattr(self.llm, "CODE_SYSTEM_PROMPT", "generate_code"))
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.generate_code(prompt)
+        self._store(key, response)
+        return response
+
+    async def agenerate_code(self, prompt: str) -> str:
+        if not hasattr(self.llm, "agenerate_code"):
+            return await self.agenerate(prompt)
+
+        key = self._key(prompt, getattr(self.llm, "CODE_SYSTEM_PROMPT", "generate_code"))
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.agenerate_code(prompt)
+        await self._astore(key, response)
+        return response
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        key = json_request_key(self.llm, prompt, schema, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.complete_json(prompt, schema, system_prompt)
+        self._store(key, response)
+        return response
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        key = json_request_key(self.llm, prompt, schema, system_prompt)
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.acomplete_json(prompt, schema, system_prompt)
+        await self._astore(key, response)
+        return response
+
+    def _key(self, prompt: str, system_prompt: str) -> str:
+        return request_key(self.llm, prompt, system_prompt)
+
+    def _reads_bypassed(self) -> bool:
+        return self.bypass or self._bypassed.get()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        if self._reads_bypassed():
+            return None
+        return self.cache.get(key)
+
+    def _store(self, key: str, response: str):
+        # Empty responses are usually failures worth retrying, not answers
+        if response:
+            self.cache.put(key, self.llm.model_id, response)
+
+    # The async paths touch SQLite from a worker thread, off the event loop
+    async def _alookup(self, key: str) -> Optional[str]:
+        if self._reads_bypassed():
+            return None
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def _astore(self, key: str, response: str):
+        if response:
+            await asyncio.to_thread(self.cache.put, key, self.llm.model_id, response)
@@ -0,0 +1,124 @@
+# botsmith/llm/circuit_breaker.py
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker.
+
+    - closed:    requests flow; `failure_threshold` consecutive failures open it
+    - open:      requests are rejected immediately for `cooldown_seconds`
+    - half_open: after the cool-down, one trial request is let through;
+                 success closes the circuit, failure re-opens it
+
+    Thread-safe; one instance is shared by every caller of a backend.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = cooldown_seconds
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+        # counters for metrics
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Whether a request may be sent now. A True in half-open state reserves
+        the single trial request; the caller must report its outcome.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+
+            if state == self.CLOSED:
+                return True
+
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            self._state = self.CLOSED
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            state = self._current_state(time.monotonic())
+
+            if state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release(self):
+        """
+        The request allowed by allow_request() was abandoned (e.g. a hedged
+        request that lost the race) without an outcome: free the trial slot.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(0.0, self.cooldown_seconds - (now - self._opened_at)), 3)
+
+            return {
+                "backend": self.name,
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in": retry_in,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
@@ -0,0 +1,145 @@
+# botsmith/llm/concurrency.py
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Deque, Dict, Optional
+
+
+class BackendSlots:
+    """
+    Counting semaphore shared by threads and event loops.
+
+    Waiters queue in FIFO order. A release hands its slot straight to the
+    next waiter: a thread through its Event, a coroutine by resolving its
+    future on its own loop. Nobody polls, and a waiting coroutine does not
+    run until it actually holds a slot.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        # threading.Event (thread) or (loop, future) (coroutine)
+        self._waiters: Deque[Any] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        # Woken by release(), which hands over its slot (in_use unchanged)
+        event.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over as we were cancelled: pass it on
+            self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(self._wake, future)
+                except RuntimeError:
+                    # Its loop is closed; nobody is waiting there any more
+                    continue
+                return
+            self.in_use -= 1
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+
+class BackendLimiter:
+    """
+    Process-wide cap on in-flight requests per LLM backend.
+
+    Wrappers acquire a slot around every backend call, so concurrent callers
+    (parallel file generation, several API runs) never send a backend more
+    requests than it is configured to serve at once.
+    Backends without a configured limit are unbounded.
+    """
+
+    _limits: Dict[str, int] = {}
+    _slots: Dict[str, BackendSlots] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, limits: Dict[str, int]):
+        """
+        Set per-backend limits, e.g. {"ollama": 2, "gemini": 4}.
+        A limit of 0 or None removes the cap for that backend.
+        """
+        with cls._lock:
+            for backend, limit in (limits or {}).items():
+                if limit:
+                    cls._limits[backend] = int(limit)
+                    cls._slots[backend] = BackendSlots(int(limit))
+                else:
+                    cls._limits.pop(backend, None)
+                    cls._slots.pop(backend, None)
+
+    @classmethod
+    def limit(cls, backend: str) -> Optional[int]:
+        return cls._limits.get(backend)
+
+    @classmethod
+    @contextmanager
+    def slot(cls, backend: str):
+        """
+        Hold one in-flight slot for `backend` for the duration of the block.
+        """
+        slots = cls._slots.get(backend)
+        if slots is None:
+            yield
+            return
+
+        slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    @classmethod
+    @asynccontextmanager
+    async def aslot(cls, backend: str):
+        """
+        Async variant of slot(). Shares the same per-backend cap, so sync and
+        async callers are limited together, without blocking the event loop.
+        """
+        slots = cls._slots.get(backend)
+        if slots is None:
+            yield
+            return
+
+        await slots.aacquire()
+        try:
+            yield
+        finally:
+            slots.release()
@@ -0,0 +1,47 @@
+# botsmith/llm/delegating.py
+
+from typing import Any, AsyncIterator, Dict, Iterator
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+
+
+class DelegatingLLM(ILLMWrapper):
+    """
+    Base for wrappers that add behaviour around another ILLMWrapper
+    (caching, coalescing, ...). Everything not overridden is forwarded
+    to the wrapped instance, so a decorated wrapper can stand in for it.
+    """
+
+    def __init__(self, llm: ILLMWrapper):
+        self.llm = llm
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self.llm.generate(prompt, system_prompt)
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        return await self.llm.agenerate(prompt, system_prompt)
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        return self.llm.stream(prompt, system_prompt)
+
+    def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        return self.llm.astream(prompt, system_prompt)
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return self.llm.complete_json(prompt, schema, system_prompt)
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self.llm.acomplete_json(prompt, schema, system_prompt)
+
+    def is_available(self) -> bool:
+        return self.llm.is_available()
+
+    @property
+    def model_id(self) -> str:
+        return self.llm.model_id
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
@@ -0,0 +1,92 @@
+# botsmith/llm/fallback.py
+
+from typing import Any, AsyncIterator, Dict, Iterator
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.core.exceptions.custom_exceptions import ModelNotFoundError
+from botsmith.llm.delegating import DelegatingLLM
+
+
+class ModelFallbackLLM(DelegatingLLM):
+    """
+    Answers with `fallback` once the wrapped LLM's backend reports that its
+    model is not installed (ModelNotFoundError), e.g. a model tier nobody
+    pulled. Other errors are raised as usual.
+
+    After the switch every attribute (model_id, options, ...) describes the
+    fallback, so prompts are sized and cached for the model that answers.
+    """
+
+    def __init__(self, llm: ILLMWrapper, fallback: ILLMWrapper):
+        super().__init__(llm)
+        self.fallback = fallback
+        self.missing = False
+
+    @property
+    def target(self) -> ILLMWrapper:
+        return self.fallback if self.missing else self.llm
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self._call("generate", prompt, system_prompt)
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        return await self._acall("agenerate", prompt, system_prompt)
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return self._call("complete_json", prompt, schema, system_prompt)
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self._acall("acomplete_json", prompt, schema, system_prompt)
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        if not self.missing:
+            try:
+                yield from self.llm.stream(prompt, system_prompt)
+                return
+            except ModelNotFoundError as e:
+                self._switch(e)
+        yield from self.fallback.stream(prompt, system_prompt)
+
+    async def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        if not self.missing:
+            try:
+                async for chunk in self.llm.astream(prompt, system_prompt):
+                    yield chunk
+                return
+            except ModelNotFoundError as e:
+                self._switch(e)
+        async for chunk in self.fallback.astream(prompt, system_prompt):
+            yield chunk
+
+    def is_available(self) -> bool:
+        return self.target.is_available()
+
+    @property
+    def model_id(self) -> str:
+        return self.target.model_id
+
+    def _call(self, method: str, *args):
+        if not self.missing:
+            try:
+                return getattr(self.llm, method)(*args)
+            except ModelNotFoundError as e:
+                self._switch(e)
+        return getattr(self.fallback, method)(*args)
+
+    async def _acall(self, method: str, *args):
+        if not self.missing:
+            try:
+                return await getattr(self.llm, method)(*args)
+            except ModelNotFoundError as e:
+                self._switch(e)
+        return await getattr(self.fallback, method)(*args)
+
+    def _switch(self, error: ModelNotFoundError):
+        self.missing = True
+        print(f"[LLM] {error}; using {self.fallback.model_id} instead")
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        if name in ("llm", "fallback", "missing"):
+            raise AttributeError(name)
+        return getattr(self.target, name)
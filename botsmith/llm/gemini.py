@@ -1,6 +1,5 @@
 import os
-import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from google.api_core import exceptions
 
 try:
@@ -12,6 +11,10 @@ except ImportError:
 
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
 from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.concurrency import BackendLimiter
+from botsmith.llm.rate_limiter import RateLimiter
+from botsmith.llm.usage import UsageMeter
+from botsmith.utils.json_schema import schema_instructions
 
 
 class GeminiLLM(ILLMWrapper):
@@ -20,6 +23,22 @@ class GeminiLLM(ILLMWrapper):
     Optimized for high-quality code generation.
     """
 
+    BACKEND = "gemini"
+    MAX_ATTEMPTS = 4
+
+    # Gemini's JSON mode; the schema itself is carried in the prompt
+    JSON_CONFIG = {"response_mime_type": "application/json"}
+
+    CODE_SYSTEM_PROMPT = """You are an expert Python developer. Generate clean, working Python code.
+
+Rules:
+1. Output ONLY the Python code, no explanations before or after
+2. Include necessary imports at the top
+3. Add docstrings and comments for clarity
+4. Make the code runnable as a standalone script
+5. Include proper error handling
+6. If it's a bot/agent, include a main() function and if __name__ == "__main__" block"""
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -50,40 +69,86 @@ class GeminiLLM(ILLMWrapper):
             return False
 
     def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self._generate(prompt, system_prompt)
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        return await self._agenerate(prompt, system_prompt)
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return self._generate(prompt, schema_instructions(schema, system_prompt), self.JSON_CONFIG)
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self._agenerate(prompt, schema_instructions(schema, system_prompt), self.JSON_CONFIG)
+
+    def _generate(self, prompt: str, system_prompt: str = "", generation_config: Optional[dict] = None) -> str:
         if not self.is_available():
             raise LLMUnavailableError("Gemini is not available")
 
-        full_prompt = prompt
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\n{prompt}"
+        full_prompt = self._full_prompt(prompt, system_prompt)
+        prompt_tokens = RateLimiter.estimate_tokens(full_prompt)
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            # Waits for the shared per-provider budget (and any 429 pause)
+            RateLimiter.acquire(self.BACKEND, prompt_tokens)
+            try:
+                with BackendLimiter.slot(self.BACKEND):
+                    response = self._model.generate_content(full_prompt, generation_config=generation_config)
+            except exceptions.ResourceExhausted:
+                self._rate_limited(attempt)
+                continue
+            except Exception as e:
+                raise LLMUnavailableError(f"Gemini API error: {e}")
+
+            return self._text(response, prompt_tokens)
+
+    async def _agenerate(self, prompt: str, system_prompt: str = "", generation_config: Optional[dict] = None) -> str:
+        if not self.is_available():
+            raise LLMUnavailableError("Gemini is not available")
 
-        retries = 3
-        delay = 2
+        full_prompt = self._full_prompt(prompt, system_prompt)
+        prompt_tokens = RateLimiter.estimate_tokens(full_prompt)
 
-        for attempt in range(retries):
+        for attempt in range(self.MAX_ATTEMPTS):
+            await RateLimiter.aacquire(self.BACKEND, prompt_tokens)
             try:
-                response = self._model.generate_content(full_prompt)
-                return response.text
+                async with BackendLimiter.aslot(self.BACKEND):
+                    response = await self._model.generate_content_async(full_prompt, generation_config=generation_config)
             except exceptions.ResourceExhausted:
-                if attempt < retries - 1:
-                    print(f"[Gemini] Rate limited. Retrying in {delay}s...")
-                    time.sleep(delay)
-                    delay *= 2
-                else:
-                    raise LLMUnavailableError("Gemini quota exceeded after retries")
+                self._rate_limited(attempt)
+                continue
             except Exception as e:
                 raise LLMUnavailableError(f"Gemini API error: {e}")
 
+            return self._text(response, prompt_tokens)
+
+    def _rate_limited(self, attempt: int):
+        if attempt == self.MAX_ATTEMPTS - 1:
+            raise LLMUnavailableError("Gemini quota exceeded after retries")
+        delay = RateLimiter.penalize(self.BACKEND, attempt)
+        print(f"[Gemini] Rate limited. Retrying in {delay:.1f}s...")
+
+    def _text(self, response, prompt_tokens: int) -> str:
+        text = response.text
+        # usage_metadata holds the real counts; fall back to estimates without it
+        usage = getattr(response, "usage_metadata", None)
+        completion_tokens = getattr(usage, "candidates_token_count", None) or RateLimiter.estimate_tokens(text)
+        RateLimiter.record_usage(self.BACKEND, completion_tokens)
+        UsageMeter.record(
+            self.BACKEND,
+            getattr(usage, "prompt_token_count", None) or prompt_tokens,
+            completion_tokens,
+            model=self.model_name,
+        )
+        return text
+
+    def _full_prompt(self, prompt: str, system_prompt: str = "") -> str:
+        if system_prompt:
+            return f"{system_prompt}\n\n{prompt}"
+        return prompt
+
     def generate_code(self, prompt: str) -> str:
         """Specialized method for code generation with code-focused system prompt."""
-        system_prompt = """You are an expert Python developer. Generate clean, working Python code.
-
-Rules:
-1. Output ONLY the Python code, no explanations before or after
-2. Include necessary imports at the top
-3. Add docstrings and comments for clarity
-4. Make the code runnable as a standalone script
-5. Include proper error handling
-6. If it's a bot/agent, include a main() function and if __name__ == "__main__" block"""
+        return self.generate(prompt, self.CODE_SYSTEM_PROMPT)
 
-        return self.generate(prompt, system_prompt)
+    async def agenerate_code(self, prompt: str) -> str:
+        return await self.agenerate(prompt, self.CODE_SYSTEM_PROMPT)
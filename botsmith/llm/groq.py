@@ -1,31 +1,137 @@
 # botsmith/core/llm/groq.py
 
 import os
-from groq import Groq
+from typing import Any, Dict
+
+from groq import Groq, AsyncGroq, RateLimitError
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
 from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.concurrency import BackendLimiter
+from botsmith.llm.rate_limiter import RateLimiter
+from botsmith.llm.usage import UsageMeter
+from botsmith.utils.json_schema import schema_instructions
 
 
 class GroqLLM(ILLMWrapper):
+    BACKEND = "groq"
+    MAX_ATTEMPTS = 4
+
+    # Groq's JSON mode (requires "JSON" in the prompt, which the schema instructions provide)
+    JSON_FORMAT = {"type": "json_object"}
+
     def __init__(self, model: str = "llama3-8b-8192"):
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise LLMUnavailableError("GROQ_API_KEY not set")
 
         self.client = Groq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key)
         self.model = model
 
     def is_available(self) -> bool:
         return True
 
     def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self._chat(prompt, system_prompt)
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        return await self._achat(prompt, system_prompt)
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return self._chat(prompt, schema_instructions(schema, system_prompt), response_format=self.JSON_FORMAT)
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self._achat(prompt, schema_instructions(schema, system_prompt), response_format=self.JSON_FORMAT)
+
+    def _chat(self, prompt: str, system_prompt: str = "", **request) -> str:
+        messages = self._messages(prompt, system_prompt)
+        prompt_tokens = RateLimiter.estimate_tokens(prompt + system_prompt)
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            RateLimiter.acquire(self.BACKEND, prompt_tokens)
+            try:
+                with BackendLimiter.slot(self.BACKEND):
+                    chat = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        **request,
+                    )
+            except RateLimitError as e:
+                self._rate_limited(attempt, e)
+                continue
+            return self._content(chat, prompt_tokens)
+
+    async def _achat(self, prompt: str, system_prompt: str = "", **request) -> str:
+        messages = self._messages(prompt, system_prompt)
+        prompt_tokens = RateLimiter.estimate_tokens(prompt + system_prompt)
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            await RateLimiter.aacquire(self.BACKEND, prompt_tokens)
+            try:
+                async with BackendLimiter.aslot(self.BACKEND):
+                    chat = await self.async_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        **request,
+                    )
+            except RateLimitError as e:
+                self._rate_limited(attempt, e)
+                continue
+            return self._content(chat, prompt_tokens)
+
+    def _rate_limited(self, attempt: int, error: Exception):
+        if attempt == self.MAX_ATTEMPTS - 1:
+            raise LLMUnavailableError("Groq rate limit exceeded after retries") from error
+        delay = RateLimiter.penalize(self.BACKEND, attempt, self._retry_after(error))
+        print(f"[Groq] Rate limited. Retrying in {delay:.1f}s...")
+
+    def _retry_after(self, error: Exception):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def _content(self, chat, prompt_tokens: int) -> str:
+        content = chat.choices[0].message.content
+        # Charge what the response actually used beyond the estimate
+        usage = getattr(chat, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if total is None:
+            total = prompt_tokens + RateLimiter.estimate_tokens(content)
+        RateLimiter.record_usage(self.BACKEND, max(0, total - prompt_tokens))
+
+        reported_prompt = getattr(usage, "prompt_tokens", None) or prompt_tokens
+        UsageMeter.record(
+            self.BACKEND,
+            reported_prompt,
+            getattr(usage, "completion_tokens", None) or max(0, total - reported_prompt),
+            model=self.model,
+            **self._timings(usage),
+        )
+        return content
+
+    def _timings(self, usage) -> dict:
+        """
+        Groq's usage timings (seconds) as CallMetrics timings; total_time
+        excludes the time spent queued.
+        """
+        completion_time = getattr(usage, "completion_time", None)
+        if completion_time is None:
+            return {}
+
+        queue = getattr(usage, "queue_time", None) or 0.0
+        return {
+            "total_seconds": (getattr(usage, "total_time", None) or 0.0) + queue,
+            "queue_seconds": queue,
+            "prompt_eval_seconds": getattr(usage, "prompt_time", None),
+            "eval_seconds": completion_time,
+        }
+
+    def _messages(self, prompt: str, system_prompt: str = "") -> list:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-
-        chat = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-        )
-        return chat.choices[0].message.content
+        return messages
@@ -0,0 +1,115 @@
+# botsmith/llm/prompt_budget.py
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text and code (as RateLimiter counts)
+    return (len(text or "") + 3) // 4
+
+
+@dataclass
+class PromptSection:
+    """
+    One part of a prompt. When the prompt is over budget, sections are cut
+    from the lowest priority up: `shrink(text, max_tokens)` returns a shorter
+    version (or "" to drop it); sections without shrink are dropped whole.
+    Required sections are never cut.
+    """
+    name: str
+    text: str
+    priority: int = 0
+    required: bool = False
+    shrink: Optional[Callable[[str, int], str]] = None
+
+
+class PromptBudget:
+    """
+    Builds prompts that fit a model's context window.
+
+    The prompt budget is the model's context size minus the tokens reserved
+    for the response and the system prompt. The context size comes from the
+    wrapper's `num_ctx` option, else the configured size for its model,
+    else DEFAULT_CONTEXT_WINDOW; the reserve from `num_predict`, else
+    DEFAULT_RESPONSE_RESERVE.
+    """
+
+    DEFAULT_CONTEXT_WINDOW = 4096
+    DEFAULT_RESPONSE_RESERVE = 1024
+    SEPARATOR = "\n\n"
+
+    _context_windows: Dict[str, int] = {}
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max(1, max_tokens)
+        self.sections: List[PromptSection] = []
+
+    @classmethod
+    def configure(cls, context_windows: Optional[Dict[str, int]] = None, default_context_window: Optional[int] = None):
+        """
+        Context size per model name, e.g. {"qwen2.5-coder:7b": 8192}.
+        """
+        if context_windows is not None:
+            cls._context_windows = dict(context_windows)
+        if default_context_window:
+            cls.DEFAULT_CONTEXT_WINDOW = int(default_context_window)
+
+    @classmethod
+    def for_llm(cls, llm: ILLMWrapper, system_prompt: str = "") -> "PromptBudget":
+        options = getattr(llm, "options", None) or {}
+        model = getattr(llm, "model", None) or getattr(llm, "model_name", None)
+
+        window = options.get("num_ctx") or cls._context_windows.get(model) or cls.DEFAULT_CONTEXT_WINDOW
+        reserve = options.get("num_predict") or cls.DEFAULT_RESPONSE_RESERVE
+        if reserve < 0:
+            # num_predict -1 means "until done": keep the default reserve
+            reserve = cls.DEFAULT_RESPONSE_RESERVE
+        return cls(window - reserve - estimate_tokens(system_prompt))
+
+    def add(self, name: str, text: str, priority: int = 0, required: bool = False, shrink: Optional[Callable[[str, int], str]] = None) -> "PromptBudget":
+        if text:
+            self.sections.append(PromptSection(name, text, priority, required, shrink))
+        return self
+
+    def build(self) -> Dict[str, Any]:
+        """
+        {"prompt", "tokens", "budget", "trimmed", "dropped"}.
+        Sections keep their order; only their contents are cut.
+        """
+        texts = {id(section): section.text for section in self.sections}
+        trimmed, dropped = [], []
+
+        def total() -> int:
+            return estimate_tokens(self.SEPARATOR.join(t for t in texts.values() if t))
+
+        for section in sorted((s for s in self.sections if not s.required), key=lambda s: s.priority):
+            over = total() - self.max_tokens
+            if over <= 0:
+                break
+
+            allowed = estimate_tokens(section.text) - over
+            shorter = section.shrink(section.text, allowed) if section.shrink and allowed > 0 else ""
+            texts[id(section)] = shorter
+            (trimmed if shorter else dropped).append(section.name)
+
+        prompt = self.SEPARATOR.join(t for t in texts.values() if t)
+        return {
+            "prompt": prompt,
+            "tokens": estimate_tokens(prompt),
+            "budget": self.max_tokens,
+            "trimmed": trimmed,
+            "dropped": dropped,
+        }
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    """
+    shrink() that keeps the start of the text.
+    """
+    limit = max(0, max_tokens * 4 - 4)
+    if len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + " ..."
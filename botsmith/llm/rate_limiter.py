@@ -0,0 +1,139 @@
+# botsmith/llm/rate_limiter.py
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate_per_minute`.
+
+    reserve() always succeeds but may leave the bucket in debt; the caller
+    then waits until the debt is repaid. Reservations are therefore served
+    in arrival order and waiting callers never retry in lockstep.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take `amount` tokens; returns the seconds to wait before using them.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+        # A single request larger than the bucket could never be served
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_per_second
+
+
+class RateLimiter:
+    """
+    Process-wide request/token rate limits per cloud provider.
+
+    Wrappers call acquire()/aacquire() before each request, with the
+    estimated prompt tokens, and record_usage() with the tokens the
+    response actually used. A 429 from the provider pauses every caller of
+    that provider for a jittered backoff (penalize()), so callers sharing a
+    key do not all retry at the same moment.
+
+    Providers without configured limits are not throttled.
+    """
+
+    BACKOFF_BASE = 1.0
+    BACKOFF_CAP = 60.0
+
+    _requests: Dict[str, TokenBucket] = {}
+    _tokens: Dict[str, TokenBucket] = {}
+    _blocked_until: Dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, limits: Dict[str, Dict[str, float]]):
+        """
+        e.g. {"gemini": {"requests_per_minute": 15, "tokens_per_minute": 1000000}}
+        A missing or falsy rate disables that limit.
+        """
+        with cls._lock:
+            for provider, provider_limits in (limits or {}).items():
+                provider_limits = provider_limits or {}
+                for buckets, key in ((cls._requests, "requests_per_minute"), (cls._tokens, "tokens_per_minute")):
+                    rate = provider_limits.get(key)
+                    if rate:
+                        buckets[provider] = TokenBucket(rate)
+                    else:
+                        buckets.pop(provider, None)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # ~4 characters per token for English text and code
+        return len(text or "") // 4 + 1
+
+    @classmethod
+    def _reserve(cls, provider: str, tokens: int) -> float:
+        now = time.monotonic()
+        with cls._lock:
+            wait = max(0.0, cls._blocked_until.get(provider, 0.0) - now)
+
+            bucket = cls._requests.get(provider)
+            if bucket:
+                wait = max(wait, bucket.reserve(1, now))
+
+            bucket = cls._tokens.get(provider)
+            if bucket and tokens:
+                wait = max(wait, bucket.reserve(tokens, now))
+
+            return wait
+
+    @classmethod
+    def acquire(cls, provider: str, tokens: int = 0):
+        """
+        Block until a request with `tokens` estimated tokens may be sent.
+        """
+        wait = cls._reserve(provider, tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    @classmethod
+    async def aacquire(cls, provider: str, tokens: int = 0):
+        wait = cls._reserve(provider, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @classmethod
+    def record_usage(cls, provider: str, tokens: int):
+        """
+        Charge tokens that were not known before the request (the response).
+        Later callers absorb the debt.
+        """
+        with cls._lock:
+            bucket = cls._tokens.get(provider)
+            if bucket and tokens:
+                bucket.reserve(tokens, time.monotonic())
+
+    @classmethod
+    def penalize(cls, provider: str, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        The provider rejected a request with a rate-limit error: pause all of
+        its callers for an exponential backoff with jitter (or the server's
+        Retry-After). Returns the pause in seconds; the next acquire() waits it out.
+        """
+        if retry_after is None:
+            ceiling = min(cls.BACKOFF_CAP, cls.BACKOFF_BASE * (2 ** attempt))
+            delay = random.uniform(ceiling / 2, ceiling)
+        else:
+            delay = retry_after
+
+        with cls._lock:
+            until = time.monotonic() + delay
+            cls._blocked_until[provider] = max(cls._blocked_until.get(provider, 0.0), until)
+        return delay
@@ -1,6 +1,18 @@
 # botsmith/core/llm/llm_router.py
 
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.cache import CachedLLM, ResponseCache
+from botsmith.llm.circuit_breaker import CircuitBreaker
+from botsmith.llm.single_flight import CoalescingLLM
+from botsmith.llm.stats import BackendStats
+
+# Marks the end of a stream in _next_chunk()
+_END = object()
 
 
 class LLMRouter(ILLMWrapper):
@@ -12,6 +24,18 @@ class LLMRouter(ILLMWrapper):
     - Groq is SECOND cloud fallback
     - Planning/reasoning ALWAYS uses local Qwen
     - Nothing in the system is allowed to crash due to cloud issues
+    - With a ResponseCache, every backend is cached separately, so a
+      fallback answer is never served for the primary model
+    - With coalesce, identical in-flight requests to a backend share one call
+    - Each backend sits behind a CircuitBreaker: after repeated failures it
+      is skipped immediately until its cool-down allows a trial request
+    - Latency and errors are tracked per backend and task class (code/text).
+      With hedging, an async request still unanswered after the backend's
+      p95 is also sent to the next backend; the first answer wins and the
+      other request is cancelled. latency_routing orders backends by
+      observed latency instead of the fixed priority.
+    - A router can front any local model (e.g. one model tier): prompts are
+      sized for that model, which `primary`, `model` and `options` expose
     """
 
     def __init__(
@@ -19,44 +43,390 @@ class LLMRouter(ILLMWrapper):
         local_llm: ILLMWrapper,
         gemini_llm: ILLMWrapper | None = None,
         groq_llm: ILLMWrapper | None = None,
+        cache: ResponseCache | None = None,
+        cache_bypass: bool = False,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        hedging: bool = False,
+        hedge_min_delay: float = 2.0,
+        latency_routing: bool = False,
+        stats_window: int = 100,
+        coalesce: bool = False,
     ):
+        if cache is not None:
+            local_llm = CachedLLM(local_llm, cache, cache_bypass)
+            gemini_llm = CachedLLM(gemini_llm, cache, cache_bypass) if gemini_llm else None
+            groq_llm = CachedLLM(groq_llm, cache, cache_bypass) if groq_llm else None
+
+        if coalesce:
+            # Outside the cache: concurrent misses for one prompt become one call
+            local_llm = CoalescingLLM(local_llm)
+            gemini_llm = CoalescingLLM(gemini_llm) if gemini_llm else None
+            groq_llm = CoalescingLLM(groq_llm) if groq_llm else None
+
         self.local_llm = local_llm
         self.gemini_llm = gemini_llm
         self.groq_llm = groq_llm
+        self.cache = cache
+
+        # One breaker per backend: an open circuit is skipped without waiting
+        # for it to time out
+        self.breakers = {
+            name: CircuitBreaker(name, failure_threshold, cooldown_seconds)
+            for name in ("local", "gemini", "groq")
+        }
+
+        self.stats = BackendStats(window=stats_window)
+        self.hedging = hedging
+        # Floor for the hedge delay, so cache hits (which drag p95 down)
+        # do not make every uncached request fire twice
+        self.hedge_min_delay = hedge_min_delay
+        self.latency_routing = latency_routing
 
     def is_available(self) -> bool:
         return self.local_llm.is_available()
 
+    @property
+    def model_id(self) -> str:
+        chain = [llm.model_id for llm in (self.local_llm, self.gemini_llm, self.groq_llm) if llm]
+        return "router(" + ",".join(chain) + ")"
+
+    @property
+    def primary(self) -> ILLMWrapper:
+        """The backend that answers unless it fails or is hedged."""
+        return self.local_llm
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.local_llm, "model", None)
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        return getattr(self.local_llm, "options", None) or {}
+
+    @property
+    def BACKEND(self) -> Optional[str]:
+        return getattr(self.local_llm, "BACKEND", None)
+
     def generate(self, prompt: str, system_prompt: str = "") -> str:
+        task_class = self._task_class(prompt, system_prompt)
+        return self._first_response(task_class, self._route(prompt, system_prompt))
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        Async mirror of generate() with the same fallback order, plus hedging.
+        Catches Exception rather than everything so task cancellation still propagates.
+        """
+        task_class = self._task_class(prompt, system_prompt)
+        return await self._afirst_response(task_class, self._route(prompt, system_prompt))
 
-        if self._is_code_task(prompt):
-            # 1️⃣ Local Qwen first (free, strong, reliable)
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        """
+        JSON request with the same backends and fallback order as generate();
+        each backend uses its own JSON mode.
+        """
+        return self._first_response(self._task_class(prompt, system_prompt), self._json_route(prompt, schema, system_prompt))
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self._afirst_response(self._task_class(prompt, system_prompt), self._json_route(prompt, schema, system_prompt))
+
+    def stream(self, prompt: str, system_prompt: str = ""):
+        """
+        Streams from the local model. If it is open-circuited or fails before
+        producing anything, the cloud fallbacks answer as a single chunk.
+        Streams are not hedged: chunks cannot be merged across backends.
+        """
+        last_error = None
+        breaker = self.breakers["local"]
+
+        if breaker.allow_request():
+            produced = False
+            try:
+                for chunk in self.local_llm.stream(prompt, system_prompt):
+                    produced = True
+                    yield chunk
+            except Exception as e:
+                breaker.record_failure()
+                if produced:
+                    raise
+                last_error = e
+            except BaseException:
+                # Closed early (GeneratorExit) or interrupted: no verdict,
+                # but a half-open trial must not stay reserved
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return
+
+        candidates = self._route(prompt, system_prompt, exclude=("local",))
+        yield self._first_response(self._task_class(prompt, system_prompt), candidates, last_error)
+
+    async def astream(self, prompt: str, system_prompt: str = ""):
+        """
+        Async stream(). With hedging, a local stream that has not produced
+        its first chunk after the backend's p95 races the fallbacks: if they
+        answer first, their response is yielded as a single chunk and the
+        stream is dropped; once the first chunk arrives, the stream wins.
+        The whole stream's duration is recorded as the local latency.
+        """
+        task_class = self._task_class(prompt, system_prompt)
+        candidates = self._route(prompt, system_prompt, exclude=("local",))
+        last_error = None
+        breaker = self.breakers["local"]
+
+        if breaker.allow_request():
+            started = time.monotonic()
+            chunks = self.local_llm.astream(prompt, system_prompt).__aiter__()
+            first = asyncio.ensure_future(self._next_chunk(chunks))
+            hedge = None
+            produced = False
+            settled = False
             try:
-                return self.local_llm.generate(prompt, system_prompt)
-            except:
-                pass
+                delay = self._hedge_delay("local", task_class)
+                if delay is not None and candidates:
+                    done, _ = await asyncio.wait({first}, timeout=delay)
+                    if not done:
+                        hedge = asyncio.create_task(self._afirst_response(task_class, candidates))
+                        if await self._race_first_chunk(first, hedge) == "hedge":
+                            settled = True
+                            if first.done():
+                                self._record("local", task_class, started, success=False)
+                            else:
+                                # Lost the race: no verdict on the backend's health
+                                first.cancel()
+                                breaker.release()
+                            yield hedge.result()
+                            return
+                        if hedge.done():
+                            # The fallbacks already failed; do not ask them again
+                            candidates = []
+
+                chunk = await first
+                if chunk is not _END:
+                    produced = True
+                    yield chunk
+                    async for chunk in chunks:
+                        yield chunk
+            except Exception as e:
+                self._record("local", task_class, started, success=False)
+                if produced:
+                    raise
+                last_error = e
+            except BaseException:
+                # Closed early, cancelled or interrupted before a verdict:
+                # free a half-open trial, or the backend is never tried again
+                if not settled:
+                    breaker.release()
+                raise
+            else:
+                self._record("local", task_class, started, success=True)
+                return
+            finally:
+                for task in (first, hedge):
+                    if task is not None and not task.done():
+                        task.cancel()
+                await asyncio.gather(*(t for t in (first, hedge) if t is not None), return_exceptions=True)
+
+        yield await self._afirst_response(task_class, candidates, last_error)
+
+    @staticmethod
+    async def _next_chunk(chunks):
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return _END
+
+    @staticmethod
+    async def _race_first_chunk(first: asyncio.Future, hedge: asyncio.Task) -> str:
+        """
+        "local" once the stream's first chunk arrives, "hedge" if the
+        fallbacks answer first. If both fail, "local" (its error is raised).
+        """
+        pending = {first, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if first in done and first.exception() is None:
+                return "local"
+            if hedge in done and hedge.exception() is None:
+                return "hedge"
+        return "local"
+
+    def _first_response(self, task_class: str, candidates, last_error: Exception | None = None) -> str:
+        """
+        Try candidates in order, skipping open circuits; return the first answer.
+        """
+        for name, llm, method, args in candidates:
+            if not self.breakers[name].allow_request():
+                continue
 
-            # 2️⃣ Gemini (best quality)
+            started = time.monotonic()
+            try:
+                response = getattr(llm, method)(*args)
+            except Exception as e:
+                self._record(name, task_class, started, success=False)
+                last_error = e
+                continue
+            self._record(name, task_class, started, success=True)
+            return response
+
+        raise self._exhausted(last_error)
+
+    async def _afirst_response(self, task_class: str, candidates, last_error: Exception | None = None) -> str:
+        """
+        Async _first_response(). With hedging, a candidate that is slower than
+        its p95 races the next candidate.
+        """
+        pending = list(candidates)
+
+        while pending:
+            primary = self._launch(task_class, pending)
+            if primary is None:
+                break
+
+            racers = {primary}
+            delay = self._hedge_delay(primary.get_name(), task_class)
+            try:
+                if delay is not None and pending:
+                    done, _ = await asyncio.wait(racers, timeout=delay)
+                    if not done:
+                        hedge = self._launch(task_class, pending)
+                        if hedge is not None:
+                            racers.add(hedge)
+
+                while racers:
+                    done, racers = await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                        last_error = task.exception()
+            finally:
+                # Cancel the loser (or everything, if we were cancelled ourselves)
+                for task in racers:
+                    task.cancel()
+                if racers:
+                    await asyncio.gather(*racers, return_exceptions=True)
+
+        raise self._exhausted(last_error)
+
+    def _launch(self, task_class: str, pending: list) -> Optional[asyncio.Task]:
+        """
+        Start the next candidate whose circuit allows a request (removing
+        skipped candidates from `pending`). Returns None if none is left.
+        """
+        while pending:
+            name, llm, method, args = pending.pop(0)
+            if self.breakers[name].allow_request():
+                # The task name carries the backend, for the hedge delay lookup
+                return asyncio.create_task(self._attempt(task_class, name, llm, method, args), name=name)
+        return None
+
+    async def _attempt(self, task_class: str, name: str, llm: ILLMWrapper, method: str, args: tuple) -> str:
+        started = time.monotonic()
+        try:
+            async_method = getattr(llm, "a" + method, None)
+            if async_method is None:
+                response = await asyncio.to_thread(getattr(llm, method), *args)
+            else:
+                response = await async_method(*args)
+        except asyncio.CancelledError:
+            # Lost a hedge race: no verdict on the backend's health
+            self.breakers[name].release()
+            raise
+        except Exception:
+            self._record(name, task_class, started, success=False)
+            raise
+        self._record(name, task_class, started, success=True)
+        return response
+
+    def _record(self, name: str, task_class: str, started: float, success: bool):
+        self.stats.record(name, task_class, time.monotonic() - started, success)
+        if success:
+            self.breakers[name].record_success()
+        else:
+            self.breakers[name].record_failure()
+
+    def _hedge_delay(self, name: str, task_class: str) -> Optional[float]:
+        if not self.hedging:
+            return None
+        p95 = self.stats.percentile(name, task_class, 95)
+        if p95 is None:
+            return None
+        return max(p95, self.hedge_min_delay)
+
+    def _route(self, prompt: str, system_prompt: str = "", exclude: Tuple[str, ...] = ()) -> List[Tuple[str, ILLMWrapper, str, tuple]]:
+        """
+        Ordered candidates for a request: (backend, llm, sync method name, args).
+        The async path calls the same name prefixed with "a" when the LLM has it.
+
+        - Code tasks: local Qwen (free, strong, reliable) → Gemini (best
+          quality) → Groq; by observed latency with latency_routing
+        - Non-code tasks: local only
+        The caller's system prompt goes to every backend (Gemini's code
+        system prompt only stands in when there is none).
+        """
+        candidates = [("local", self.local_llm, "generate", (prompt, system_prompt))]
+
+        if self._task_class(prompt, system_prompt) == "code":
             if self.gemini_llm and self.gemini_llm.is_available():
-                try:
-                    if hasattr(self.gemini_llm, "generate_code"):
-                        return self.gemini_llm.generate_code(prompt)
-                    return self.gemini_llm.generate(prompt)
-                except:
-                    pass
-
-            # 3️⃣ Groq
+                if system_prompt:
+                    candidates.append(("gemini", self.gemini_llm, "generate", (prompt, system_prompt)))
+                else:
+                    method = "generate_code" if hasattr(self.gemini_llm, "generate_code") else "generate"
+                    candidates.append(("gemini", self.gemini_llm, method, (prompt,)))
+
             if self.groq_llm and self.groq_llm.is_available():
-                try:
-                    return self.groq_llm.generate(prompt)
-                except:
-                    pass
+                candidates.append(("groq", self.groq_llm, "generate", (prompt, system_prompt)))
+
+            if self.latency_routing:
+                candidates = self._by_latency(candidates, "code")
+
+        return [c for c in candidates if c[0] not in exclude]
+
+    def _json_route(self, prompt: str, schema: Dict[str, Any], system_prompt: str = ""):
+        return [
+            (name, llm, "complete_json", (prompt, schema, system_prompt))
+            for name, llm, _, _ in self._route(prompt, system_prompt)
+        ]
+
+    def _by_latency(self, candidates, task_class: str):
+        """
+        Order by expected latency. Backends without enough samples go first,
+        in priority order, so they get measured.
+        """
+        def expected(indexed):
+            position, candidate = indexed
+            latency = self.stats.expected_latency(candidate[0], task_class)
+            return (0, position) if latency is None else (1, latency)
+
+        return [c for _, c in sorted(enumerate(candidates), key=expected)]
+
+    def _task_class(self, prompt: str, system_prompt: str = "") -> str:
+        # Agents may keep their instructions in the system prompt
+        return "code" if self._is_code_task(f"{system_prompt}\n{prompt}") else "text"
+
+    def _exhausted(self, last_error: Exception | None) -> LLMUnavailableError:
+        if last_error is None:
+            return LLMUnavailableError("All LLM backends are unavailable (circuits open)")
+        return LLMUnavailableError(f"All LLM backends failed: {last_error}")
 
-            # 4️⃣ Final fallback (never fail)
-            return self.local_llm.generate(prompt)
+    def health(self) -> Dict[str, Any]:
+        """
+        Circuit breaker state and rolling latency per configured backend,
+        for metrics/health checks.
+        """
+        configured = {"local": self.local_llm, "gemini": self.gemini_llm, "groq": self.groq_llm}
+        latency = self.stats.snapshot()
 
-        # Non-code → always use Qwen locally
-        return self.local_llm.generate(prompt, system_prompt)
+        health = {}
+        for name, breaker in self.breakers.items():
+            llm = configured[name]
+            if llm is None:
+                continue
+            health[name] = {**breaker.snapshot(), "latency": latency.get(name, {})}
+            if isinstance(llm, CoalescingLLM):
+                health[name]["coalescing"] = llm.stats()
+        return health
 
     def _is_code_task(self, prompt: str) -> bool:
         p = prompt.lower()
@@ -0,0 +1,279 @@
+# botsmith/llm/single_flight.py
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.cache import json_request_key, request_key
+from botsmith.llm.delegating import DelegatingLLM
+
+# Ends a broadcast stream (an exception ends it with that error)
+_END = object()
+
+
+class StreamBroadcast:
+    """
+    The chunks of one in-flight stream, fanned out to every subscriber.
+    A subscriber that joins late first gets the chunks produced so far.
+    `deliver` callbacks must not block: they only queue the item.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._history: List[str] = []
+        self._subscribers: List[Callable[[Any], None]] = []
+        self._end: Any = None
+
+    def subscribe(self, deliver: Callable[[Any], None]):
+        with self._lock:
+            for chunk in self._history:
+                deliver(chunk)
+            if self._end is not None:
+                deliver(self._end)
+            else:
+                self._subscribers.append(deliver)
+
+    def unsubscribe(self, deliver: Callable[[Any], None]):
+        with self._lock:
+            if deliver in self._subscribers:
+                self._subscribers.remove(deliver)
+
+    def publish(self, chunk: str):
+        with self._lock:
+            self._history.append(chunk)
+            for deliver in self._subscribers:
+                deliver(chunk)
+
+    def close(self, end: Any = _END):
+        with self._lock:
+            self._end = end
+            for deliver in self._subscribers:
+                deliver(end)
+            self._subscribers = []
+
+
+class CoalescingLLM(DelegatingLLM):
+    """
+    Single-flight layer: identical requests (same request_key) that are in
+    flight at the same time are sent to the backend once, and every caller
+    gets that one result (or error).
+
+    Unlike CachedLLM nothing is stored: once the request completes, the
+    next identical call goes to the backend again. Sync and async callers,
+    on any thread or event loop, share the same in-flight request.
+
+    Identical streams are coalesced the same way: the first caller streams
+    from the backend and every chunk is fanned out to the callers that
+    joined, each through its own queue (late joiners get the chunks so far
+    first).
+    """
+
+    def __init__(self, llm: ILLMWrapper):
+        super().__init__(llm)
+        self._in_flight: Dict[str, Future] = {}
+        self._streams: Dict[str, StreamBroadcast] = {}
+        self._lock = threading.Lock()
+
+        # counters for metrics
+        self.leaders = 0
+        self.coalesced = 0
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self._coalesce(
+            request_key(self.llm, prompt, system_prompt),
+            lambda: self.llm.generate(prompt, system_prompt),
+        )
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        return await self._acoalesce(
+            request_key(self.llm, prompt, system_prompt),
+            lambda: self.llm.agenerate(prompt, system_prompt),
+        )
+
+    def generate_code(self, prompt: str) -> str:
+        if not hasattr(self.llm, "generate_code"):
+            return self.generate(prompt)
+        return self._coalesce(self._code_key(prompt), lambda: self.llm.generate_code(prompt))
+
+    async def agenerate_code(self, prompt: str) -> str:
+        if not hasattr(self.llm, "agenerate_code"):
+            return await self.agenerate(prompt)
+        return await self._acoalesce(self._code_key(prompt), lambda: self.llm.agenerate_code(prompt))
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return self._coalesce(
+            json_request_key(self.llm, prompt, schema, system_prompt),
+            lambda: self.llm.complete_json(prompt, schema, system_prompt),
+        )
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        return await self._acoalesce(
+            json_request_key(self.llm, prompt, schema, system_prompt),
+            lambda: self.llm.acomplete_json(prompt, schema, system_prompt),
+        )
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        key = request_key(self.llm, prompt, system_prompt)
+        broadcast, leader = self._join_stream(key)
+        if not leader:
+            yield from self._follow(broadcast)
+            return
+
+        try:
+            for chunk in self.llm.stream(prompt, system_prompt):
+                broadcast.publish(chunk)
+                yield chunk
+        except Exception as e:
+            self._end_stream(key, broadcast, e)
+            raise
+        except BaseException:
+            self._end_stream(key, broadcast, LLMUnavailableError("Coalesced stream was interrupted"))
+            raise
+        self._end_stream(key, broadcast)
+
+    async def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        key = request_key(self.llm, prompt, system_prompt)
+        broadcast, leader = self._join_stream(key)
+        if not leader:
+            async for chunk in self._afollow(broadcast):
+                yield chunk
+            return
+
+        try:
+            async for chunk in self.llm.astream(prompt, system_prompt):
+                broadcast.publish(chunk)
+                yield chunk
+        except Exception as e:
+            self._end_stream(key, broadcast, e)
+            raise
+        except BaseException:
+            # Leader cancelled or closed early: followers get an error they can fall back on
+            self._end_stream(key, broadcast, LLMUnavailableError("Coalesced stream was cancelled"))
+            raise
+        self._end_stream(key, broadcast)
+
+    def _code_key(self, prompt: str) -> str:
+        return request_key(self.llm, prompt, getattr(self.llm, "CODE_SYSTEM_PROMPT", "generate_code"))
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """
+        (future of the in-flight request for `key`, whether we lead it).
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+
+            future = Future()
+            # RUNNING futures cannot be cancelled by one impatient waiter
+            future.set_running_or_notify_cancel()
+            self._in_flight[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result=None, error: BaseException = None):
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def _coalesce(self, key: str, call: Callable[[], str]) -> str:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except Exception as e:
+            self._settle(key, future, error=e)
+            raise
+        except BaseException:
+            self._settle(key, future, error=LLMUnavailableError("Coalesced request was interrupted"))
+            raise
+        self._settle(key, future, result)
+        return result
+
+    async def _acoalesce(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await call()
+        except Exception as e:
+            self._settle(key, future, error=e)
+            raise
+        except BaseException:
+            # Leader cancelled: waiters get an error they can fall back on
+            self._settle(key, future, error=LLMUnavailableError("Coalesced request was cancelled"))
+            raise
+        self._settle(key, future, result)
+        return result
+
+    def _join_stream(self, key: str) -> Tuple[StreamBroadcast, bool]:
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is not None:
+                self.coalesced += 1
+                return broadcast, False
+
+            broadcast = StreamBroadcast()
+            self._streams[key] = broadcast
+            self.leaders += 1
+            return broadcast, True
+
+    def _end_stream(self, key: str, broadcast: StreamBroadcast, end: Any = _END):
+        with self._lock:
+            self._streams.pop(key, None)
+        broadcast.close(end)
+
+    @staticmethod
+    def _follow(broadcast: StreamBroadcast) -> Iterator[str]:
+        items: "queue.Queue[Any]" = queue.Queue()
+        broadcast.subscribe(items.put_nowait)
+        try:
+            while True:
+                item = items.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            broadcast.unsubscribe(items.put_nowait)
+
+    @staticmethod
+    async def _afollow(broadcast: StreamBroadcast) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        items: "asyncio.Queue[Any]" = asyncio.Queue()
+
+        def deliver(item):
+            try:
+                loop.call_soon_threadsafe(items.put_nowait, item)
+            except RuntimeError:
+                # This follower's loop is closed
+                pass
+
+        broadcast.subscribe(deliver)
+        try:
+            while True:
+                item = await items.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            broadcast.unsubscribe(deliver)
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._in_flight) + len(self._streams)
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": in_flight}
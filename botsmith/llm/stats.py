@@ -0,0 +1,95 @@
+# botsmith/llm/stats.py
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class RollingWindow:
+    """
+    The last `size` outcomes of one backend for one task class.
+    Latencies are kept for successful calls only.
+    """
+
+    def __init__(self, size: int):
+        self.latencies: Deque[float] = deque(maxlen=size)
+        self.outcomes: Deque[bool] = deque(maxlen=size)
+
+    def record(self, latency: float, success: bool):
+        self.outcomes.append(success)
+        if success:
+            self.latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        # nearest-rank percentile
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class BackendStats:
+    """
+    Rolling latency and error statistics keyed by (backend, task class).
+    Thread-safe; shared by the sync and async routing paths.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._windows: Dict[Tuple[str, str], RollingWindow] = {}
+        self._lock = threading.Lock()
+
+    def record(self, backend: str, task_class: str, latency: float, success: bool):
+        with self._lock:
+            key = (backend, task_class)
+            if key not in self._windows:
+                self._windows[key] = RollingWindow(self.window)
+            self._windows[key].record(latency, success)
+
+    def percentile(self, backend: str, task_class: str, q: float) -> Optional[float]:
+        """
+        Latency percentile, or None until `min_samples` successes were seen.
+        """
+        with self._lock:
+            window = self._windows.get((backend, task_class))
+            if window is None or len(window.latencies) < self.min_samples:
+                return None
+            return window.percentile(q)
+
+    def error_rate(self, backend: str, task_class: str) -> float:
+        with self._lock:
+            window = self._windows.get((backend, task_class))
+            return window.error_rate if window else 0.0
+
+    def expected_latency(self, backend: str, task_class: str) -> Optional[float]:
+        """
+        Median latency inflated by the error rate (a failed attempt costs a
+        retry elsewhere), used to order backends. None without enough data.
+        """
+        p50 = self.percentile(backend, task_class, 50)
+        if p50 is None:
+            return None
+        return p50 / max(1.0 - self.error_rate(backend, task_class), 0.05)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            windows = dict(self._windows)
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for (backend, task_class), window in windows.items():
+            result.setdefault(backend, {})[task_class] = {
+                "samples": len(window.outcomes),
+                "p50": window.percentile(50),
+                "p95": window.percentile(95),
+                "error_rate": round(window.error_rate, 3),
+            }
+        return result
@@ -0,0 +1,215 @@
+# botsmith/llm/usage.py
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+TIMING_FIELDS = ("total_seconds", "queue_seconds", "load_seconds", "prompt_eval_seconds", "eval_seconds")
+
+
+@dataclass
+class CallMetrics:
+    """
+    One LLM call: tokens, cost and the timings the backend reports.
+
+    Timings are None when the backend does not report them (Gemini).
+    queue_seconds is time the request waited before the backend worked on
+    it; for Ollama it is what total_duration leaves after load, prompt
+    processing and decoding.
+    """
+    backend: str
+    model: Optional[str]
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float = 0.0
+    total_seconds: Optional[float] = None
+    queue_seconds: Optional[float] = None
+    load_seconds: Optional[float] = None
+    prompt_eval_seconds: Optional[float] = None
+    eval_seconds: Optional[float] = None
+    tags: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        """Decode speed."""
+        if not self.eval_seconds:
+            return None
+        return self.completion_tokens / self.eval_seconds
+
+    @property
+    def prompt_tokens_per_sec(self) -> Optional[float]:
+        if not self.prompt_eval_seconds:
+            return None
+        return self.prompt_tokens / self.prompt_eval_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "backend": self.backend,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": round(self.cost, 6),
+            **self.tags,
+        }
+        for name in TIMING_FIELDS:
+            value = getattr(self, name)
+            data[name] = None if value is None else round(value, 3)
+        data["tokens_per_sec"] = _rounded(self.tokens_per_sec)
+        data["prompt_tokens_per_sec"] = _rounded(self.prompt_tokens_per_sec)
+        return data
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+class TokenUsage:
+    """
+    Token, cost and timing totals of the LLM calls made inside one
+    UsageMeter.track() block, plus the calls themselves.
+    Thread-safe: a step's file workers may record into it concurrently.
+    """
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.cost = 0.0
+        self.records: List[CallMetrics] = []
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, call: CallMetrics):
+        with self._lock:
+            self.prompt_tokens += call.prompt_tokens
+            self.completion_tokens += call.completion_tokens
+            self.calls += 1
+            self.cost += call.cost
+            self.records.append(call)
+
+    def by_model(self) -> Dict[str, Dict[str, Any]]:
+        """
+        to_dict() per model (backend name for calls without a model).
+        """
+        with self._lock:
+            records = list(self.records)
+
+        groups: Dict[str, TokenUsage] = {}
+        for call in records:
+            groups.setdefault(call.model or call.backend, TokenUsage()).add(call)
+        return {name: usage.to_dict() for name, usage in groups.items()}
+
+    def calls_detail(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [call.to_dict() for call in self.records]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.prompt_tokens + self.completion_tokens,
+                "calls": self.calls,
+                "cost": round(self.cost, 6),
+                "timing": self._timing(),
+            }
+
+    def _timing(self) -> Dict[str, Any]:
+        """
+        Summed timings over the calls that report them, and the overall
+        decode / prompt-processing speed of those calls.
+        """
+        timed = [call for call in self.records if call.eval_seconds is not None]
+        timing = {
+            name: round(sum(getattr(call, name) or 0.0 for call in timed), 3)
+            for name in TIMING_FIELDS
+        }
+        completion = sum(call.completion_tokens for call in timed)
+        prompt = sum(call.prompt_tokens for call in timed)
+        timing["timed_calls"] = len(timed)
+        timing["tokens_per_sec"] = _rounded(completion / timing["eval_seconds"]) if timing["eval_seconds"] else None
+        timing["prompt_tokens_per_sec"] = (
+            _rounded(prompt / timing["prompt_eval_seconds"]) if timing["prompt_eval_seconds"] else None
+        )
+        return timing
+
+
+class UsageMeter:
+    """
+    Process-wide token accounting for LLM calls.
+
+    Backends call record() with the usage (and timings) each response
+    reports. Every TokenUsage opened with track() in the calling context
+    (a run, a step inside it) is charged, so concurrent steps each see only
+    their own calls. Calls carry the tags set with tagged() (step, agent,
+    file). The context follows asyncio tasks and asyncio.to_thread workers.
+
+    Cost is priced per 1K tokens per backend, e.g.
+    {"gemini": {"prompt": 0.000075, "completion": 0.0003}}; unpriced
+    backends (local Ollama) cost nothing.
+    """
+
+    _prices: Dict[str, Dict[str, float]] = {}
+    _active: ContextVar[Tuple[TokenUsage, ...]] = ContextVar("botsmith_token_usage", default=())
+    _tags: ContextVar[Dict[str, Any]] = ContextVar("botsmith_usage_tags", default={})
+
+    @classmethod
+    def configure(cls, prices: Dict[str, Dict[str, float]]):
+        cls._prices = dict(prices or {})
+
+    @classmethod
+    @contextmanager
+    def track(cls, usage: Optional[TokenUsage] = None) -> Iterator[TokenUsage]:
+        """
+        Collect the usage of every LLM call made inside the block
+        (into `usage`, or a fresh TokenUsage).
+        """
+        usage = usage or TokenUsage()
+        token = cls._active.set(cls._active.get() + (usage,))
+        try:
+            yield usage
+        finally:
+            cls._active.reset(token)
+
+    @classmethod
+    @contextmanager
+    def tagged(cls, **tags):
+        """
+        Attach tags (e.g. step="plan_files", agent="file_planner") to the
+        calls made inside the block; nested blocks add to or override them.
+        """
+        token = cls._tags.set({**cls._tags.get(), **tags})
+        try:
+            yield
+        finally:
+            cls._tags.reset(token)
+
+    @classmethod
+    def record(cls, backend: str, prompt_tokens: int, completion_tokens: int, model: Optional[str] = None, **timings):
+        """
+        Charge one call. `timings` are CallMetrics timing fields in seconds.
+        """
+        prompt_tokens = int(prompt_tokens or 0)
+        completion_tokens = int(completion_tokens or 0)
+        call = CallMetrics(
+            backend=backend,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=cls.cost(backend, prompt_tokens, completion_tokens),
+            tags=dict(cls._tags.get()),
+            **timings,
+        )
+        for usage in cls._active.get():
+            usage.add(call)
+
+    @classmethod
+    def cost(cls, backend: str, prompt_tokens: int, completion_tokens: int) -> float:
+        price = cls._prices.get(backend) or {}
+        return (prompt_tokens * price.get("prompt", 0.0) + completion_tokens * price.get("completion", 0.0)) / 1000
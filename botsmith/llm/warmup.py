@@ -0,0 +1,105 @@
+# botsmith/llm/warmup.py
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.core.exceptions.custom_exceptions import ModelNotFoundError
+from botsmith.llm.delegating import DelegatingLLM
+from botsmith.llm.router import LLMRouter
+from botsmith.llm.wrapper import OllamaLLM
+
+
+class ModelWarmer:
+    """
+    Preloads the Ollama models an app uses and reports whether they are
+    resident.
+
+    Wrapped LLMs (cache, coalescing, routers) are unwrapped; non-Ollama backends are
+    ignored. start() loads the models one at a time on a daemon thread, so
+    startup does not block and models do not compete for memory while
+    loading. status() asks each server (/api/ps) which models are actually
+    resident, since keep_alive may have expired since the warm-up.
+    Models the server does not have are reported as "missing" and do not
+    hold up readiness: their agents fall back to the default model.
+    """
+
+    def __init__(self, llms: Iterable[ILLMWrapper]):
+        self.models: Dict[Tuple[str, str], OllamaLLM] = {}
+        for llm in llms:
+            while isinstance(llm, (DelegatingLLM, LLMRouter)):
+                llm = llm.primary if isinstance(llm, LLMRouter) else llm.llm
+            if isinstance(llm, OllamaLLM):
+                self.models.setdefault((llm.base_url, llm.model), llm)
+
+        self._states: Dict[Tuple[str, str], Dict[str, Any]] = {key: {"state": "pending"} for key in self.models}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Warm all models in the background. No-op if already started.
+        """
+        if self._thread is not None or not self.models:
+            return
+        self._thread = threading.Thread(target=self.warm, name="botsmith-warmup", daemon=True)
+        self._thread.start()
+
+    def warm(self):
+        """
+        Load every model, one after another. Failures are recorded, not raised.
+        """
+        for key, llm in self.models.items():
+            self._set(key, state="loading")
+            started = time.monotonic()
+            try:
+                llm.preload()
+            except ModelNotFoundError as e:
+                self._set(key, state="missing", error=str(e))
+                print(f"[Warmup] {e}")
+                continue
+            except Exception as e:
+                self._set(key, state="failed", error=str(e))
+                print(f"[Warmup] Failed to load {llm.model}: {e}")
+                continue
+
+            elapsed = round(time.monotonic() - started, 2)
+            self._set(key, state="ready", load_seconds=elapsed)
+            print(f"[Warmup] {llm.model} loaded in {elapsed}s")
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        {"ready": all models resident, "models": {model: state}}.
+        A model counts as resident only if its server lists it in /api/ps.
+        Missing models are left out of "ready".
+        """
+        loaded_by_server: Dict[str, Any] = {}
+        models = {}
+
+        for key, llm in self.models.items():
+            base_url, model = key
+            if base_url not in loaded_by_server:
+                try:
+                    loaded_by_server[base_url] = llm.loaded_models()
+                except Exception:
+                    loaded_by_server[base_url] = None
+
+            with self._lock:
+                entry = dict(self._states[key])
+            loaded = loaded_by_server[base_url]
+            entry["resident"] = loaded is not None and llm.is_loaded(loaded)
+            models[model] = entry
+
+        return {
+            "ready": all(entry["resident"] or entry["state"] == "missing" for entry in models.values()),
+            "models": models,
+        }
+
+    def _set(self, key: Tuple[str, str], **state):
+        with self._lock:
+            self._states[key] = state
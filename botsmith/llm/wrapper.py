@@ -1,49 +1,404 @@
 # botsmith/core/llm/wrapper.py
 
+import asyncio
+import json
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
-from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError, ModelNotFoundError
+from botsmith.llm.concurrency import BackendLimiter
+from botsmith.llm.usage import UsageMeter
+from botsmith.utils.json_schema import schema_instructions
 
 
 class OllamaLLM(ILLMWrapper):
     """
     Local LLM wrapper using Ollama.
     Devstral is the default local coding model.
+
+    All wrappers talking to the same server share one pooled HTTP session
+    (and one async client per event loop), so connections are kept alive
+    across calls. The /api/tags availability probe is cached for
+    AVAILABILITY_TTL seconds per server; a failed request invalidates it.
+
+    keep_alive (per instance, else the class-wide KEEP_ALIVE) is sent with
+    every request and controls how long Ollama keeps the model loaded.
     """
 
-    def __init__(self, model: str = "qwen2.5-coder:7b", base_url: str = "http://localhost:11434"):
+    BACKEND = "ollama"
+    TIMEOUT = 300 # Increased timeout for slow generations
+    PROBE_TIMEOUT = 2
+
+    # Connection pool settings (see configure())
+    POOL_SIZE = 10
+    KEEPALIVE_EXPIRY = 60
+    AVAILABILITY_TTL = 30
+
+    # How long Ollama keeps a model resident after a request, e.g. "30m" or
+    # -1 (forever); None leaves the server default (5 minutes)
+    KEEP_ALIVE = None
+
+    _sessions: Dict[str, requests.Session] = {}
+    _async_clients = weakref.WeakKeyDictionary()  # event loop -> {base_url: httpx.AsyncClient}
+    _availability: Dict[str, Tuple[bool, float]] = {}  # base_url -> (available, expires_at)
+    _pool_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model: str = "qwen2.5-coder:7b",
+        base_url: str = "http://localhost:11434",
+        options: Optional[dict] = None,
+        keep_alive: Optional[Any] = None,
+    ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        # Ollama generation options sent with every request (num_predict, num_ctx, temperature, ...)
+        self.options = dict(options or {})
+        self.keep_alive = keep_alive
+
+    @classmethod
+    def configure(
+        cls,
+        pool_size: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        availability_ttl: Optional[float] = None,
+        keep_alive: Optional[Any] = None,
+    ):
+        """
+        Tune connection pooling (applies to sessions/clients created
+        afterwards) and the default model keep_alive.
+        """
+        if pool_size:
+            cls.POOL_SIZE = int(pool_size)
+        if keepalive_expiry is not None:
+            cls.KEEPALIVE_EXPIRY = keepalive_expiry
+        if availability_ttl is not None:
+            cls.AVAILABILITY_TTL = availability_ttl
+        if keep_alive is not None:
+            cls.KEEP_ALIVE = keep_alive
+
+    # ------------------------------------------------------------------
+    # Connection pooling
+    # ------------------------------------------------------------------
+    def _session(self) -> requests.Session:
+        with self._pool_lock:
+            session = self._sessions.get(self.base_url)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[self.base_url] = session
+            return session
+
+    def _async_client(self):
+        """
+        Pooled httpx client for the running event loop. Clients cannot be
+        shared between loops, so each loop gets its own.
+        """
+        loop = asyncio.get_running_loop()
+        with self._pool_lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(self.base_url)
+            if client is None:
+                client = httpx.AsyncClient(
+                    timeout=self.TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=self.POOL_SIZE,
+                        max_keepalive_connections=self.POOL_SIZE,
+                        keepalive_expiry=self.KEEPALIVE_EXPIRY,
+                    ),
+                )
+                clients[self.base_url] = client
+            return client
+
+    # ------------------------------------------------------------------
+    # Availability
+    # ------------------------------------------------------------------
+    def _cached_availability(self) -> Optional[bool]:
+        cached = self._availability.get(self.base_url)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def _set_availability(self, available: bool):
+        self._availability[self.base_url] = (available, time.monotonic() + self.AVAILABILITY_TTL)
+
+    def invalidate_availability(self):
+        self._availability.pop(self.base_url, None)
 
     def is_available(self) -> bool:
+        cached = self._cached_availability()
+        if cached is not None:
+            return cached
+
         try:
-            resp = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return resp.status_code == 200
+            resp = self._session().get(f"{self.base_url}/api/tags", timeout=self.PROBE_TIMEOUT)
+            available = resp.status_code == 200
         except requests.RequestException:
-            return False
+            available = False
+
+        self._set_availability(available)
+        return available
+
+    async def ais_available(self) -> bool:
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.is_available)
+
+        cached = self._cached_availability()
+        if cached is not None:
+            return cached
+
+        try:
+            resp = await self._async_client().get(f"{self.base_url}/api/tags", timeout=self.PROBE_TIMEOUT)
+            available = resp.status_code == 200
+        except httpx.HTTPError:
+            available = False
+
+        self._set_availability(available)
+        return available
+
+    # ------------------------------------------------------------------
+    # Model residency
+    # ------------------------------------------------------------------
+    def preload(self):
+        """
+        Load the model into memory without generating anything, so the
+        next real request does not pay the load time.
+        """
+        payload = {"model": self.model}
+        payload.update(self._keep_alive_field())
+
+        try:
+            resp = self._session().post(f"{self.base_url}/api/generate", json=payload, timeout=self.TIMEOUT)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise self._request_failed(e) from e
+
+    def is_installed(self) -> Optional[bool]:
+        """
+        Whether the server has this model (/api/tags); None if it cannot be asked.
+        """
+        try:
+            resp = self._session().get(f"{self.base_url}/api/tags", timeout=self.PROBE_TIMEOUT)
+            resp.raise_for_status()
+        except requests.RequestException:
+            return None
+        installed = {m.get("name", m.get("model")) for m in resp.json().get("models", [])}
+        return self.model in installed or f"{self.model}:latest" in installed
+
+    def loaded_models(self) -> Dict[str, dict]:
+        """
+        Models currently resident on this server (/api/ps), by name.
+        """
+        try:
+            resp = self._session().get(f"{self.base_url}/api/ps", timeout=self.PROBE_TIMEOUT)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise LLMUnavailableError(f"Ollama Request Failed: {e}") from e
+        return {m.get("name", m.get("model")): m for m in resp.json().get("models", [])}
+
+    def is_loaded(self, loaded: Optional[Dict[str, dict]] = None) -> bool:
+        """
+        Whether this wrapper's model is resident (untagged names match ":latest").
+        """
+        loaded = self.loaded_models() if loaded is None else loaded
+        return self.model in loaded or f"{self.model}:latest" in loaded
+
+    def _keep_alive_field(self) -> dict:
+        keep_alive = self.keep_alive if self.keep_alive is not None else self.KEEP_ALIVE
+        return {} if keep_alive is None else {"keep_alive": keep_alive}
+
+    def _request_failed(self, error: Exception) -> LLMUnavailableError:
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code == 404:
+            # The server is up, it just does not have the model
+            return ModelNotFoundError(f"Ollama model '{self.model}' is not installed (ollama pull {self.model})")
+
+        # The server may have gone away: probe again on the next call
+        self.invalidate_availability()
+        print(f"[Ollama Error] {str(error)}")
+        return LLMUnavailableError(f"Ollama Request Failed: {str(error)}")
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
 
     def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return self._post(self._build_payload(prompt, system_prompt))
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        if not HTTPX_AVAILABLE:
+            # No async HTTP client installed: fall back to a worker thread
+            return await super().agenerate(prompt, system_prompt)
+        return await self._apost(self._build_payload(prompt, system_prompt))
+
+    def complete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        """
+        JSON request constrained by Ollama's `format` (the schema itself).
+        """
+        payload = self._build_payload(prompt, schema_instructions(schema, system_prompt))
+        payload["format"] = schema
+        return self._post(payload)
+
+    async def acomplete_json(self, prompt: str, schema: Dict[str, Any], system_prompt: str = "") -> str:
+        if not HTTPX_AVAILABLE:
+            return await super().acomplete_json(prompt, schema, system_prompt)
+
+        payload = self._build_payload(prompt, schema_instructions(schema, system_prompt))
+        payload["format"] = schema
+        return await self._apost(payload)
+
+    def _post(self, payload: dict) -> str:
         if not self.is_available():
             raise LLMUnavailableError("Ollama is not running or unreachable")
 
+        try:
+            with BackendLimiter.slot(self.BACKEND):
+                resp = self._session().post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=self.TIMEOUT,
+                )
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            # Catch Timeout, ConnectionError, HTTPError, etc.
+            raise self._request_failed(e) from e
+
+        return self._response_text(resp.json())
+
+    async def _apost(self, payload: dict) -> str:
+        if not await self.ais_available():
+            raise LLMUnavailableError("Ollama is not running or unreachable")
+
+        try:
+            async with BackendLimiter.aslot(self.BACKEND):
+                resp = await self._async_client().post(f"{self.base_url}/api/generate", json=payload)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            raise self._request_failed(e) from e
+
+        return self._response_text(resp.json())
+
+    def stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        """
+        Stream the response from Ollama's NDJSON API.
+        TIMEOUT applies between chunks, not to the whole generation.
+        """
+        if not self.is_available():
+            raise LLMUnavailableError("Ollama is not running or unreachable")
+
+        payload = self._build_payload(prompt, system_prompt, stream=True)
+
+        try:
+            with BackendLimiter.slot(self.BACKEND):
+                with self._session().post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=self.TIMEOUT,
+                    stream=True,
+                ) as resp:
+                    resp.raise_for_status()
+                    for line in resp.iter_lines():
+                        chunk = self._decode_stream_line(line)
+                        if chunk:
+                            yield chunk
+        except requests.RequestException as e:
+            raise self._request_failed(e) from e
+
+    async def astream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        if not HTTPX_AVAILABLE:
+            async for chunk in super().astream(prompt, system_prompt):
+                yield chunk
+            return
+
+        if not await self.ais_available():
+            raise LLMUnavailableError("Ollama is not running or unreachable")
+
+        payload = self._build_payload(prompt, system_prompt, stream=True)
+
+        try:
+            async with BackendLimiter.aslot(self.BACKEND):
+                async with self._async_client().stream("POST", f"{self.base_url}/api/generate", json=payload) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        chunk = self._decode_stream_line(line)
+                        if chunk:
+                            yield chunk
+        except httpx.HTTPError as e:
+            raise self._request_failed(e) from e
+
+    def _build_payload(self, prompt: str, system_prompt: str = "", stream: bool = False) -> dict:
         payload = {
             "model": self.model,
             "prompt": prompt if not system_prompt else f"{system_prompt}\n\n{prompt}",
-            "stream": False,
+            "stream": stream,
         }
+        if self.options:
+            payload["options"] = self.options
+        payload.update(self._keep_alive_field())
+        return payload
 
-        try:
-            resp = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=300, # Increased timeout for slow generations
-            )
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            # Catch Timeout, ConnectionError, HTTPError, etc.
-            print(f"[Ollama Error] {str(e)}")
-            raise LLMUnavailableError(
-                f"Ollama Request Failed: {str(e)}"
-            ) from e
-            
-        return resp.json().get("response", "")
+    def _decode_stream_line(self, line) -> str:
+        """
+        Text of one NDJSON line of a streamed response ("" for keep-alives
+        and the final "done" record, which carries the token counts).
+        """
+        if not line:
+            return ""
+        data = json.loads(line)
+        if "error" in data:
+            raise LLMUnavailableError(f"Ollama Request Failed: {data['error']}")
+        if data.get("done"):
+            return self._response_text(data)
+        return data.get("response", "")
+
+    def _response_text(self, data: dict) -> str:
+        """
+        Text of a completed response, recording the token counts and timings
+        Ollama reports (prompt_eval_count is omitted when the prompt was
+        served from cache).
+        """
+        UsageMeter.record(
+            self.BACKEND,
+            data.get("prompt_eval_count", 0),
+            data.get("eval_count", 0),
+            model=self.model,
+            **self._timings(data),
+        )
+        return data.get("response", "")
+
+    @staticmethod
+    def _timings(data: dict) -> dict:
+        """
+        Ollama's *_duration fields (nanoseconds) as CallMetrics timings in seconds.
+        """
+        if "total_duration" not in data:
+            return {}
+
+        total = data["total_duration"] / 1e9
+        load = data.get("load_duration", 0) / 1e9
+        prompt_eval = data.get("prompt_eval_duration", 0) / 1e9
+        decode = data.get("eval_duration", 0) / 1e9
+        return {
+            "total_seconds": total,
+            "load_seconds": load,
+            "prompt_eval_seconds": prompt_eval,
+            "eval_seconds": decode,
+            # Time not spent loading, reading the prompt or decoding: waiting
+            # for the server (Ollama queues requests beyond its parallelism)
+            "queue_seconds": max(0.0, total - load - prompt_eval - decode),
+        }
@@ -5,3 +5,6 @@ from botsmith.memory.sqlite_manager import SQLiteMemoryManager
 from botsmith.memory.memory_policy import MemoryPolicy
 from botsmith.memory.session import SessionMemory
 from botsmith.memory.long_term import PreferenceMemory, KnowledgeMemory
+from botsmith.memory.write_behind import WriteBehindRepository
+from botsmith.memory.artifact_store import ArtifactStore
+from botsmith.memory.retention import MemoryCompactor, RetentionPolicy
@@ -0,0 +1,137 @@
+# botsmith/memory/artifact_store.py
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for large memory values (generated files).
+
+    Each text is written once under its SHA-256, sharded by the first two
+    hex digits (root/ab/abcd...); storing the same content again only
+    returns its reference (and refreshes the file's mtime). Memory entries keep the reference instead of
+    the text:
+
+        {"$artifact": "<sha256>", "size": 5120, "lines": 130, "summary": "import os"}
+
+    externalize() swaps every string longer than `inline_limit` bytes in a
+    (nested) value for its reference; resolve() puts the texts back.
+    """
+
+    REF_KEY = "$artifact"
+    SUMMARY_CHARS = 80
+
+    def __init__(self, root: str, inline_limit: int = 4096):
+        self.root = Path(root)
+        self.inline_limit = inline_limit
+
+    # ------------------------------------------------------------------
+    # Content
+    # ------------------------------------------------------------------
+    def put(self, text: str) -> Dict[str, Any]:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+
+        try:
+            # Already stored: refresh the mtime, which the compactor's grace
+            # window goes by, so a new reference is not collected under it
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so a reader never sees a partial artifact
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+        return {
+            self.REF_KEY: digest,
+            "size": len(data),
+            "lines": text.count("\n") + 1,
+            "summary": self._summary(text),
+        }
+
+    def get(self, ref: Any) -> str:
+        """
+        Text of a reference (or a bare hash). Raises FileNotFoundError if
+        the artifact is gone.
+        """
+        digest = ref[self.REF_KEY] if isinstance(ref, dict) else ref
+        return self._path(digest).read_text(encoding="utf-8")
+
+    def exists(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def stat(self, digest: str) -> Optional[os.stat_result]:
+        try:
+            return self._path(digest).stat()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, digest: str) -> bool:
+        try:
+            self._path(digest).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def digests(self) -> Iterator[str]:
+        if not self.root.exists():
+            return
+        for shard in self.root.iterdir():
+            if shard.is_dir() and len(shard.name) == 2:
+                for path in shard.iterdir():
+                    if not path.name.startswith("."):
+                        yield path.name
+
+    # ------------------------------------------------------------------
+    # Values
+    # ------------------------------------------------------------------
+    @classmethod
+    def is_ref(cls, value: Any) -> bool:
+        return isinstance(value, dict) and cls.REF_KEY in value
+
+    def externalize(self, value: Any) -> Any:
+        """
+        Copy of `value` with large strings replaced by references.
+        """
+        if isinstance(value, str):
+            if len(value.encode("utf-8")) > self.inline_limit:
+                return self.put(value)
+            return value
+        if isinstance(value, dict) and not self.is_ref(value):
+            return {k: self.externalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(v) for v in value]
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Copy of `value` with references replaced by their texts.
+        """
+        if self.is_ref(value):
+            return self.get(value)
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _summary(self, text: str) -> str:
+        first = next((line.strip() for line in text.splitlines() if line.strip()), "")
+        return first[: self.SUMMARY_CHARS]
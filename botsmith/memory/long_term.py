@@ -1,6 +1,8 @@
 # botsmith/core/memory/long_term_memory.py
 
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 from botsmith.core.interfaces.memory_store import MemoryStore
 from botsmith.core.memory import MemoryScope
@@ -9,23 +11,35 @@ from botsmith.core.memory import MemoryScope
 class PersistentStore(MemoryStore):
     """
     Base class for persistent memories with versioning and confidence tracking.
+
+    With a repository, entries are read through on demand and the most
+    recently used `cache_size` are kept in memory (missing keys included),
+    so opening a store costs the same however much history it has. Keys
+    under `prefetch_prefixes` are loaded up front. Without a repository
+    the store is an unbounded in-memory dict.
     """
 
-    def __init__(self, scope: MemoryScope, repository=None):
+    DEFAULT_CACHE_SIZE = 1024
+
+    def __init__(self, scope: MemoryScope, repository=None, cache_size: Optional[int] = None, prefetch_prefixes: Iterable[str] = ()):
         self._scope = scope
         self._repository = repository
-        self._data: Dict[str, Dict[str, Any]] = {}
-        
+        self._cache_size = cache_size or self.DEFAULT_CACHE_SIZE
+        # key -> entry, or None for a key known not to exist; least recently used first
+        self._data: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
         if self._repository:
             self._repository.init_schema()
-            self._data = self._repository.load_scope(self._scope)
+            for prefix in prefetch_prefixes:
+                self.prefetch(prefix)
 
     @property
     def scope(self) -> MemoryScope:
         return self._scope
 
     def read(self, key: str) -> Any:
-        entry = self._data.get(key)
+        entry = self._entry(key)
         return entry["value"] if entry else None
 
     def write(self, key: str, value: Any, meta: Dict[str, Any] = None) -> bool:
@@ -37,29 +51,84 @@ class PersistentStore(MemoryStore):
             "source": meta.get("source", "system"),
             "confidence": meta.get("confidence", 1.0)
         }
-        self._data[key] = entry
+        self._remember(key, entry)
         
         if self._repository:
             self._repository.save_entry(self._scope, key, value, entry)
         return True
 
     def delete(self, key: str) -> bool:
-        if key in self._data:
-            del self._data[key]
-            # Repository delete could be implemented if needed
-            return True
-        return False
+        if not self._repository:
+            with self._lock:
+                return self._data.pop(key, None) is not None
+
+        deleted = self._repository.delete_entry(self._scope, key)
+        self._remember(key, None)
+        return deleted
+
+    def invalidate(self):
+        """
+        Drop the cached entries, e.g. after retention deleted rows underneath.
+        """
+        if self._repository:
+            with self._lock:
+                self._data.clear()
+
+    def prefetch(self, prefix: str) -> int:
+        """
+        Load the stored entries whose key starts with `prefix` (at most
+        cache_size of them). Returns how many were loaded.
+        """
+        if not self._repository:
+            return 0
+
+        loaded = 0
+        for key, entry in self._repository.iter_scope(self._scope, prefix):
+            if loaded >= self._cache_size:
+                break
+            self._remember(key, entry)
+            loaded += 1
+        return loaded
+
+    def snapshot(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Every (key, entry) of the store, streamed from the repository in
+        key order rather than loaded at once.
+        """
+        if not self._repository:
+            with self._lock:
+                items = [(key, entry) for key, entry in self._data.items() if entry is not None]
+            return iter(items)
+        return self._repository.iter_scope(self._scope)
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        if not self._repository:
+            return None
+
+        entry = self._repository.load_entry(self._scope, key)
+        self._remember(key, entry)
+        return entry
 
-    def snapshot(self) -> Dict[str, Any]:
-        return self._data.copy()
+    def _remember(self, key: str, entry: Optional[Dict[str, Any]]):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            if self._repository:
+                while len(self._data) > self._cache_size:
+                    self._data.popitem(last=False)
 
 
 class PreferenceMemory(PersistentStore):
     """
     User-scoped persistent memory for preferences (verbosity, tool bias, etc).
     """
-    def __init__(self, user_id: str, repository=None):
-        super().__init__(MemoryScope.USER, repository)
+    def __init__(self, user_id: str, repository=None, **cache_options):
+        super().__init__(MemoryScope.USER, repository, **cache_options)
         self.user_id = user_id
 
 
@@ -67,6 +136,6 @@ class KnowledgeMemory(PersistentStore):
     """
     Project-scoped persistent memory for confirmed facts and assumptions.
     """
-    def __init__(self, project_id: str, repository=None):
-        super().__init__(MemoryScope.PROJECT, repository)
+    def __init__(self, project_id: str, repository=None, **cache_options):
+        super().__init__(MemoryScope.PROJECT, repository, **cache_options)
         self.project_id = project_id
@@ -1,8 +1,9 @@
 # botsmith/core/memory/manager.py
 
 import json
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any
 from botsmith.core.memory import AgentMemory, MemoryScope, MemoryUpdateProposal
+from botsmith.memory.artifact_store import ArtifactStore
 from botsmith.memory.memory_policy import MemoryPolicy
 from botsmith.memory.session import SessionMemory
 from botsmith.memory.long_term import PreferenceMemory, KnowledgeMemory
@@ -17,11 +18,22 @@ class MemoryManager(IMemoryManager):
     Routes proposals, applies policy, and manages stores.
     """
 
-    def __init__(self, session_id: str = "default_session", repository=None):
+    def __init__(
+        self,
+        session_id: str = "default_session",
+        repository=None,
+        artifact_store: Optional[ArtifactStore] = None,
+        cache_size: Optional[int] = None,
+        prefetch_prefixes: Iterable[str] = (),
+    ):
         self._repository = repository or AgentMemoryRepository()
+        # Large values (generated code) are stored once on disk and kept as references
+        self.artifacts = artifact_store
+        # Persistent scopes load entries on demand into a bounded cache
+        cache_options = {"cache_size": cache_size, "prefetch_prefixes": tuple(prefetch_prefixes)}
         self.session = SessionMemory(session_id)
-        self.preference = PreferenceMemory("default_user", repository=self._repository)
-        self.knowledge = KnowledgeMemory("default_project", repository=self._repository)
+        self.preference = PreferenceMemory("default_user", repository=self._repository, **cache_options)
+        self.knowledge = KnowledgeMemory("default_project", repository=self._repository, **cache_options)
         self.policy = MemoryPolicy()
 
         self._stores: Dict[MemoryScope, MemoryStore] = {
@@ -30,6 +42,10 @@ class MemoryManager(IMemoryManager):
             MemoryScope.PROJECT: self.knowledge
         }
 
+    @property
+    def repository(self):
+        return self._repository
+
     def get_store(self, scope: MemoryScope) -> MemoryStore:
         return self._stores.get(scope)
 
@@ -39,19 +55,22 @@ class MemoryManager(IMemoryManager):
         """
         decision = "rejected"
         target_scope = None
+        value = proposal.value
         
         if self.policy.validate_proposal(proposal):
             target_scope = self.policy.get_target_scope(proposal)
             store = self._stores.get(target_scope)
 
             if store:
+                if self.artifacts:
+                    value = self.artifacts.externalize(value)
                 meta = {
                     "source": proposal.source,
                     "confidence": proposal.confidence,
                     "justification": proposal.justification,
                     "timestamp": proposal.timestamp.isoformat()
                 }
-                if store.write(proposal.key, proposal.value, meta):
+                if store.write(proposal.key, value, meta):
                     decision = "accepted"
 
         # STEP 10: Observability (Structured Event)
@@ -59,7 +78,7 @@ class MemoryManager(IMemoryManager):
             "event": "memory_update",
             "scope": target_scope.value if target_scope else "none",
             "key": proposal.key,
-            "value": proposal.value,
+            "value": value,
             "source": proposal.source,
             "confidence": proposal.confidence,
             "decision": decision,
@@ -73,6 +92,20 @@ class MemoryManager(IMemoryManager):
         store = self._stores.get(scope)
         return store.read(key) if store else None
 
+    def load_artifact(self, ref: Any) -> Any:
+        """
+        A value read from memory with its artifact references resolved.
+        """
+        return self.artifacts.resolve(ref) if self.artifacts else ref
+
+    def flush(self) -> int:
+        """
+        Write buffered memory updates to the repository now (end of a
+        workflow). Returns how many were written.
+        """
+        flush = getattr(self._repository, "flush", None)
+        return flush() if flush else 0
+
     # Legacy support for existing agents
     def save_memory(self, memory: AgentMemory) -> bool:
         # Map interaction history to SessionMemory for now
@@ -0,0 +1,186 @@
+# botsmith/memory/retention.py
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from botsmith.core.memory import MemoryScope
+from botsmith.memory.artifact_store import ArtifactStore
+from botsmith.persistence.agent_memory_repository import AgentMemoryRepository
+from botsmith.persistence.database import file_size, vacuum
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Limits for the memory entries of one scope whose key starts with
+    `prefix` ("" = the whole scope). Unset limits do not apply.
+
+    - max_age_days: entries not updated for longer are deleted
+    - max_entries_per_agent: only the newest N entries of each source
+      ("agent:<id>") are kept
+    - max_bytes: the oldest entries are deleted until the rest fit
+    """
+    scope: MemoryScope
+    prefix: str = ""
+    max_age_days: Optional[float] = None
+    max_entries_per_agent: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetentionPolicy":
+        return cls(
+            scope=MemoryScope(data["scope"]),
+            prefix=data.get("prefix", ""),
+            max_age_days=data.get("max_age_days"),
+            max_entries_per_agent=data.get("max_entries_per_agent"),
+            max_bytes=data.get("max_bytes"),
+        )
+
+    @property
+    def name(self) -> str:
+        return f"{self.scope.value}:{self.prefix}*"
+
+
+class MemoryCompactor:
+    """
+    Applies retention policies to memory_store and gives the freed space
+    back to the file system.
+
+    compact() flushes buffered memory writes, deletes what the policies
+    rule out, removes artifacts no remaining entry references, then runs
+    (incremental) VACUUM. start() repeats it on a daemon thread.
+
+    Stores passed in `stores` have their caches dropped after a
+    compaction, so they do not serve deleted entries.
+    """
+
+    PERSISTENT_SCOPES = (MemoryScope.USER, MemoryScope.PROJECT)
+    # Artifacts younger than this are kept even if unreferenced: the entry
+    # pointing at them may not be written yet
+    ARTIFACT_GRACE_SECONDS = 3600
+
+    def __init__(
+        self,
+        repository: AgentMemoryRepository,
+        policies: Iterable[RetentionPolicy],
+        artifact_store: Optional[ArtifactStore] = None,
+        stores: Iterable[Any] = (),
+    ):
+        self.repository = repository
+        self.policies = list(policies)
+        self.artifacts = artifact_store
+        self.stores = list(stores)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config, repository: Optional[AgentMemoryRepository] = None, artifact_store: Optional[ArtifactStore] = None, stores: Iterable[Any] = ()) -> "MemoryCompactor":
+        if repository is None:
+            repository = AgentMemoryRepository(getattr(config, "sqlite_memory_path", None))
+            repository.init_schema()
+        if artifact_store is None and getattr(config, "artifact_store_path", None):
+            artifact_store = ArtifactStore(config.artifact_store_path, getattr(config, "artifact_inline_limit", 4096))
+
+        policies = [RetentionPolicy.from_dict(p) for p in getattr(config, "memory_retention", [])]
+        return cls(repository, policies, artifact_store, stores)
+
+    def compact(self, vacuum_db: bool = True) -> Dict[str, Any]:
+        """
+        One retention pass. Returns what was deleted and the space reclaimed.
+        """
+        flush = getattr(self.repository, "flush", None)
+        if flush:
+            flush()
+
+        db_path = self.repository.db_path
+        size_before = file_size(db_path)
+
+        report: List[Dict[str, Any]] = [self._apply(policy) for policy in self.policies]
+        for store in self.stores:
+            store.invalidate()
+
+        artifacts_deleted, artifact_bytes = self._collect_artifacts()
+
+        if vacuum_db:
+            vacuum(db_path)
+        size_after = file_size(db_path)
+
+        return {
+            "deleted": sum(entry["deleted"] for entry in report),
+            "policies": report,
+            "artifacts_deleted": artifacts_deleted,
+            "size_before": size_before,
+            "size_after": size_after,
+            "reclaimed_bytes": max(0, size_before - size_after) + artifact_bytes,
+        }
+
+    def start(self, interval: float):
+        """
+        Compact every `interval` seconds in the background. No-op if started.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="botsmith-memory-compaction", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                result = self.compact()
+                print(f"[Memory] Compaction deleted {result['deleted']} entries, reclaimed {result['reclaimed_bytes']} bytes")
+            except Exception as e:
+                print(f"[Memory] Compaction failed: {e}")
+
+    def _apply(self, policy: RetentionPolicy) -> Dict[str, Any]:
+        deleted = 0
+        if policy.max_age_days is not None:
+            cutoff = (datetime.utcnow() - timedelta(days=policy.max_age_days)).isoformat()
+            deleted += self.repository.purge_older_than(policy.scope, policy.prefix, cutoff)
+        if policy.max_entries_per_agent is not None:
+            deleted += self.repository.trim_per_source(policy.scope, policy.prefix, policy.max_entries_per_agent)
+        if policy.max_bytes is not None:
+            deleted += self.repository.trim_to_size(policy.scope, policy.prefix, policy.max_bytes)
+        return {"policy": policy.name, "deleted": deleted}
+
+    def _collect_artifacts(self):
+        """
+        Delete artifacts no memory entry references. Returns (count, bytes).
+        """
+        if not self.artifacts:
+            return 0, 0
+
+        referenced: Set[str] = set()
+        for scope in self.PERSISTENT_SCOPES:
+            for _, entry in self.repository.iter_scope(scope):
+                self._references(entry["value"], referenced)
+
+        cutoff = time.time() - self.ARTIFACT_GRACE_SECONDS
+        count = freed = 0
+        for digest in list(self.artifacts.digests()):
+            if digest in referenced:
+                continue
+            stat = self.artifacts.stat(digest)
+            if stat and stat.st_mtime < cutoff and self.artifacts.delete(digest):
+                count += 1
+                freed += stat.st_size
+        return count, freed
+
+    @classmethod
+    def _references(cls, value: Any, found: Set[str]):
+        if ArtifactStore.is_ref(value):
+            found.add(value[ArtifactStore.REF_KEY])
+        elif isinstance(value, dict):
+            for item in value.values():
+                cls._references(item, found)
+        elif isinstance(value, list):
+            for item in value:
+                cls._references(item, found)
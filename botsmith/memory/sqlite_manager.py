@@ -1,8 +1,10 @@
 # botsmith/core/memory/sqlite_manager.py
 
-from typing import Optional, Any
+from typing import Iterable, Optional, Any
 from botsmith.core.memory import AgentMemory, MemoryScope, MemoryUpdateProposal
 from botsmith.memory.manager import MemoryManager
+from botsmith.memory.artifact_store import ArtifactStore
+from botsmith.memory.write_behind import WriteBehindRepository
 from botsmith.persistence.agent_memory_repository import AgentMemoryRepository
 
 
@@ -12,7 +14,25 @@ class SQLiteMemoryManager(MemoryManager):
     Inherits from the core MemoryManager to provide full 3-layer support.
     """
 
-    def __init__(self, db_path=None, session_id: str = "default_session"):
+    def __init__(
+        self,
+        db_path=None,
+        session_id: str = "default_session",
+        durability: str = "buffered",
+        flush_interval: float = 1.0,
+        flush_batch: int = 64,
+        artifact_store: Optional[ArtifactStore] = None,
+        cache_size: Optional[int] = None,
+        prefetch_prefixes: Iterable[str] = (),
+    ):
         self._repo = AgentMemoryRepository(db_path=db_path)
         self._repo.init_schema()
-        super().__init__(session_id=session_id, repository=self._repo)
+        # Memory writes are queued and committed in batches (see WriteBehindRepository)
+        repository = WriteBehindRepository(self._repo, flush_batch, flush_interval, durability)
+        super().__init__(
+            session_id=session_id,
+            repository=repository,
+            artifact_store=artifact_store,
+            cache_size=cache_size,
+            prefetch_prefixes=prefetch_prefixes,
+        )
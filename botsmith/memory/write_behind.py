@@ -0,0 +1,223 @@
+# botsmith/memory/write_behind.py
+
+import atexit
+import itertools
+import threading
+import weakref
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from botsmith.core.memory import MemoryScope
+
+
+class WriteBehindRepository:
+    """
+    Buffers the save_entry() calls of an AgentMemoryRepository and writes
+    them in batches, so agents do not wait for a commit on every memory
+    write. Everything else is forwarded to the wrapped repository.
+
+    Durability (`durability`):
+    - "buffered": writes are queued and written in one transaction
+      (executemany) when `max_batch` are pending, every `flush_interval`
+      seconds by a background thread, on flush() and at interpreter exit.
+      A crash loses at most the last `flush_interval` seconds of writes.
+    - "write_through": every write is committed before save_entry()
+      returns, as without the buffer.
+
+    Pending writes to the same (scope, key) collapse into the latest one.
+    Reads (load_entry, iter_scope, load_scope) see the pending writes of
+    every buffer of the same database in this process, including a batch
+    that is being written but not yet committed, merged over the stored
+    entries, without flushing them.
+    """
+
+    DURABILITY_MODES = ("buffered", "write_through")
+
+    _instances: "weakref.WeakSet[WriteBehindRepository]" = weakref.WeakSet()
+    # Orders writes across buffers, so the latest pending write of a key wins
+    _sequence = itertools.count()
+
+    def __init__(self, repository, max_batch: int = 64, flush_interval: float = 1.0, durability: str = "buffered"):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown memory durability {durability!r} (expected one of {self.DURABILITY_MODES})")
+
+        self.repository = repository
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval = flush_interval
+        self.durability = durability
+
+        # (scope, key) -> (sequence, (scope, key, value, meta))
+        self._pending: Dict[Tuple[str, str], Tuple[int, Tuple[MemoryScope, str, Any, Dict[str, Any]]]] = {}
+        # The batch being written: still read from here until it is committed
+        self._inflight: Dict[Tuple[str, str], Tuple[int, Tuple[MemoryScope, str, Any, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so batches reach the database in write order
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        WriteBehindRepository._instances.add(self)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def save_entry(self, scope: MemoryScope, key: str, value: Any, meta: Dict[str, Any]):
+        if self.durability == "write_through" or self._closed:
+            self.repository.save_entry(scope, key, value, meta)
+            return
+
+        with self._lock:
+            self._pending[(scope.value, key)] = (next(self._sequence), (scope, key, value, meta))
+            full = len(self._pending) >= self.max_batch
+        self._ensure_flusher()
+        if full:
+            # The flusher writes the batch; the caller does not wait for it
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every pending entry now, in one transaction. Returns how many
+        were written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+
+            try:
+                self.repository.save_entries([entry for _, entry in batch.values()])
+            except Exception:
+                # Keep the entries for the next flush, unless rewritten since
+                with self._lock:
+                    self._pending = {**batch, **self._pending}
+                    self._inflight = {}
+                raise
+            with self._lock:
+                self._inflight = {}
+            return len(batch)
+
+    def delete_entry(self, scope: MemoryScope, key: str) -> bool:
+        with self._lock:
+            dropped = self._pending.pop((scope.value, key), None) is not None
+        return self.repository.delete_entry(scope, key) or dropped
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """
+        Stop the flusher and write what is pending. Later writes go straight
+        to the repository.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    @classmethod
+    def flush_all(cls):
+        """
+        Flush every live buffer (workflow completion, interpreter exit).
+        """
+        for buffer in list(cls._instances):
+            try:
+                buffer.flush()
+            except Exception as e:
+                print(f"[Memory] Failed to flush buffered memory writes: {e}")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def load_entry(self, scope: MemoryScope, key: str):
+        pending = self._pending_entries(scope, lambda k: k == key)
+        if key in pending:
+            return pending[key]
+        return self.repository.load_entry(scope, key)
+
+    def iter_scope(self, scope: MemoryScope, prefix: Optional[str] = None, batch_size: int = 256) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        The stored (key, entry) pairs in key order, with pending writes
+        merged in (a pending write replaces the stored entry).
+        """
+        pending = self._pending_entries(scope, lambda k: not prefix or k.startswith(prefix))
+        keys = sorted(pending)
+        i = 0
+        for key, entry in self.repository.iter_scope(scope, prefix, batch_size):
+            while i < len(keys) and keys[i] <= key:
+                yield keys[i], pending[keys[i]]
+                i += 1
+            if key not in pending:
+                yield key, entry
+        for key in keys[i:]:
+            yield key, pending[key]
+
+    def load_scope(self, scope: MemoryScope):
+        return dict(self.iter_scope(scope))
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _pending_entries(self, scope: MemoryScope, wanted) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest pending or in-flight write per key of `scope` (keys passing
+        `wanted`) across the buffers of the same database, as stored entries.
+        """
+        db_path = getattr(self.repository, "db_path", None)
+        latest: Dict[str, Tuple[int, Any, Dict[str, Any]]] = {}
+        for buffer in list(self._instances):
+            if getattr(buffer.repository, "db_path", None) != db_path:
+                continue
+            with buffer._lock:
+                writes = [
+                    (k, pending)
+                    for buffered in (buffer._inflight, buffer._pending)
+                    for (s, k), pending in buffered.items()
+                    if s == scope.value and wanted(k)
+                ]
+            for key, (sequence, (_, _, value, meta)) in writes:
+                if key not in latest or latest[key][0] < sequence:
+                    latest[key] = (sequence, value, meta)
+
+        return {key: self._entry(value, meta) for key, (_, value, meta) in latest.items()}
+
+    @staticmethod
+    def _entry(value: Any, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "value": value,
+            "version": meta.get("version", 1),
+            "updated_at": meta.get("updated_at"),
+            "source": meta.get("source", "system"),
+            "confidence": meta.get("confidence", 1.0),
+            "metadata": meta,
+        }
+
+    def _ensure_flusher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_flusher, name="botsmith-memory-flush", daemon=True)
+                self._thread.start()
+
+    def _run_flusher(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[Memory] Buffered memory flush failed, retrying: {e}")
+
+
+atexit.register(WriteBehindRepository.flush_all)
@@ -1,12 +1,29 @@
-import json
 from botsmith.core.interfaces.llm_interface import ILLMWrapper
+from botsmith.core.exceptions.custom_exceptions import StructuredOutputError
 
 
 class SemanticParser:
     """
     Uses an LLM to convert natural language into a structured draft intent.
+    The intent is requested in JSON mode against INTENT_SCHEMA.
     """
 
+    INTENT_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "intent": {"type": "string", "enum": ["build_bot", "deploy", "analyze", "unknown"]},
+            "entities": {"type": "object"},
+            "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+        },
+        "required": ["intent", "entities", "confidence"],
+    }
+
+    UNKNOWN_INTENT = {
+        "intent": "unknown",
+        "entities": {},
+        "confidence": 0.0,
+    }
+
     SYSTEM_PROMPT = """
 You are an intent extraction engine.
 
@@ -22,16 +39,22 @@ Respond ONLY with valid JSON.
         self._llm = llm
 
     def parse(self, text: str) -> dict:
-        response = self._llm.generate(
-            prompt=text,
-            system_prompt=self.SYSTEM_PROMPT,
-        )
-
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {
-                "intent": "unknown",
-                "entities": {},
-                "confidence": 0.0,
-            }
+            return self._llm.generate_json(
+                prompt=text,
+                schema=self.INTENT_SCHEMA,
+                system_prompt=self.SYSTEM_PROMPT,
+            )
+        except StructuredOutputError:
+            # Still malformed after the repair re-ask
+            return dict(self.UNKNOWN_INTENT)
+
+    async def aparse(self, text: str) -> dict:
+        try:
+            return await self._llm.agenerate_json(
+                prompt=text,
+                schema=self.INTENT_SCHEMA,
+                system_prompt=self.SYSTEM_PROMPT,
+            )
+        except StructuredOutputError:
+            return dict(self.UNKNOWN_INTENT)
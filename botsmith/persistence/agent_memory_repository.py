@@ -3,10 +3,10 @@
 import sqlite3
 import json
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 from botsmith.core.memory import AgentMemory, MemoryScope
-from botsmith.persistence.database import get_connection
+from botsmith.persistence.database import get_connection, transaction
 
 
 class AgentMemoryRepository:
@@ -17,85 +17,179 @@ class AgentMemoryRepository:
     def __init__(self, db_path=None):
         self.db_path = db_path
 
-    def init_schema(self):
-        conn = get_connection(self.db_path)
-        cur = conn.cursor()
-
-        # Legacy table kept for migration safety
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS agent_memory (
-            agent_id TEXT PRIMARY KEY,
-            interactions TEXT,
-            metadata TEXT,
-            last_updated TEXT
-        )
-        """)
-
-        # New scoped memory table
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS memory_store (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            scope TEXT,
-            key TEXT,
-            value TEXT,
-            version INTEGER,
-            updated_at TEXT,
-            source TEXT,
-            confidence REAL,
-            metadata TEXT,
-            UNIQUE(scope, key)
-        )
-        """)
+    def transaction(self):
+        """
+        Unit of work: the writes made inside share one commit.
+        """
+        return transaction(self.db_path)
 
-        conn.commit()
-        conn.close()
+    def init_schema(self):
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            # Legacy table kept for migration safety
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS agent_memory (
+                agent_id TEXT PRIMARY KEY,
+                interactions TEXT,
+                metadata TEXT,
+                last_updated TEXT
+            )
+            """)
+
+            # New scoped memory table
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS memory_store (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope TEXT,
+                key TEXT,
+                value TEXT,
+                version INTEGER,
+                updated_at TEXT,
+                source TEXT,
+                confidence REAL,
+                metadata TEXT,
+                UNIQUE(scope, key)
+            )
+            """)
+            # Retention deletes by age
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_memory_store_updated ON memory_store (scope, updated_at)")
 
     def save_entry(self, scope: MemoryScope, key: str, value: Any, meta: Dict[str, Any]):
-        conn = get_connection(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
-        INSERT INTO memory_store (scope, key, value, version, updated_at, source, confidence, metadata)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(scope, key) DO UPDATE SET
-            value=excluded.value,
-            version=excluded.version,
-            updated_at=excluded.updated_at,
-            source=excluded.source,
-            confidence=excluded.confidence,
-            metadata=excluded.metadata
-        """, (
-            scope.value,
-            key,
-            json.dumps(value),
-            meta.get("version", 1),
-            meta.get("updated_at", datetime.utcnow().isoformat()),
-            meta.get("source", "system"),
-            meta.get("confidence", 1.0),
-            json.dumps(meta)
-        ))
-
-        conn.commit()
-        conn.close()
+        self.save_entries([(scope, key, value, meta)])
+
+    def save_entries(self, entries: List[Tuple[MemoryScope, str, Any, Dict[str, Any]]]):
+        """
+        Upsert (scope, key, value, meta) entries in one transaction.
+        """
+        rows = [
+            (
+                scope.value,
+                key,
+                json.dumps(value),
+                meta.get("version", 1),
+                meta.get("updated_at", datetime.utcnow().isoformat()),
+                meta.get("source", "system"),
+                meta.get("confidence", 1.0),
+                json.dumps(meta)
+            )
+            for scope, key, value, meta in entries
+        ]
+
+        with transaction(self.db_path) as conn:
+            conn.executemany("""
+            INSERT INTO memory_store (scope, key, value, version, updated_at, source, confidence, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(scope, key) DO UPDATE SET
+                value=excluded.value,
+                version=excluded.version,
+                updated_at=excluded.updated_at,
+                source=excluded.source,
+                confidence=excluded.confidence,
+                metadata=excluded.metadata
+            """, rows)
+
+    ENTRY_COLUMNS = "key, value, version, updated_at, source, confidence, metadata"
 
     def load_scope(self, scope: MemoryScope) -> Dict[str, Dict[str, Any]]:
+        return dict(self.iter_scope(scope))
+
+    def load_entry(self, scope: MemoryScope, key: str) -> Optional[Dict[str, Any]]:
         conn = get_connection(self.db_path)
-        cur = conn.cursor()
-        cur.execute("SELECT key, value, version, updated_at, source, confidence, metadata FROM memory_store WHERE scope = ?", (scope.value,))
-        rows = cur.fetchall()
-        conn.close()
-
-        result = {}
-        for row in rows:
-            result[row["key"]] = {
-                "value": json.loads(row["value"]),
-                "version": row["version"],
-                "updated_at": row["updated_at"],
-                "source": row["source"],
-                "confidence": row["confidence"],
-                "metadata": json.loads(row["metadata"])
-            }
-        return result
+        row = conn.execute(
+            f"SELECT {self.ENTRY_COLUMNS} FROM memory_store WHERE scope = ? AND key = ?",
+            (scope.value, key),
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def iter_scope(self, scope: MemoryScope, prefix: Optional[str] = None, batch_size: int = 256) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        (key, entry) pairs of a scope in key order, optionally only keys
+        starting with `prefix`. Rows are fetched `batch_size` at a time, so
+        memory use does not grow with the scope.
+        """
+        where, params = self._scope_filter(scope, prefix)
+        cur = get_connection(self.db_path).execute(
+            f"SELECT {self.ENTRY_COLUMNS} FROM memory_store WHERE {where} ORDER BY key", params
+        )
+        try:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield row["key"], self._entry(row)
+        finally:
+            cur.close()
+
+    def delete_entry(self, scope: MemoryScope, key: str) -> bool:
+        with transaction(self.db_path) as conn:
+            cur = conn.execute("DELETE FROM memory_store WHERE scope = ? AND key = ?", (scope.value, key))
+            return cur.rowcount > 0
+
+    # Retention (see botsmith.memory.retention)
+    def purge_older_than(self, scope: MemoryScope, prefix: Optional[str], cutoff: str) -> int:
+        """
+        Delete entries last updated before `cutoff` (ISO timestamp).
+        """
+        where, params = self._scope_filter(scope, prefix)
+        with transaction(self.db_path) as conn:
+            cur = conn.execute(f"DELETE FROM memory_store WHERE {where} AND updated_at < ?", params + [cutoff])
+            return cur.rowcount
+
+    def trim_per_source(self, scope: MemoryScope, prefix: Optional[str], keep: int) -> int:
+        """
+        Keep the `keep` most recently updated entries of each source
+        (e.g. "agent:coder_main.py"), delete the rest.
+        """
+        where, params = self._scope_filter(scope, prefix)
+        with transaction(self.db_path) as conn:
+            cur = conn.execute(f"""
+            DELETE FROM memory_store WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY source ORDER BY updated_at DESC, id DESC) AS position
+                    FROM memory_store WHERE {where}
+                ) WHERE position > ?
+            )
+            """, params + [keep])
+            return cur.rowcount
+
+    def trim_to_size(self, scope: MemoryScope, prefix: Optional[str], max_bytes: int) -> int:
+        """
+        Delete the least recently updated entries until the stored value and
+        metadata of the rest fit in `max_bytes`.
+        """
+        where, params = self._scope_filter(scope, prefix)
+        with transaction(self.db_path) as conn:
+            cur = conn.execute(f"""
+            DELETE FROM memory_store WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, SUM(LENGTH(value) + LENGTH(metadata)) OVER (ORDER BY updated_at DESC, id DESC) AS total
+                    FROM memory_store WHERE {where}
+                ) WHERE total > ?
+            )
+            """, params + [max_bytes])
+            return cur.rowcount
+
+    @staticmethod
+    def _scope_filter(scope: MemoryScope, prefix: Optional[str]) -> Tuple[str, List[Any]]:
+        where, params = "scope = ?", [scope.value]
+        if prefix:
+            # A key range rather than LIKE, so the (scope, key) index is used
+            where += " AND key >= ? AND key < ?"
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        return where, params
+
+    @staticmethod
+    def _entry(row) -> Dict[str, Any]:
+        return {
+            "value": json.loads(row["value"]),
+            "version": row["version"],
+            "updated_at": row["updated_at"],
+            "source": row["source"],
+            "confidence": row["confidence"],
+            "metadata": json.loads(row["metadata"])
+        }
 
     # Legacy support
     def load(self, agent_id: str) -> Optional[AgentMemory]:
@@ -103,7 +197,6 @@ class AgentMemoryRepository:
         cur = conn.cursor()
         cur.execute("SELECT agent_id, interactions, metadata, last_updated FROM agent_memory WHERE agent_id = ?", (agent_id,))
         row = cur.fetchone()
-        conn.close()
         if not row: return None
         return AgentMemory(
             agent_id=row["agent_id"],
@@ -113,15 +206,13 @@ class AgentMemoryRepository:
         )
 
     def save(self, memory: AgentMemory):
-        conn = get_connection(self.db_path)
-        cur = conn.cursor()
-        cur.execute("""
-        INSERT INTO agent_memory (agent_id, interactions, metadata, last_updated)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(agent_id) DO UPDATE SET
-            interactions=excluded.interactions,
-            metadata=excluded.metadata,
-            last_updated=excluded.last_updated
-        """, (memory.agent_id, json.dumps(memory.interactions), json.dumps(memory.metadata), memory.last_updated.isoformat()))
-        conn.commit()
-        conn.close()
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            INSERT INTO agent_memory (agent_id, interactions, metadata, last_updated)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(agent_id) DO UPDATE SET
+                interactions=excluded.interactions,
+                metadata=excluded.metadata,
+                last_updated=excluded.last_updated
+            """, (memory.agent_id, json.dumps(memory.interactions), json.dumps(memory.metadata), memory.last_updated.isoformat()))
@@ -1,21 +1,216 @@
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, Optional
 
 from botsmith.config import settings
 
 DB_PATH = settings.sqlite_memory_path
 
 
-def get_connection(db_path=None):
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    return conn
+class PooledConnection(sqlite3.Connection):
+    """
+    Connection owned by ConnectionManager. close() is a no-op so code
+    written for one-connection-per-call keeps working; the manager closes
+    it for real.
+    """
 
+    def close(self):
+        pass
 
-def init_db():
-    conn = get_connection()
-    cur = conn.cursor()
+    def _close(self):
+        super().close()
+
+
+class ConnectionManager:
+    """
+    Long-lived SQLite connections, one per thread and database file.
+
+    Opening a connection per statement costs a file open, schema parse
+    and a cold statement cache each time. Instead every thread keeps its
+    connection, with:
+    - WAL journaling: readers do not block the writer and vice versa
+    - synchronous=NORMAL: WAL commits without an fsync per transaction
+    - busy_timeout: writers wait for the lock instead of failing with
+      "database is locked"
+    - mmap_size: reads served from the mapped file
+    - cached_statements: prepared statements reused across calls
+
+    Connections of finished threads are closed when the thread goes away;
+    close_all() closes the rest (tests, shutdown).
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+    SYNCHRONOUS = "NORMAL"
+    MMAP_SIZE = 64 * 1024 * 1024
+    CACHED_STATEMENTS = 256
+
+    _local = threading.local()
+    _lock = threading.Lock()
+    _open: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+    # Bumped by close_all() so every thread drops its closed handles
+    _generation = 0
+
+    @classmethod
+    def configure(
+        cls,
+        busy_timeout_ms: Optional[int] = None,
+        synchronous: Optional[str] = None,
+        mmap_size: Optional[int] = None,
+        cached_statements: Optional[int] = None,
+    ):
+        """
+        Applies to connections opened afterwards.
+        """
+        if busy_timeout_ms is not None:
+            cls.BUSY_TIMEOUT_MS = int(busy_timeout_ms)
+        if synchronous:
+            cls.SYNCHRONOUS = synchronous.upper()
+        if mmap_size is not None:
+            cls.MMAP_SIZE = int(mmap_size)
+        if cached_statements is not None:
+            cls.CACHED_STATEMENTS = int(cached_statements)
+
+    @classmethod
+    def connection(cls, db_path=None) -> PooledConnection:
+        """
+        This thread's connection to `db_path` (the configured database by
+        default). Do not share it with other threads.
+        """
+        path = str(db_path or DB_PATH)
+        connections = cls._connections()
+        conn = connections.get(path)
+        if conn is None:
+            conn = connections[path] = cls._open_connection(path)
+        return conn
+
+    @classmethod
+    @contextmanager
+    def transaction(cls, db_path=None) -> Iterator[PooledConnection]:
+        """
+        Unit of work: everything written inside the block commits once at
+        the end, or is rolled back if it raises. Nested blocks on the same
+        thread and database join the outer one.
+        """
+        path = str(db_path or DB_PATH)
+        conn = cls.connection(path)
+        depth = cls._depths()
+        depth[path] = depth.get(path, 0) + 1
+        try:
+            yield conn
+        except BaseException:
+            depth[path] -= 1
+            if not depth[path]:
+                conn.rollback()
+            raise
+        else:
+            depth[path] -= 1
+            if not depth[path]:
+                conn.commit()
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every open connection, on all threads. A thread that uses the
+        database again afterwards gets a new connection.
+        """
+        with cls._lock:
+            cls._generation += 1
+            connections = list(cls._open)
+            cls._open.clear()
+        for conn in connections:
+            conn._close()
+
+    @classmethod
+    def _connections(cls) -> dict:
+        local = cls._local
+        if getattr(local, "generation", None) != cls._generation:
+            local.connections = {}
+            local.depths = {}
+            local.generation = cls._generation
+        return local.connections
+
+    @classmethod
+    def _depths(cls) -> dict:
+        cls._connections()
+        return cls._local.depths
+
+    @classmethod
+    def _open_connection(cls, path: str) -> PooledConnection:
+        conn = sqlite3.connect(
+            path,
+            timeout=cls.BUSY_TIMEOUT_MS / 1000,
+            factory=PooledConnection,
+            cached_statements=cls.CACHED_STATEMENTS,
+            # close_all() may close it from another thread
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={cls.SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={int(cls.BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA mmap_size={int(cls.MMAP_SIZE)}")
+        with cls._lock:
+            cls._open.add(conn)
+        return conn
+
+
+def get_connection(db_path=None) -> PooledConnection:
+    """
+    The calling thread's shared connection (see ConnectionManager).
+    """
+    return ConnectionManager.connection(db_path)
+
+
+def transaction(db_path=None):
+    return ConnectionManager.transaction(db_path)
+
+
+def file_size(db_path=None) -> int:
+    """
+    Bytes the database takes on disk, WAL file included.
+    """
+    path = Path(str(db_path or DB_PATH))
+    wal = Path(f"{path}-wal")
+    return sum(p.stat().st_size for p in (path, wal) if p.exists())
+
+
+def vacuum(db_path=None):
+    """
+    Return free pages to the file system.
+
+    The first call switches the database to incremental auto-vacuum, which
+    takes one full VACUUM; later calls only run incremental_vacuum. The WAL
+    is checkpointed and truncated afterwards.
+    """
+    conn = get_connection(db_path)
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+    else:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+def _ensure_columns(cur, table: str, columns: dict):
+    """
+    Add columns introduced after a table was first created (SQLite has no
+    ADD COLUMN IF NOT EXISTS).
+    """
+    existing = {row["name"] for row in cur.execute(f"PRAGMA table_info({table})")}
+    for name, declaration in columns.items():
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+
+def init_db(db_path=None):
+    with transaction(db_path) as conn:
+        _create_tables(conn.cursor())
+
+
+def _create_tables(cur):
 
     cur.execute("""
     CREATE TABLE IF NOT EXISTS workflow_runs (
@@ -25,6 +220,12 @@ def init_db():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
     """)
+    # Checkpoint columns: workflow definition + last committed context
+    _ensure_columns(cur, "workflow_runs", {
+        "workflow_def": "TEXT",
+        "context": "TEXT",
+        "updated_at": "TIMESTAMP",
+    })
 
     cur.execute("""
     CREATE TABLE IF NOT EXISTS workflow_steps (
@@ -37,6 +238,40 @@ def init_db():
         FOREIGN KEY(run_id) REFERENCES workflow_runs(id)
     )
     """)
+
+    # Per-file results of generate_all_files, written as each file lands
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS workflow_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        filename TEXT,
+        status TEXT,
+        path TEXT,
+        size INTEGER,
+        error TEXT,
+        UNIQUE(run_id, filename),
+        FOREIGN KEY(run_id) REFERENCES workflow_runs(id)
+    )
+    """)
+
+    # Token usage per step and run, the history behind cost estimates
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS step_usage (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        step_name TEXT,
+        agent TEXT,
+        prompt_tokens INTEGER,
+        completion_tokens INTEGER,
+        calls INTEGER,
+        cost REAL,
+        units INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(run_id) REFERENCES workflow_runs(id)
+    )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_step_usage_step ON step_usage(step_name, id)")
+
     cur.execute("""
     CREATE TABLE IF NOT EXISTS agents (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -47,6 +282,3 @@ def init_db():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
     """)
-
-    conn.commit()
-    conn.close()
@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 @dataclass
 class WorkflowRun:
     workflow_name: str
     status: str
+    id: Optional[int] = None
+    workflow_def: Dict[str, Any] = field(default_factory=dict)
+    context: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -17,6 +20,32 @@ class WorkflowStepResult:
     output: str
 
 
+@dataclass
+class WorkflowFileResult:
+    run_id: int
+    filename: str
+    status: str
+    path: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class StepUsageRecord:
+    """
+    Tokens a step used in one run. `units` is what the usage scales with:
+    the files generated by generate_all_files, 1 for every other step.
+    """
+    run_id: Optional[int]
+    step_name: str
+    agent: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    calls: int = 0
+    cost: float = 0.0
+    units: int = 1
+
+
 @dataclass
 class AgentRecord:
     agent_id: str
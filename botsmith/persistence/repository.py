@@ -1,87 +1,229 @@
 import json
-from typing import List, Optional
-from .database import get_connection
-from .models import WorkflowRun, WorkflowStepResult, AgentRecord
+from typing import Any, Dict, List, Optional
+from .database import get_connection, transaction
+from .models import WorkflowRun, WorkflowStepResult, WorkflowFileResult, StepUsageRecord, AgentRecord
 
 
 class WorkflowRepository:
 
-    def create_run(self, workflow_name: str, status: str) -> int:
-        conn = get_connection()
-        cur = conn.cursor()
+    def __init__(self, db_path=None):
+        self.db_path = db_path
 
-        cur.execute(
-            "INSERT INTO workflow_runs (workflow_name, status) VALUES (?, ?)",
-            (workflow_name, status),
-        )
+    def transaction(self):
+        """
+        Unit of work: the writes made inside `with repo.transaction():`
+        share one commit.
+        """
+        return transaction(self.db_path)
+
+    def create_run(self, workflow_name: str, status: str, workflow_def: Optional[Dict[str, Any]] = None, context: Optional[Dict[str, Any]] = None) -> int:
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
 
-        run_id = cur.lastrowid
-        conn.commit()
-        conn.close()
+            cur.execute(
+                """
+                INSERT INTO workflow_runs (workflow_name, status, workflow_def, context, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                (workflow_name, status, json.dumps(workflow_def or {}), json.dumps(context or {})),
+            )
+
+            run_id = cur.lastrowid
         return run_id
 
     def save_step(self, step: WorkflowStepResult):
-        conn = get_connection()
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                INSERT INTO workflow_steps
+                (run_id, step_name, agent, status, output)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (step.run_id, step.step_name, step.agent, step.status, step.output),
+            )
+
+    def update_run_status(self, run_id: int, status: str):
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                "UPDATE workflow_runs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, run_id),
+            )
+
+    def save_checkpoint(self, run_id: int, context: Dict[str, Any]):
+        """Store the run's context as of its last committed step."""
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                "UPDATE workflow_runs SET context = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (json.dumps(context), run_id),
+            )
+
+    def save_file_result(self, result: WorkflowFileResult):
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                INSERT INTO workflow_files (run_id, filename, status, path, size, error)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id, filename) DO UPDATE SET
+                    status=excluded.status,
+                    path=excluded.path,
+                    size=excluded.size,
+                    error=excluded.error
+                """,
+                (result.run_id, result.filename, result.status, result.path, result.size, result.error),
+            )
+
+    def save_step_usage(self, usage: StepUsageRecord):
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                INSERT INTO step_usage
+                (run_id, step_name, agent, prompt_tokens, completion_tokens, calls, cost, units)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    usage.run_id,
+                    usage.step_name,
+                    usage.agent,
+                    usage.prompt_tokens,
+                    usage.completion_tokens,
+                    usage.calls,
+                    usage.cost,
+                    usage.units,
+                ),
+            )
+
+    def average_step_usage(self, step_name: str, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """
+        Average tokens and cost per unit of `step_name` over its last `limit`
+        recorded runs, or None if it has no history.
+        """
+        conn = get_connection(self.db_path)
         cur = conn.cursor()
 
         cur.execute(
             """
-            INSERT INTO workflow_steps
-            (run_id, step_name, agent, status, output)
-            VALUES (?, ?, ?, ?, ?)
+            SELECT COUNT(*) AS samples,
+                   SUM(prompt_tokens + completion_tokens) AS tokens,
+                   SUM(cost) AS cost,
+                   SUM(units) AS units
+            FROM (SELECT * FROM step_usage WHERE step_name = ? ORDER BY id DESC LIMIT ?)
             """,
-            (step.run_id, step.step_name, step.agent, step.status, step.output),
+            (step_name, limit),
         )
+        row = cur.fetchone()
+
+        if not row["samples"]:
+            return None
 
-        conn.commit()
-        conn.close()
+        units = max(1, row["units"] or 0)
+        return {
+            "samples": row["samples"],
+            "tokens_per_unit": row["tokens"] / units,
+            "cost_per_unit": row["cost"] / units,
+        }
 
-    def update_run_status(self, run_id: int, status: str):
-        conn = get_connection()
+    def get_run(self, run_id: int) -> Optional[WorkflowRun]:
+        conn = get_connection(self.db_path)
         cur = conn.cursor()
 
-        cur.execute(
-            "UPDATE workflow_runs SET status = ? WHERE id = ?",
-            (status, run_id),
+        cur.execute("SELECT * FROM workflow_runs WHERE id = ?", (run_id,))
+        row = cur.fetchone()
+
+        if row is None:
+            return None
+
+        return WorkflowRun(
+            id=row["id"],
+            workflow_name=row["workflow_name"],
+            status=row["status"],
+            workflow_def=json.loads(row["workflow_def"] or "{}"),
+            context=json.loads(row["context"] or "{}"),
         )
 
-        conn.commit()
-        conn.close()
+    def list_steps(self, run_id: int) -> List[WorkflowStepResult]:
+        conn = get_connection(self.db_path)
+        cur = conn.cursor()
+
+        cur.execute("SELECT * FROM workflow_steps WHERE run_id = ? ORDER BY id", (run_id,))
+        rows = cur.fetchall()
+
+        return [
+            WorkflowStepResult(
+                run_id=row["run_id"],
+                step_name=row["step_name"],
+                agent=row["agent"],
+                status=row["status"],
+                output=row["output"],
+            )
+            for row in rows
+        ]
+
+    def list_files(self, run_id: int) -> List[WorkflowFileResult]:
+        conn = get_connection(self.db_path)
+        cur = conn.cursor()
+
+        cur.execute("SELECT * FROM workflow_files WHERE run_id = ? ORDER BY id", (run_id,))
+        rows = cur.fetchall()
+
+        return [
+            WorkflowFileResult(
+                run_id=row["run_id"],
+                filename=row["filename"],
+                status=row["status"],
+                path=row["path"],
+                size=row["size"],
+                error=row["error"],
+            )
+            for row in rows
+        ]
 
 
 class AgentRepository:
     """Repository for persisting agent configurations."""
 
+    def __init__(self, db_path=None):
+        self.db_path = db_path
+
+    def transaction(self):
+        return transaction(self.db_path)
+
     def save_agent(self, agent: AgentRecord) -> int:
-        conn = get_connection()
-        cur = conn.cursor()
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
 
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO agents
-            (agent_id, agent_type, capabilities, config)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                agent.agent_id,
-                agent.agent_type,
-                json.dumps(agent.capabilities),
-                json.dumps(agent.config),
-            ),
-        )
+            cur.execute(
+                """
+                INSERT OR REPLACE INTO agents
+                (agent_id, agent_type, capabilities, config)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    agent.agent_id,
+                    agent.agent_type,
+                    json.dumps(agent.capabilities),
+                    json.dumps(agent.config),
+                ),
+            )
 
-        agent_db_id = cur.lastrowid
-        conn.commit()
-        conn.close()
+            agent_db_id = cur.lastrowid
         return agent_db_id
 
     def get_agent(self, agent_id: str) -> Optional[AgentRecord]:
-        conn = get_connection()
+        conn = get_connection(self.db_path)
         cur = conn.cursor()
 
         cur.execute("SELECT * FROM agents WHERE agent_id = ?", (agent_id,))
         row = cur.fetchone()
-        conn.close()
 
         if row is None:
             return None
@@ -94,12 +236,11 @@ class AgentRepository:
         )
 
     def list_agents(self) -> List[AgentRecord]:
-        conn = get_connection()
+        conn = get_connection(self.db_path)
         cur = conn.cursor()
 
         cur.execute("SELECT * FROM agents")
         rows = cur.fetchall()
-        conn.close()
 
         return [
             AgentRecord(
@@ -112,11 +253,9 @@ class AgentRepository:
         ]
 
     def delete_agent(self, agent_id: str) -> bool:
-        conn = get_connection()
-        cur = conn.cursor()
+        with transaction(self.db_path) as conn:
+            cur = conn.cursor()
 
-        cur.execute("DELETE FROM agents WHERE agent_id = ?", (agent_id,))
-        deleted = cur.rowcount > 0
-        conn.commit()
-        conn.close()
+            cur.execute("DELETE FROM agents WHERE agent_id = ?", (agent_id,))
+            deleted = cur.rowcount > 0
         return deleted
@@ -29,5 +29,8 @@ class FileSystemTool:
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(content, encoding="utf-8")
 
+    def read_file(self, relative_path: str) -> str:
+        return self._resolve(relative_path).read_text(encoding="utf-8")
+
     def exists(self, relative_path: str) -> bool:
         return self._resolve(relative_path).exists()
@@ -0,0 +1,22 @@
+# botsmith/utils/async_utils.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Sync entry points (CLI, scripts, sync FastAPI routes) call this to reuse
+    the async implementation. If the calling thread already runs an event
+    loop, the coroutine gets a private loop on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="botsmith-sync") as pool:
+        return pool.submit(asyncio.run, coro).result()
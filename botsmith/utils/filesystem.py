@@ -23,3 +23,9 @@ class LocalFileSystem:
         full_path = self._sanitize_path(path)
         full_path.parent.mkdir(parents=True, exist_ok=True)
         full_path.write_text(content, encoding="utf-8")
+
+    def read_file(self, path: str) -> str:
+        return self._sanitize_path(path).read_text(encoding="utf-8")
+
+    def exists(self, path: str) -> bool:
+        return self._sanitize_path(path).exists()
@@ -0,0 +1,95 @@
+# botsmith/utils/json_schema.py
+
+import json
+import re
+from typing import Any, Dict, List
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None),
+}
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the JSON value in an LLM response.
+
+    Tolerates markdown fences and chatter around a single object/array.
+    Raises ValueError (json.JSONDecodeError) if nothing parses.
+    """
+    text = _FENCE.sub("", (text or "").strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return json.loads(text)
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return json.loads(text[start:end + 1])
+
+
+def validate(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check `data` against the subset of JSON Schema the agents use:
+    type, properties, required, items, enum, minItems, minimum, maximum.
+
+    Returns a list of human-readable problems (empty if valid).
+    """
+    expected = schema.get("type")
+    if expected:
+        types = _TYPES[expected]
+        # bool is an int subclass; "integer"/"number" must not accept it
+        if not isinstance(data, types) or (isinstance(data, bool) and expected != "boolean"):
+            return [f"{path}: expected {expected}, got {type(data).__name__}"]
+
+    errors = []
+
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: {data!r} is not one of {schema['enum']}")
+
+    if isinstance(data, dict):
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path}: missing required key '{key}'")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in data:
+                errors.extend(validate(data[key], sub_schema, f"{path}.{key}"))
+
+    if isinstance(data, list):
+        if len(data) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(data):
+                errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        if "minimum" in schema and data < schema["minimum"]:
+            errors.append(f"{path}: {data} is below {schema['minimum']}")
+        if "maximum" in schema and data > schema["maximum"]:
+            errors.append(f"{path}: {data} is above {schema['maximum']}")
+
+    return errors
+
+
+def schema_instructions(schema: Dict[str, Any], system_prompt: str = "") -> str:
+    """
+    System prompt asking for JSON matching `schema`. Sent even to backends
+    with a native JSON mode: it tells the model which keys to produce.
+    """
+    instructions = (
+        "Respond ONLY with a JSON value matching this JSON schema, "
+        "with no markdown fences or explanations:\n"
+        f"{json.dumps(schema, indent=2)}"
+    )
+    return f"{system_prompt}\n\n{instructions}" if system_prompt else instructions
@@ -0,0 +1,135 @@
+# botsmith/workflows/manifest.py
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class GenerationManifest:
+    """
+    Per-project record of the inputs each generated file was built from.
+
+    Stored as .botsmith_manifest.json in the project directory:
+    {
+        "version": 1,
+        "files": {
+            "src/bot/main.py": {"hash": "...", "path": "...", "size": 123, "sha256": "..."},
+            ...
+        }
+    }
+
+    "hash" covers the inputs a file was generated from, "sha256" the output
+    that was written. A file whose input hash is unchanged since the last
+    run, and which is still on disk with the recorded content, can be reused
+    instead of asking the LLM again; anything else (e.g. a scaffold template
+    written over it) is regenerated.
+    """
+
+    FILENAME = ".botsmith_manifest.json"
+    # Version 1 manifests have no output hashes and are ignored
+    VERSION = 2
+
+    def __init__(self, fs=None, path=None):
+        """
+        :param fs: Filesystem abstraction (LocalFileSystem / FileSystemTool);
+                   `path` is then relative to its root.
+        :param path: Manifest location (absolute Path when fs is None).
+        """
+        self.fs = fs
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, fs, project_dir) -> "GenerationManifest":
+        """
+        Load the manifest of a project directory (relative to fs when given).
+        A missing or unreadable manifest is treated as empty.
+        """
+        if fs:
+            manifest = cls(fs, f"{project_dir}/{cls.FILENAME}")
+        else:
+            manifest = cls(None, Path(project_dir) / cls.FILENAME)
+
+        try:
+            data = json.loads(manifest._read())
+        except (OSError, ValueError, AttributeError):
+            return manifest
+
+        if isinstance(data, dict) and data.get("version") == cls.VERSION:
+            manifest.files = dict(data.get("files", {}))
+        return manifest
+
+    @staticmethod
+    def input_hash(
+        filename: str,
+        description: str,
+        original_request: str,
+        project_structure: List[str],
+        model: str,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "filename": filename,
+                "description": description,
+                "original_request": original_request,
+                "project_structure": project_structure,
+                "model": model,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def matches(cls, entry: Dict[str, Any], content: Optional[str]) -> bool:
+        """
+        Whether `content` (None = file missing) is the output recorded in `entry`.
+        """
+        if content is None or len(content) != entry["size"]:
+            return False
+        return cls.content_hash(content) == entry["sha256"]
+
+    def lookup(self, filename: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Previous result for `filename` if it was generated from the same inputs.
+        """
+        entry = self.files.get(filename)
+        if not entry or entry.get("hash") != input_hash:
+            return None
+        return {"filename": filename, "path": entry["path"], "size": entry["size"], "sha256": entry["sha256"]}
+
+    def record(self, filename: str, input_hash: str, generated: Dict[str, Any]):
+        self.files[filename] = {
+            "hash": input_hash,
+            "path": str(generated["path"]),
+            "size": generated["size"],
+            "sha256": generated["sha256"],
+        }
+        self._dirty = True
+
+    def forget(self, filename: str):
+        if self.files.pop(filename, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._write(json.dumps({"version": self.VERSION, "files": self.files}, indent=2, sort_keys=True))
+        self._dirty = False
+
+    def _read(self) -> str:
+        if self.fs:
+            return self.fs.read_file(self.path)
+        return self.path.read_text(encoding="utf-8")
+
+    def _write(self, content: str):
+        if self.fs:
+            self.fs.write_file(self.path, content)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(content, encoding="utf-8")
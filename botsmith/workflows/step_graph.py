@@ -0,0 +1,60 @@
+# botsmith/workflows/step_graph.py
+
+from typing import Dict, Any, List, Set
+
+
+DEPENDENCY_FIELDS = ("depends_on", "reads", "writes")
+
+
+def resolve_dependencies(steps: List[Dict[str, Any]]) -> List[Set[int]]:
+    """
+    Resolve which earlier steps each step must wait for.
+
+    A step waits for:
+    - every step named in its `depends_on`
+    - every earlier step whose `writes` overlap its `reads` (read-after-write)
+
+    Steps that declare none of depends_on/reads/writes keep the legacy
+    behaviour and wait for the step right before them.
+
+    Only read-after-write edges are needed because the executor merges step
+    results into the context in declaration order: a step never sees output
+    from a step declared after it, and competing writes land in the same
+    order as a linear run.
+
+    Returns a list (indexed like `steps`) of sets of step indices.
+    """
+    index_by_name: Dict[str, int] = {}
+    for i, step_def in enumerate(steps):
+        index_by_name.setdefault(step_def["step"], i)
+
+    dependencies: List[Set[int]] = []
+
+    for i, step_def in enumerate(steps):
+        deps: Set[int] = set()
+
+        if not any(field in step_def for field in DEPENDENCY_FIELDS):
+            if i > 0:
+                deps.add(i - 1)
+            dependencies.append(deps)
+            continue
+
+        for name in step_def.get("depends_on", []):
+            if name not in index_by_name:
+                raise ValueError(f"Step '{step_def['step']}' depends on unknown step '{name}'")
+            dep = index_by_name[name]
+            if dep >= i:
+                raise ValueError(
+                    f"Step '{step_def['step']}' depends on '{name}', which is not declared before it"
+                )
+            deps.add(dep)
+
+        reads = set(step_def.get("reads", []))
+        if reads:
+            for j in range(i):
+                if reads & set(steps[j].get("writes", [])):
+                    deps.add(j)
+
+        dependencies.append(deps)
+
+    return dependencies
@@ -1,105 +1,293 @@
 import json
+import time
+import asyncio
+import inspect
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 
+from botsmith.core.exceptions.custom_exceptions import WorkflowExecutionError
+from botsmith.llm.cache import CachedLLM
+from botsmith.llm.usage import TokenUsage, UsageMeter
+from botsmith.persistence.models import WorkflowStepResult, WorkflowFileResult, StepUsageRecord
+from botsmith.utils.async_utils import run_sync
+from botsmith.workflows.manifest import GenerationManifest
+from botsmith.workflows.step_graph import resolve_dependencies
 
 
+@dataclass
+class RunState:
+    """
+    Per-run bookkeeping threaded through step execution.
+    run_id stays None when the executor has no workflow repository.
+    """
+    run_id: Optional[int] = None
+    completed_steps: Set[str] = field(default_factory=set)
+    completed_files: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    usage: TokenUsage = field(default_factory=TokenUsage)
+
+
+class FileProgress:
+    """
+    Turns the streamed chunks of one file into file_progress events,
+    at most one per `interval` seconds (the first chunk is always reported).
+    """
+
+    def __init__(self, filename: str, on_event, interval: float):
+        self.filename = filename
+        self.on_event = on_event
+        self.interval = interval
+        self.tokens = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self._last_emit = None
+        self._reported_tokens = 0
+
+    def __call__(self, chunk: str):
+        # Ollama streams about one token per chunk
+        self.tokens += 1
+        self.bytes += len(chunk.encode("utf-8"))
+
+        now = time.monotonic()
+        if self._last_emit is None or now - self._last_emit >= self.interval:
+            self._emit(now)
+
+    def finish(self):
+        """Report the final totals if the last chunks were throttled."""
+        if self.tokens > self._reported_tokens:
+            self._emit(time.monotonic())
+
+    def _emit(self, now: float):
+        self._last_emit = now
+        self._reported_tokens = self.tokens
+        self.on_event("file_progress", self.snapshot(now))
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        elapsed = (now or time.monotonic()) - self.started
+        return {
+            "filename": self.filename,
+            "tokens": self.tokens,
+            "bytes": self.bytes,
+            "elapsed": round(elapsed, 3),
+            "tokens_per_sec": round(self.tokens / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
 
 class WorkflowExecutor:
     """
     Executes workflow steps generated by WorkflowFactory.
     Handles:
-    - Step dispatch
+    - Step dispatch (dependency-ordered, optionally parallel)
     - Context merging
     - Retry logic
     - Failure policies
-    - Special expansion step: generate_all_files
+    - Special expansion step: generate_all_files (optionally concurrent)
     - Final code writing to botsmith/generated/<project_name>
+    - Checkpointing to workflow_runs/workflow_steps/workflow_files and
+      resuming interrupted runs (when a workflow repository is given)
+    - Token usage per step and per run (recorded as step_usage history),
+      and a token/cost budget that stops the run once exceeded
     """
 
     GENERATED_ROOT = Path("generated")
+    # Minimum seconds between file_progress events for one file
+    PROGRESS_INTERVAL = 0.5
 
-    def __init__(self, agent_factory, workflow_repo=None):
+    def __init__(
+        self,
+        agent_factory,
+        workflow_repo=None,
+        max_file_workers: int = 1,
+        max_parallel_steps: int = 1,
+        token_budget: Optional[int] = None,
+        cost_budget: Optional[float] = None,
+    ):
         self.agent_factory = agent_factory
         self.workflow_repo = workflow_repo  # optional
+        # Files generated in parallel by generate_all_files (1 = serial)
+        self.max_file_workers = max(1, max_file_workers)
+        # Independent workflow steps run at once (1 = linear)
+        self.max_parallel_steps = max(1, max_parallel_steps)
+        # Per-run limits on LLM usage (None = unlimited)
+        self.token_budget = token_budget
+        self.cost_budget = cost_budget
 
     # ----------------------------------------------------------------------
     # ENTRY POINT
     # ----------------------------------------------------------------------
     def execute(self, workflow_def: Dict[str, Any], initial_context: Dict[str, Any], on_event=None) -> Dict[str, Any]:
         """
-        Executes the workflow.
+        Synchronous wrapper around execute_async().
+        """
+        return run_sync(self.execute_async(workflow_def, initial_context, on_event))
+
+    async def execute_async(self, workflow_def: Dict[str, Any], initial_context: Dict[str, Any], on_event=None) -> Dict[str, Any]:
+        """
+        Executes the workflow on the running event loop.
+
+        Steps run as soon as the steps they depend on have finished (see
+        step_graph.resolve_dependencies), up to max_parallel_steps at a time.
+        Results are merged into the context, logged and reported in
+        declaration order, so the log and final context match a linear run.
+
         :param on_event: Optional callback(event_type, event_data) for real-time updates.
         """
-        context = dict(initial_context)
+        run = RunState()
+        if self.workflow_repo:
+            # Repository and file I/O runs in worker threads, off the event loop
+            run.run_id = await asyncio.to_thread(
+                self.workflow_repo.create_run,
+                workflow_def.get("workflow_name", "unnamed_workflow"),
+                "running",
+                workflow_def,
+                self._checkpoint_context(initial_context),
+            )
+
+        return await self._execute_run(workflow_def, dict(initial_context), run, on_event)
+
+    def resume(self, run_id: int, runtime_context: Optional[Dict[str, Any]] = None, on_event=None) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around resume_async().
+        """
+        return run_sync(self.resume_async(run_id, runtime_context, on_event))
+
+    async def resume_async(self, run_id: int, runtime_context: Optional[Dict[str, Any]] = None, on_event=None) -> Dict[str, Any]:
+        """
+        Continue a checkpointed run.
+
+        Steps that already succeeded are skipped and files generate_all_files
+        already wrote are reused, so only unfinished LLM work is redone.
+        :param runtime_context: Non-serializable context (e.g. "filesystem")
+                                that checkpoints cannot store.
+        """
+        if not self.workflow_repo:
+            raise WorkflowExecutionError("Resuming a run requires a workflow repository")
+
+        stored, run = await asyncio.to_thread(self._load_run, run_id)
+
+        if on_event:
+            on_event("log", {
+                "message": f"Resuming run {run_id}: {len(run.completed_steps)} steps and "
+                           f"{len(run.completed_files)} files already done"
+            })
+
+        await asyncio.to_thread(self.workflow_repo.update_run_status, run_id, "running")
+        context = {**stored.context, **(runtime_context or {})}
+        return await self._execute_run(stored.workflow_def, context, run, on_event)
+
+    def _load_run(self, run_id: int):
+        """
+        (stored run, RunState with its finished steps and files).
+        """
+        stored = self.workflow_repo.get_run(run_id)
+        if stored is None:
+            raise WorkflowExecutionError(f"Unknown workflow run: {run_id}")
+
+        run = RunState(run_id=run_id)
+        run.completed_steps = {
+            step.step_name for step in self.workflow_repo.list_steps(run_id) if step.status == "success"
+        }
+        run.completed_files = {
+            f.filename: {"filename": f.filename, "path": f.path, "size": f.size}
+            for f in self.workflow_repo.list_files(run_id)
+            if f.status == "success"
+        }
+        return stored, run
+
+    async def _execute_run(self, workflow_def: Dict[str, Any], context: Dict[str, Any], run: RunState, on_event=None) -> Dict[str, Any]:
+        try:
+            with UsageMeter.track(run.usage):
+                result = await self._schedule(workflow_def, context, run, on_event)
+        except BaseException:
+            await asyncio.to_thread(self._finish_run, run, "failed")
+            raise
+
+        await asyncio.to_thread(self._finish_run, run, result["status"])
+        result["run_id"] = run.run_id
+        result["usage"] = {**run.usage.to_dict(), "by_model": run.usage.by_model()}
+        return result
+
+    async def _schedule(self, workflow_def: Dict[str, Any], context: Dict[str, Any], run: RunState, on_event=None) -> Dict[str, Any]:
         log = []
 
         steps = workflow_def["steps"]
+        dependencies = resolve_dependencies(steps)
 
-        for step_def in steps:
-            step_name = step_def["step"]
-            agent_name = step_def["agent"]
-            retry_limit = step_def.get("retry", 1)
-            failure_policy = step_def.get("on_failure", "abort")
+        committed = 0       # steps [0, committed) are merged into context
+        launched = set()
+        running = {}        # task -> step index
+        finished = {}       # step index -> outcome, waiting to be committed
 
-            # Emit step start event
-            if on_event:
-                on_event("step_start", {"step": step_name, "agent": agent_name})
-
-            # Special-case expansion
-            if step_name == "generate_all_files":
-                # Pass on_event to file generator for granular updates
-                result = self._run_generate_all_files(context, step_def, on_event)
-                log.append(self._log_entry(step_name, agent_name, "success", 1, result))
-                context.update(result)
-                
-                if on_event:
-                    on_event("step_complete", {"step": step_name, "status": "success"})
-                continue
-            
-            # Normal step execution
-            attempt = 0
-            success = False
-            last_error = None
-
-            while attempt < retry_limit and not success:
-                attempt += 1
-                try:
-                    result = self._run_step(agent_name, step_name, context)
-                    success = True
-                    context.update(result)
-                    log.append(self._log_entry(step_name, agent_name, "success", attempt, result))
-                    
-                    if on_event:
-                         # Try to extract log/summary from result
-                         summary = result.get("summary") or f"Completed {step_name}"
-                         on_event("log", {"message": summary})
+        # Steps completed by an earlier attempt of this run are committed as-is;
+        # their results are already part of the checkpointed context.
+        for index, step_def in enumerate(steps):
+            if step_def["step"] in run.completed_steps:
+                launched.add(index)
+                finished[index] = {
+                    "success": True,
+                    "resumed": True,
+                    "result": {},
+                    "error": None,
+                    "log": [self._log_entry(step_def["step"], step_def["agent"], "resumed", 0)],
+                    "events": [],
+                }
+
+        try:
+            while committed < len(steps):
+                # 1. Launch every ready step (declaration order breaks ties)
+                for index in range(committed, len(steps)):
+                    if len(running) >= self.max_parallel_steps:
+                        break
+                    if index in launched or any(dep >= committed for dep in dependencies[index]):
+                        continue
 
-                except Exception as e:
-                    last_error = str(e)
-                    log.append(self._log_entry(step_name, agent_name, "failed", attempt, error=last_error))
+                    step_def = steps[index]
+                    launched.add(index)
+
+                    # Emit step start event
                     if on_event:
-                        on_event("log", {"message": f"Error in {step_name}: {last_error}", "level": "error"})
+                        on_event("step_start", {"step": step_def["step"], "agent": step_def["agent"]})
 
-            if success:
-                if on_event:
-                    on_event("step_complete", {"step": step_name, "status": "success"})
-            else:
-                if on_event:
-                    on_event("step_complete", {"step": step_name, "status": "failed", "error": last_error})
-                    
-                if failure_policy == "abort":
-                    return {
-                        "status": "failed",
-                        "failed_step": step_name,
-                        "error": last_error,
-                        "log": log,
-                        "context": context,
-                    }
-                elif failure_policy == "continue":
-                    continue
-                else:
-                    raise ValueError(f"Unknown failure policy: {failure_policy}")
+                    task = asyncio.create_task(self._run_step_def(step_def, dict(context), on_event, run))
+                    running[task] = index
+
+                # 2. Wait for at least one running step (nothing may be running
+                #    when only resumed steps are ready to commit)
+                if running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        finished[running.pop(task)] = task.result()
+
+                # 3. Commit finished steps in declaration order
+                while committed in finished:
+                    step_def = steps[committed]
+                    outcome = finished.pop(committed)
+                    committed += 1
+
+                    failure = self._commit_step(step_def, outcome, context, log, on_event)
+                    if not outcome.get("resumed") and self.workflow_repo is not None:
+                        await asyncio.to_thread(self._persist_step, run, step_def, outcome, context)
+                    if failure:
+                        return failure
+
+                    exceeded = self._budget_exceeded(run)
+                    if exceeded:
+                        if on_event:
+                            on_event("log", {"message": f"Stopping run: {exceeded}", "level": "error"})
+                        return {
+                            "status": "failed",
+                            "failed_step": step_def["step"],
+                            "error": exceeded,
+                            "budget_exceeded": True,
+                            "log": log,
+                            "context": context,
+                        }
+        finally:
+            # Aborted or crashed run: in-flight steps would be discarded anyway
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
 
         return {
             "status": "success",
@@ -107,10 +295,113 @@ class WorkflowExecutor:
             "context": context,
         }
 
+    def _persist_step(self, run: RunState, step_def: Dict[str, Any], outcome: Dict[str, Any], context: Dict[str, Any]):
+        # Step row, checkpoint and usage land in one commit
+        with self.workflow_repo.transaction():
+            self._checkpoint(run, step_def, outcome, context)
+            self._record_usage(run, step_def, outcome)
+
+    def _commit_step(self, step_def: Dict[str, Any], outcome: Dict[str, Any], context: Dict[str, Any], log: List[Dict[str, Any]], on_event=None):
+        """
+        Merge one finished step into the run.
+        Returns the failed workflow result if the step's failure policy aborts the run.
+        """
+        step_name = step_def["step"]
+        failure_policy = step_def.get("on_failure", "abort")
+
+        log.extend(outcome["log"])
+
+        if on_event:
+            for event_type, event_data in outcome["events"]:
+                on_event(event_type, event_data)
+
+        if outcome.get("resumed"):
+            if on_event:
+                on_event("step_complete", {"step": step_name, "status": "success", "resumed": True})
+            return None
+
+        if outcome["success"]:
+            context.update(outcome["result"])
+            if on_event:
+                on_event("step_complete", {"step": step_name, "status": "success", "usage": outcome.get("usage")})
+            return None
+
+        last_error = outcome["error"]
+        if on_event:
+            on_event("step_complete", {"step": step_name, "status": "failed", "error": last_error, "usage": outcome.get("usage")})
+
+        if failure_policy == "abort":
+            return {
+                "status": "failed",
+                "failed_step": step_name,
+                "error": last_error,
+                "log": log,
+                "context": context,
+            }
+        elif failure_policy == "continue":
+            return None
+        else:
+            raise ValueError(f"Unknown failure policy: {failure_policy}")
+
+    async def _run_step_def(self, step_def: Dict[str, Any], context: Dict[str, Any], on_event=None, run: Optional[RunState] = None) -> Dict[str, Any]:
+        """
+        Run one step (with retries) against a snapshot of the context.
+        Log entries and log events are returned rather than emitted, so they
+        can be committed in declaration order.
+        The tokens and timings the step used (all attempts) are returned as
+        "usage" and added to its last log entry, with the per-call metrics
+        tagged by step, agent and model as "llm_calls".
+        """
+        with UsageMeter.track() as usage, UsageMeter.tagged(step=step_def["step"], agent=step_def["agent"]):
+            outcome = await self._run_step_attempts(step_def, context, on_event, run)
+
+        outcome["usage"] = usage.to_dict()
+        if outcome["log"]:
+            outcome["log"][-1]["usage"] = outcome["usage"]
+            outcome["log"][-1]["llm_calls"] = usage.calls_detail()
+        return outcome
+
+    async def _run_step_attempts(self, step_def: Dict[str, Any], context: Dict[str, Any], on_event=None, run: Optional[RunState] = None) -> Dict[str, Any]:
+        step_name = step_def["step"]
+        agent_name = step_def["agent"]
+        retry_limit = step_def.get("retry", 1)
+
+        log = []
+        events = []
+
+        # Special-case expansion
+        if step_name == "generate_all_files":
+            # Pass on_event to file generator for granular updates
+            result = await self._run_generate_all_files(context, step_def, on_event, run)
+            log.append(self._log_entry(step_name, agent_name, "success", 1, result))
+            return {"success": True, "result": result, "error": None, "log": log, "events": events}
+
+        # Normal step execution
+        attempt = 0
+        last_error = None
+
+        while attempt < retry_limit:
+            attempt += 1
+            try:
+                result = await self._run_step(agent_name, step_name, context)
+                log.append(self._log_entry(step_name, agent_name, "success", attempt, result))
+
+                # Try to extract log/summary from result
+                summary = result.get("summary") or f"Completed {step_name}"
+                events.append(("log", {"message": summary}))
+                return {"success": True, "result": result, "error": None, "log": log, "events": events}
+
+            except Exception as e:
+                last_error = str(e)
+                log.append(self._log_entry(step_name, agent_name, "failed", attempt, error=last_error))
+                events.append(("log", {"message": f"Error in {step_name}: {last_error}", "level": "error"}))
+
+        return {"success": False, "result": None, "error": last_error, "log": log, "events": events}
+
     # ----------------------------------------------------------------------
     # STEP EXECUTION
     # ----------------------------------------------------------------------
-    def _run_step(self, agent_type: str, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def _run_step(self, agent_type: str, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         from botsmith.agents.registry import AgentRegistry
         agent_cls = AgentRegistry.get(agent_type)
         agent = self.agent_factory.create_agent({
@@ -120,19 +411,44 @@ class WorkflowExecutor:
                 "agent_type": "logic"
             }
         })
-        return agent.execute(task, context)
+        return await self._call_agent(agent, task, context)
+
+    async def _call_agent(self, agent, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Await the agent natively when it supports execute_async, otherwise
+        run its sync execute() in a worker thread.
+        """
+        execute_async = getattr(agent, "execute_async", None)
+        if inspect.iscoroutinefunction(execute_async):
+            return await execute_async(task, context)
+        return await asyncio.to_thread(agent.execute, task, context)
 
     # ----------------------------------------------------------------------
     # SPECIAL CASE: GENERATE ALL FILES
     # ----------------------------------------------------------------------
-    def _run_generate_all_files(self, context: Dict[str, Any], step_def: Dict[str, Any], on_event=None) -> Dict[str, Any]:
+    async def _run_generate_all_files(self, context: Dict[str, Any], step_def: Dict[str, Any], on_event=None, run: Optional[RunState] = None) -> Dict[str, Any]:
         """
         file_plan_agent must have produced:
         context["files"] = [
             {"filename": "...", "description": "..."},
             ...
         ]
+
+        Files are generated by up to `max_workers` agents at once (step
+        definition overrides the executor default). Results and file_complete
+        events are always reported in plan order, whatever order the LLM calls
+        finish in; file_start is emitted when a file's generation actually
+        starts (a worker is free), which for reused files is never.
+        Each file is checkpointed as soon as it is written; on resume, files
+        still on disk from the interrupted attempt are reused.
+
+        Files whose inputs (description, request, project structure, model)
+        hash the same as in the project's generation manifest, and whose
+        content on disk is still what was generated, are reused without an
+        LLM call, unless context["force_regenerate"], which also bypasses
+        the LLM response cache for the files' prompts.
         """
+        run = run or RunState()
 
         project_name = context["project_name"].lower().replace(" ", "_")
         
@@ -141,90 +457,311 @@ class WorkflowExecutor:
             output_dir = None # We will use fs relative paths
         else:
             output_dir = self.GENERATED_ROOT / project_name
-            output_dir.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+
+        files = context.get("files", [])
+        workers = max(1, int(step_def.get("max_workers", self.max_file_workers)))
+
+        manifest = await asyncio.to_thread(GenerationManifest.load, fs, project_name if fs else output_dir)
+        force = context.get("force_regenerate", False)
+        reused = set()
+
+        semaphore = asyncio.Semaphore(workers)
+
+        async def generate(file_info):
+            filename = file_info["filename"]
+            resumed = await asyncio.to_thread(self._resumed_file, run, filename, fs)
+            if resumed:
+                return resumed, None
+
+            exceeded = self._budget_exceeded(run)
+            if exceeded:
+                # The run stops when this step commits; do not spend more
+                return None, {"filename": filename, "error": f"Skipped: {exceeded}"}
+
+            input_hash = self._file_input_hash(file_info, context)
+            previous = None if force else manifest.lookup(filename, input_hash)
+            if previous and GenerationManifest.matches(previous, await asyncio.to_thread(self._read_output, fs, previous["path"])):
+                print(f"    [Executor] Unchanged, reusing: {filename}")
+                reused.add(filename)
+                outcome = previous, None
+            else:
+                # Forced: the same prompts must reach the model, not the response cache
+                async with semaphore:
+                    with CachedLLM.bypassing(force):
+                        outcome = await self._generate_file(file_info, context, project_name, fs, output_dir, on_event)
+                if outcome[0]:
+                    manifest.record(filename, input_hash, outcome[0])
+                else:
+                    manifest.forget(filename)
+
+            await asyncio.to_thread(self._record_file, run, filename, outcome)
+            return outcome
 
         generated_files = []
         errors = []
 
-        for file_info in context.get("files", []):
-            filename = file_info["filename"]
-            description = file_info["description"]
-            
-            print(f"    [Executor] Generating file: {filename}...")
+        def collect(outcome):
+            generated, error = outcome
+            if error:
+                errors.append(error)
+                return
+            generated_files.append(generated)
             if on_event:
-                on_event("file_start", {"filename": filename, "description": description})
-
-            # Determine agent based on extension
-            is_doc = any(filename.endswith(ext) for ext in [".md", ".txt", ".rst"])
-            agent_type = "doc_writer" if is_doc else "coder"
-            agent_role = "doc" if is_doc else "code"
-            
-            # Generate
-            agent = self.agent_factory.create_agent({
-                "type": agent_type, 
-                "params": {
-                    "agent_id": f"{agent_type}_{filename}",
-                    "agent_type": agent_role
-                }
-            })
-            
-            # Create a clean context for the single file generation
-            # Remove 'files' to prevent CodeGeneratorAgent from entering batch mode
-            coder_context = context.copy()
-            # Pass file list as project_structure so the coder sees it
-            coder_context["project_structure"] = [f["filename"] for f in context.get("files", [])]
-            
-            if "files" in coder_context:
-                del coder_context["files"]
-            
-            result = agent.execute("generate_content", {
-                **coder_context,
-                "filename": filename,
-                "description": description
-            })
-
-            if not result.get("validated"):
-                errors.append({
-                    "filename": filename,
-                    "error": result.get("error"),
+                on_event("file_complete", {
+                    "filename": generated["filename"],
+                    "path": generated["path"],
+                    "reused": generated["filename"] in reused,
                 })
-                continue
 
-            # Write code to disk
-            if fs:
-                # FilePlanAgent produces paths like "src/project/main.py"
-                # We need to ensure we write to "{project_name}/{filename}"
-                # But wait! FilePlanAgent output ALREADY contains "src/{project_name}/..."
-                # Only if the filename doesn't start with project_name do we need to care?
-                # Actually, ProjectScaffoldAgent creates "project_name" dir.
-                # If filename is "src/bot/main.py", we want "bot/src/bot/main.py" ??
-                # Let's look at ProjectScaffoldAgent again.
-                # It creates "project_name" directory.
-                # Then "src" inside it.
-                # So "project_name/src/project_name/main.py".
-                # If filename is "src/project_name/main.py", we need "project_name/src/project_name/main.py".
-                full_rel_path = f"{project_name}/{filename}"
-                fs.write_file(full_rel_path, result["code"])
-                file_path = full_rel_path # for logging
+        try:
+            if workers == 1 or len(files) <= 1:
+                for file_info in files:
+                    collect(await generate(file_info))
             else:
-                file_path = output_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                file_path.write_text(result["code"], encoding="utf-8")
+                # Queue every file up front, then collect in plan order so
+                # generated_files/file_errors and the file_complete events are
+                # deterministic.
+                tasks = [asyncio.create_task(generate(file_info)) for file_info in files]
 
-            generated_files.append({
-                "filename": filename,
-                "path": str(file_path),
-                "size": len(result["code"]),
-            })
-            
-            if on_event:
-                on_event("file_complete", {"filename": filename, "path": str(file_path)})
+                try:
+                    for task in tasks:
+                        collect(await task)
+                finally:
+                    # Only pending work is affected: after a failure, stop the rest
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # Keep what was generated even if the step fails part-way
+            await asyncio.to_thread(manifest.save)
 
         return {
             "generated_files": generated_files,
             "file_errors": errors,
+            "reused_files": [f["filename"] for f in generated_files if f["filename"] in reused],
         }
 
+    def _announce_file(self, file_info: Dict[str, Any], on_event=None):
+        print(f"    [Executor] Generating file: {file_info['filename']}...")
+        if on_event:
+            on_event("file_start", {"filename": file_info["filename"], "description": file_info["description"]})
+
+    async def _generate_file(self, file_info: Dict[str, Any], context: Dict[str, Any], project_name: str, fs, output_dir, on_event=None):
+        """
+        Generate and write a single planned file (the caller holds a worker
+        slot). With on_event, a file_start event is emitted and the response
+        is streamed and reported as file_progress events.
+        Returns (generated_entry, None) on success or (None, error_entry).
+        """
+        filename = file_info["filename"]
+        description = file_info["description"]
+        self._announce_file(file_info, on_event)
+
+        agent_type, agent_role = self._file_agent(filename)
+        
+        # Generate
+        agent = self.agent_factory.create_agent({
+            "type": agent_type, 
+            "params": {
+                "agent_id": f"{agent_type}_{filename}",
+                "agent_type": agent_role
+            }
+        })
+        
+        # Create a clean context for the single file generation
+        # Remove 'files' to prevent CodeGeneratorAgent from entering batch mode
+        coder_context = context.copy()
+        # Pass file list as project_structure so the coder sees it
+        coder_context["project_structure"] = self._project_structure(context)
+        
+        if "files" in coder_context:
+            del coder_context["files"]
+        
+        progress = None
+        if on_event:
+            progress = FileProgress(filename, on_event, self.PROGRESS_INTERVAL)
+            coder_context["on_progress"] = progress
+
+        with UsageMeter.tagged(agent=agent_type, file=filename):
+            result = await self._call_agent(agent, "generate_content", {
+                **coder_context,
+                "filename": filename,
+                "description": description
+            })
+        if progress:
+            progress.finish()
+
+        if not result.get("validated"):
+            return None, {
+                "filename": filename,
+                "error": result.get("error"),
+            }
+
+        # Write code to disk
+        file_path = await asyncio.to_thread(self._write_output, fs, output_dir, project_name, filename, result["code"])
+
+        return {
+            "filename": filename,
+            "path": str(file_path),
+            "size": len(result["code"]),
+            "sha256": GenerationManifest.content_hash(result["code"]),
+        }, None
+
+    @staticmethod
+    def _write_output(fs, output_dir, project_name: str, filename: str, code: str):
+        """
+        Write a generated file and return its path (relative to fs when given).
+        """
+        if fs:
+            # FilePlanAgent's paths ("src/<project>/main.py") are relative to
+            # the project directory the scaffolder created
+            full_rel_path = f"{project_name}/{filename}"
+            fs.write_file(full_rel_path, code)
+            return full_rel_path
+
+        file_path = output_dir / filename
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(code, encoding="utf-8")
+        return file_path
+
+    @staticmethod
+    def _file_agent(filename: str):
+        """
+        (agent_type, agent_role) that generates `filename`, based on its extension.
+        """
+        is_doc = any(filename.endswith(ext) for ext in [".md", ".txt", ".rst"])
+        if is_doc:
+            return "doc_writer", "doc"
+        return "coder", "code"
+
+    @staticmethod
+    def _project_structure(context: Dict[str, Any]) -> List[str]:
+        return [f["filename"] for f in context.get("files", [])]
+
+    def _file_input_hash(self, file_info: Dict[str, Any], context: Dict[str, Any]) -> str:
+        agent_type, _ = self._file_agent(file_info["filename"])
+        model_id_for = getattr(self.agent_factory, "model_id_for", None)
+        model = str(model_id_for(agent_type)) if model_id_for else ""
+
+        return GenerationManifest.input_hash(
+            filename=file_info["filename"],
+            description=file_info["description"],
+            original_request=context.get("original_request", ""),
+            project_structure=self._project_structure(context),
+            model=model,
+        )
+
+    @staticmethod
+    def _file_exists(fs, path: str) -> bool:
+        if fs:
+            return fs.exists(path) if hasattr(fs, "exists") else True
+        return Path(path).exists()
+
+    @staticmethod
+    def _read_output(fs, path: str) -> Optional[str]:
+        """
+        Current content of a generated file, or None if it is gone.
+        """
+        try:
+            if fs:
+                return fs.read_file(path)
+            return Path(path).read_text(encoding="utf-8")
+        except (OSError, AttributeError):
+            return None
+
+    # ----------------------------------------------------------------------
+    # CHECKPOINTING
+    # ----------------------------------------------------------------------
+    def _checkpoint(self, run: RunState, step_def: Dict[str, Any], outcome: Dict[str, Any], context: Dict[str, Any]):
+        if run.run_id is None:
+            return
+
+        output = outcome["result"] if outcome["success"] else {"error": outcome["error"]}
+        self.workflow_repo.save_step(WorkflowStepResult(
+            run_id=run.run_id,
+            step_name=step_def["step"],
+            agent=step_def["agent"],
+            status="success" if outcome["success"] else "failed",
+            output=json.dumps(output, default=str),
+        ))
+        self.workflow_repo.save_checkpoint(run.run_id, self._checkpoint_context(context))
+
+    def _record_file(self, run: RunState, filename: str, outcome):
+        if run.run_id is None:
+            return
+
+        generated, error = outcome
+        if generated:
+            record = WorkflowFileResult(run.run_id, filename, "success", generated["path"], generated["size"])
+        else:
+            record = WorkflowFileResult(run.run_id, filename, "failed", error=error.get("error"))
+        self.workflow_repo.save_file_result(record)
+
+    def _resumed_file(self, run: RunState, filename: str, fs) -> Optional[Dict[str, Any]]:
+        """
+        Entry for a file written by an earlier attempt of this run, if it is still on disk.
+        """
+        entry = run.completed_files.get(filename)
+        if not entry:
+            return None
+
+        return dict(entry) if self._file_exists(fs, entry["path"]) else None
+
+    # ----------------------------------------------------------------------
+    # USAGE & BUDGET
+    # ----------------------------------------------------------------------
+    def _record_usage(self, run: RunState, step_def: Dict[str, Any], outcome: Dict[str, Any]):
+        usage = outcome.get("usage")
+        if self.workflow_repo is None or not usage or not usage["calls"]:
+            return
+
+        units = 1
+        if step_def["step"] == "generate_all_files" and outcome["success"]:
+            result = outcome["result"]
+            # Reused files cost nothing, so they do not count towards the per-file average
+            units = len(result["generated_files"]) + len(result["file_errors"]) - len(result["reused_files"])
+
+        self.workflow_repo.save_step_usage(StepUsageRecord(
+            run_id=run.run_id,
+            step_name=step_def["step"],
+            agent=step_def["agent"],
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            calls=usage["calls"],
+            cost=usage["cost"],
+            units=max(1, units),
+        ))
+
+    def _budget_exceeded(self, run: RunState) -> Optional[str]:
+        """
+        Why the run is over budget, or None.
+        """
+        if self.token_budget is not None and run.usage.total_tokens > self.token_budget:
+            return f"Token budget exceeded ({run.usage.total_tokens} > {self.token_budget} tokens)"
+        if self.cost_budget is not None and run.usage.cost > self.cost_budget:
+            return f"Cost budget exceeded ({run.usage.cost:.4f} > {self.cost_budget})"
+        return None
+
+    def _finish_run(self, run: RunState, status: str):
+        if run.run_id is not None:
+            self.workflow_repo.update_run_status(run.run_id, status)
+
+    @staticmethod
+    def _checkpoint_context(context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        JSON-serializable part of the context. Runtime objects such as the
+        filesystem are passed again as runtime_context on resume.
+        """
+        snapshot = {}
+        for key, value in context.items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            snapshot[key] = value
+        return snapshot
+
     # ----------------------------------------------------------------------
     # LOGGING STRUCTURE
     # ----------------------------------------------------------------------
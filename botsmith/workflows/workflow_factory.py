@@ -35,6 +35,10 @@ class WorkflowFactory:
 
     # ------------------------------------------------------------------
     # INTERNAL: convert planner plan -> BotSmith workflow steps
+    #
+    # Each step declares the context keys it reads and writes, plus any
+    # ordering that is not visible through context keys (depends_on).
+    # WorkflowExecutor runs steps whose dependencies are satisfied in parallel.
     # ------------------------------------------------------------------
     def _build_steps(self, plan: List[str], context: Dict[str, Any]) -> List[Dict[str, Any]]:
         steps = []
@@ -46,7 +50,10 @@ class WorkflowFactory:
             "step": "scaffold_project",
             "agent": "scaffolder",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            "depends_on": [],
+            "reads": ["filesystem", "project_name"],
+            "writes": ["project_path", "package_path", "files", "scaffolded"],
         })
         order += 1
 
@@ -56,7 +63,10 @@ class WorkflowFactory:
             "step": "cost_estimation",
             "agent": "cost_estimator",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            "depends_on": [],
+            "reads": ["steps", "budget"],
+            "writes": ["estimated_cost", "budget", "approved", "breakdown"],
         })
         order += 1
 
@@ -66,7 +76,24 @@ class WorkflowFactory:
             "step": "plan_files",
             "agent": "file_planner",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            # Cost is a gate: no LLM work before it approves the run
+            "depends_on": ["cost_estimation"],
+            "reads": ["original_request", "plan", "project_name"],
+            "writes": ["files", "file_count", "summary", "status"],
+        })
+        order += 1
+
+        # Governance: re-estimate with the planned file count before codegen
+        steps.append({
+            "order": order,
+            "step": "cost_recheck",
+            "agent": "cost_estimator",
+            "retry": 1,
+            "on_failure": "abort",
+            "depends_on": ["plan_files"],
+            "reads": ["steps", "budget", "file_count"],
+            "writes": ["estimated_cost", "budget", "approved", "breakdown"],
         })
         order += 1
 
@@ -78,7 +105,10 @@ class WorkflowFactory:
                     "step": step,
                     "agent": "planner",
                     "retry": 1,
-                    "on_failure": "abort"
+                    "on_failure": "abort",
+                    "depends_on": [],
+                    "reads": [],
+                    "writes": ["plan", "confidence"],
                 })
                 order += 1
 
@@ -89,7 +119,11 @@ class WorkflowFactory:
             "step": "generate_all_files",
             "agent": "coder",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            # Files are written into the scaffolded project tree
+            "depends_on": ["scaffold_project", "plan_files", "cost_recheck"],
+            "reads": ["files", "project_name", "filesystem", "original_request"],
+            "writes": ["generated_files", "file_errors"],
         })
         order += 1
 
@@ -99,7 +133,10 @@ class WorkflowFactory:
             "step": "validate_code",
             "agent": "validator",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            "depends_on": ["generate_all_files"],
+            "reads": ["plan"],
+            "writes": ["valid", "errors", "message"],
         })
         order += 1
 
@@ -109,7 +146,10 @@ class WorkflowFactory:
             "step": "security_scan",
             "agent": "security",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            "depends_on": [],
+            "reads": ["steps", "generated_files"],
+            "writes": ["secure", "violations"],
         })
         order += 1
 
@@ -119,7 +159,10 @@ class WorkflowFactory:
             "step": "optimize_workflow",
             "agent": "optimizer",
             "retry": 1,
-            "on_failure": "continue"
+            "on_failure": "continue",
+            "depends_on": [],
+            "reads": ["steps"],
+            "writes": ["optimized_steps", "original_count", "optimized_count", "status", "reason"],
         })
         order += 1
 
@@ -129,7 +172,11 @@ class WorkflowFactory:
             "step": "deployment",
             "agent": "executor",
             "retry": 1,
-            "on_failure": "abort"
+            "on_failure": "abort",
+            # Only deploy once every gate has passed
+            "depends_on": ["validate_code", "security_scan", "optimize_workflow"],
+            "reads": ["dry_run"],
+            "writes": ["executed", "skipped", "errors", "dry_run", "status"],
         })
 
         return steps
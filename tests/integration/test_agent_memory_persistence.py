@@ -50,7 +50,11 @@ def test_agent_memory_persists_across_instances():
     from botsmith.core.memory import MemoryScope
     
     project_store = mm2.get_store(MemoryScope.PROJECT)
-    interaction = project_store.read("interaction_1")
+    interactions = [
+        entry["value"] for key, entry in project_store.snapshot()
+        if key.startswith("interaction:memory_test_agent:")
+    ]
+    interaction = interactions[0] if interactions else None
     
     assert interaction is not None
     assert interaction["task"] == "test task"
@@ -0,0 +1,163 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.agents.specialized.code_generator_agent import CodeGeneratorAgent
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.core.interfaces.llm_interface import ILLMWrapper
+
+
+class FakeLLM(ILLMWrapper):
+    """
+    Scripted LLM backend.
+
+    reply: the answer - a string, a list of answers (one per call) or a
+    function (prompt, system_prompt) -> answer, which may raise. Without
+    one the LLM answers its name. Calls take `delay` seconds (or
+    delay(prompt)); with fail=True they raise LLMUnavailableError.
+    chunks: what streams yield, each after `chunk_delay`; without chunks a
+    stream is the whole answer. sync=False rejects the sync API, for tests
+    of the async path.
+
+    Records each (prompt, system_prompt) in `calls`, the peak number of
+    calls in flight, the threads that awaited it and how many waits were
+    cancelled.
+    """
+
+    BACKEND = "fake"
+
+    def __init__(self, reply=None, name="fake", backend=None, delay=0.0, fail=False,
+                 chunks=None, chunk_delay=0.0, sync=True, options=None):
+        self.reply = list(reply) if isinstance(reply, (list, tuple)) else reply
+        self.name = self.model = name
+        if backend:
+            self.BACKEND = backend
+        if options is not None:
+            self.options = options
+        self.delay = delay
+        self.fail = fail
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.sync = sync
+
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self.threads = set()
+        self.cancelled = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        self._check_sync()
+        self._begin(prompt, system_prompt)
+        try:
+            time.sleep(self._delay(prompt))
+            return self._answer(prompt, system_prompt)
+        finally:
+            self.in_flight -= 1
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        self._begin(prompt, system_prompt)
+        try:
+            await self._sleep(self._delay(prompt))
+            return self._answer(prompt, system_prompt)
+        finally:
+            self.in_flight -= 1
+
+    def stream(self, prompt: str, system_prompt: str = ""):
+        self._check_sync()
+        if self.chunks is None:
+            yield self.generate(prompt, system_prompt)
+            return
+        self._begin(prompt, system_prompt)
+        try:
+            for chunk in self.chunks:
+                time.sleep(self.chunk_delay)
+                self._check_failure()
+                yield chunk
+        finally:
+            self.in_flight -= 1
+
+    async def astream(self, prompt: str, system_prompt: str = ""):
+        if self.chunks is None:
+            yield await self.agenerate(prompt, system_prompt)
+            return
+        self._begin(prompt, system_prompt)
+        try:
+            for chunk in self.chunks:
+                await self._sleep(self.chunk_delay)
+                self._check_failure()
+                yield chunk
+        finally:
+            self.in_flight -= 1
+
+    def _check_sync(self):
+        if not self.sync:
+            raise AssertionError("async path expected")
+
+    def _begin(self, prompt: str, system_prompt: str):
+        self.calls.append((prompt, system_prompt))
+        self.threads.add(threading.get_ident())
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def _delay(self, prompt: str) -> float:
+        return self.delay(prompt) if callable(self.delay) else self.delay
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    def _check_failure(self):
+        if self.fail:
+            raise LLMUnavailableError(f"{self.name} down")
+
+    def _answer(self, prompt: str, system_prompt: str) -> str:
+        self._check_failure()
+        if self.reply is None:
+            return self.name
+        if isinstance(self.reply, list):
+            return self.reply.pop(0)
+        if callable(self.reply):
+            return self.reply(prompt, system_prompt)
+        return self.reply
+
+
+@pytest.fixture
+def fake_llm():
+    """The FakeLLM class: fake_llm(reply, name=..., delay=..., ...)."""
+    return FakeLLM
+
+
+@pytest.fixture
+def agent_factory():
+    """
+    make(build=None, llm=None): stand-in for AgentFactory. create_agent()
+    returns a fresh build() per step/file, or with `llm` a
+    CodeGeneratorAgent on that LLM with the step's params.
+    """
+    def make(build=None, llm=None):
+        factory = MagicMock()
+        if llm is not None:
+            factory.create_agent.side_effect = lambda config: CodeGeneratorAgent(
+                llm=llm, memory_manager=MagicMock(), **config["params"]
+            )
+        else:
+            factory.create_agent.side_effect = lambda config: build()
+        return factory
+
+    return make
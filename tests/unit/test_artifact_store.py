@@ -0,0 +1,69 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.memory import MemoryScope, MemoryUpdateProposal
+from botsmith.memory import ArtifactStore, SQLiteMemoryManager
+from botsmith.persistence.database import get_connection
+
+CODE = "import os\n\n" + "print('x')\n" * 200
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.put(CODE)
+    second = store.put(CODE)
+
+    assert first == second
+    assert first["size"] == len(CODE) and first["summary"] == "import os"
+    assert (tmp_path / first["$artifact"][:2] / first["$artifact"]).exists()
+    assert list(store.digests()) == [first["$artifact"]]
+    assert store.get(first) == CODE
+
+
+def test_storing_again_refreshes_mtime(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    digest = store.put(CODE)["$artifact"]
+    path = tmp_path / digest[:2] / digest
+    os.utime(path, (0, 0))
+
+    store.put(CODE)
+
+    assert store.stat(digest).st_mtime > 0
+
+
+def test_only_large_strings_are_externalized(tmp_path):
+    store = ArtifactStore(str(tmp_path), inline_limit=100)
+    value = {"task": "generate", "result": {"filename": "main.py", "code": CODE}, "files": [CODE]}
+
+    stored = store.externalize(value)
+
+    assert stored["task"] == "generate" and stored["result"]["filename"] == "main.py"
+    assert ArtifactStore.is_ref(stored["result"]["code"]) and ArtifactStore.is_ref(stored["files"][0])
+    assert store.resolve(stored) == value
+
+
+def test_memory_keeps_references_to_generated_code(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    manager = SQLiteMemoryManager(db_path=db_path, artifact_store=ArtifactStore(str(tmp_path / "artifacts"), 100))
+
+    manager.propose(MemoryUpdateProposal(
+        key="interaction_1",
+        value={"task": "generate_content", "result": {"code": CODE}},
+        confidence=1.0,
+        justification="test",
+        suggested_scope=MemoryScope.PROJECT,
+        source="agent:coder",
+    ))
+    manager.flush()
+
+    entry = manager.read(MemoryScope.PROJECT, "interaction_1")
+    assert ArtifactStore.is_ref(entry["result"]["code"])
+    assert manager.load_artifact(entry)["result"]["code"] == CODE
+    row = get_connection(db_path).execute("SELECT value FROM memory_store WHERE key = 'interaction_1'").fetchone()
+    assert len(row["value"]) < 300
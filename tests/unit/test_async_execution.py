@@ -0,0 +1,73 @@
+import sys
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.agents.specialized.code_generator_agent import CodeGeneratorAgent
+from botsmith.llm.concurrency import BackendSlots
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+def _async_llm(fake_llm):
+    """Answers only through agenerate, taking 50ms per call."""
+    return fake_llm("def run():\n    return 1\n", delay=0.05, sync=False)
+
+
+def test_agent_execute_async_awaits_llm_on_loop(fake_llm):
+    llm = _async_llm(fake_llm)
+    agent = CodeGeneratorAgent(agent_id="coder", agent_type="code", llm=llm, memory_manager=MagicMock())
+
+    result = asyncio.run(agent.execute_async("generate_content", {"filename": "main.py", "description": "entry"}))
+
+    assert result["validated"] is True
+    assert llm.threads == {threading.get_ident()}
+    assert agent.get_performance_metrics()["successes"] == 1
+
+
+def test_sync_execute_wraps_async_path(tmp_path, fake_llm, agent_factory):
+    llm = _async_llm(fake_llm)
+    executor = WorkflowExecutor(agent_factory(llm=llm), max_file_workers=3)
+    executor.GENERATED_ROOT = tmp_path
+    workflow = {"steps": [{"step": "generate_all_files", "agent": "coder"}]}
+    context = {
+        "project_name": "bot",
+        "files": [{"filename": f"mod_{i}.py", "description": "module"} for i in range(6)],
+    }
+
+    result = executor.execute(workflow, context)
+
+    assert result["status"] == "success"
+    assert len(result["context"]["generated_files"]) == 6
+    # All LLM calls shared one event loop thread, three at a time
+    assert len(llm.threads) == 1
+    assert llm.peak == 3
+
+
+def test_backend_slots_hand_over_across_threads_and_loops():
+    slots = BackendSlots(1)
+    slots.acquire()
+    order = []
+
+    async def waiter(name):
+        await slots.aacquire()
+        order.append(name)
+        slots.release()
+
+    async def main():
+        cancelled = asyncio.create_task(waiter("cancelled"))
+        first = asyncio.create_task(waiter("first"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        # Released by another thread, as a sync caller would
+        threading.Thread(target=slots.release).start()
+        await first
+
+    asyncio.run(main())
+
+    assert order == ["first"]
+    assert slots.in_use == 0
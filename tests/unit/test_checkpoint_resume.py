@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.persistence.database import init_db
+from botsmith.persistence.repository import WorkflowRepository
+from botsmith.utils.filesystem import LocalFileSystem
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+class Interrupted(BaseException):
+    """Stands in for a process being killed mid-run."""
+
+
+class Agent:
+    def __init__(self, calls, crash_on=None):
+        self.calls = calls
+        self.crash_on = crash_on
+
+    def execute(self, task, context):
+        name = context.get("filename", task)
+        self.calls.append(name)
+        if name == self.crash_on:
+            raise Interrupted()
+        if "filename" in context:
+            return {"code": f"# {name}", "validated": True}
+        return {task: True}
+
+
+def _workflow():
+    files = [{"filename": f"mod_{i}.py", "description": ""} for i in range(3)]
+    return {
+        "workflow_name": "bot_creation_workflow",
+        "steps": [
+            {"step": "plan", "agent": "executor", "retry": 1, "on_failure": "abort"},
+            {"step": "generate_all_files", "agent": "code_generator", "retry": 1, "on_failure": "abort"},
+            {"step": "deploy", "agent": "executor", "retry": 1, "on_failure": "abort"},
+        ],
+    }, files
+
+
+def _executor(agent_factory, repo, calls, crash_on=None):
+    return WorkflowExecutor(agent_factory(lambda: Agent(calls, crash_on)), workflow_repo=repo)
+
+
+def test_resume_skips_finished_steps_and_files(tmp_path, agent_factory):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    repo = WorkflowRepository(db_path)
+    workflow_def, files = _workflow()
+    runtime = {"filesystem": LocalFileSystem(str(tmp_path / "out"))}
+
+    calls = []
+    with pytest.raises(Interrupted):
+        _executor(agent_factory, repo, calls, crash_on="mod_1.py").execute(
+            workflow_def, {"project_name": "bot", "files": files, **runtime}
+        )
+
+    run_id = 1
+    assert repo.get_run(run_id).status == "failed"
+    assert [s.step_name for s in repo.list_steps(run_id)] == ["plan"]
+    assert [f.filename for f in repo.list_files(run_id)] == ["mod_0.py"]
+    # runtime objects are not checkpointed
+    assert "filesystem" not in repo.get_run(run_id).context
+
+    calls = []
+    result = _executor(agent_factory, repo, calls).resume(run_id, runtime)
+
+    assert result["status"] == "success"
+    assert result["run_id"] == run_id
+    assert calls == ["mod_1.py", "mod_2.py", "deploy"]
+    assert [f["filename"] for f in result["context"]["generated_files"]] == ["mod_0.py", "mod_1.py", "mod_2.py"]
+    assert repo.get_run(run_id).status == "success"
+    assert [s.step_name for s in repo.list_steps(run_id)] == ["plan", "generate_all_files", "deploy"]
+
+
+def test_resume_regenerates_files_missing_on_disk(tmp_path, agent_factory):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    repo = WorkflowRepository(db_path)
+    workflow_def, files = _workflow()
+    runtime = {"filesystem": LocalFileSystem(str(tmp_path / "out"))}
+
+    with pytest.raises(Interrupted):
+        _executor(agent_factory, repo, [], crash_on="mod_2.py").execute(
+            workflow_def, {"project_name": "bot", "files": files, **runtime}
+        )
+    (tmp_path / "out" / "bot" / "mod_0.py").unlink()
+
+    calls = []
+    result = _executor(agent_factory, repo, calls).resume(1, runtime)
+
+    assert result["status"] == "success"
+    # mod_1.py is reused, mod_0.py was recorded but deleted since
+    assert calls == ["mod_0.py", "mod_2.py", "deploy"]
+    assert (tmp_path / "out" / "bot" / "mod_0.py").exists()
@@ -0,0 +1,101 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.circuit_breaker import CircuitBreaker
+from botsmith.llm.router import LLMRouter
+
+
+def test_breaker_opens_and_recovers_through_half_open():
+    breaker = CircuitBreaker("local", failure_threshold=2, cooldown_seconds=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # only one trial request at a time
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["times_opened"] == 2
+
+
+def test_router_skips_open_backend(fake_llm):
+    local = fake_llm(name="local", fail=True)
+    gemini = fake_llm(name="gemini")
+    router = LLMRouter(local, gemini_llm=gemini, failure_threshold=2, cooldown_seconds=60)
+
+    for _ in range(5):
+        assert router.generate("implement the module") == "gemini"
+    assert asyncio.run(router.agenerate("implement the module")) == "gemini"
+
+    # local is only tried until its circuit opens
+    assert len(local.calls) == 2
+    assert router.health()["local"]["state"] == CircuitBreaker.OPEN
+    assert "groq" not in router.health()
+
+
+def test_non_code_task_fails_fast_when_local_is_open(fake_llm):
+    local = fake_llm(name="local", fail=True)
+    router = LLMRouter(local, failure_threshold=1, cooldown_seconds=60)
+
+    with pytest.raises(LLMUnavailableError):
+        router.generate("summarise this plan")
+    with pytest.raises(LLMUnavailableError, match="circuits open"):
+        router.generate("summarise this plan")
+    assert len(local.calls) == 1
+
+
+def test_stream_falls_back_when_local_fails(fake_llm):
+    router = LLMRouter(fake_llm(name="local", fail=True), groq_llm=fake_llm(name="groq"))
+    assert list(router.stream("write code please")) == ["groq"]
+
+
+
+def _half_open_router(fake_llm):
+    router = LLMRouter(fake_llm(name="local", chunks=["a", "b"]), failure_threshold=1, cooldown_seconds=0.05)
+    router.breakers["local"].record_failure()
+    time.sleep(0.06)
+    return router
+
+
+def test_stream_closed_during_half_open_trial_frees_the_trial(fake_llm):
+    router = _half_open_router(fake_llm)
+
+    stream = router.stream("implement the module")
+    assert next(stream) == "a"
+    stream.close()
+
+    assert router.breakers["local"].state == CircuitBreaker.HALF_OPEN
+    assert router.breakers["local"].allow_request()
+
+
+def test_async_stream_closed_during_half_open_trial_frees_the_trial(fake_llm):
+    router = _half_open_router(fake_llm)
+
+    async def close_early():
+        stream = router.astream("implement the module")
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+
+    asyncio.run(close_early())
+
+    assert router.breakers["local"].allow_request()
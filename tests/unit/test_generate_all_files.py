@@ -0,0 +1,91 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+from botsmith.utils.filesystem import LocalFileSystem
+
+
+class SlowAgent:
+    """Fake coder: earlier files take longer, so completion order is reversed."""
+
+    active = 0
+    peak = 0
+    finished = 0
+    lock = threading.Lock()
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    def execute(self, task, context):
+        with SlowAgent.lock:
+            SlowAgent.active += 1
+            SlowAgent.peak = max(SlowAgent.peak, SlowAgent.active)
+        time.sleep(self.delays[context["filename"]])
+        with SlowAgent.lock:
+            SlowAgent.active -= 1
+            SlowAgent.finished += 1
+        if context["filename"].endswith("broken.py"):
+            return {"validated": False, "error": "Syntax validation failed"}
+        return {"code": f"# {context['filename']}", "validated": True}
+
+
+def _run(agent_factory, tmp_path, workers):
+    files = [
+        {"filename": f"src/bot/mod_{i}.py", "description": f"module {i}"} for i in range(5)
+    ]
+    files.insert(2, {"filename": "src/bot/broken.py", "description": "bad"})
+    delays = {f["filename"]: 0.05 * (len(files) - i) for i, f in enumerate(files)}
+
+    factory = agent_factory(lambda: SlowAgent(delays))
+
+    events = []
+    context = {
+        "project_name": "bot",
+        "files": files,
+        "filesystem": LocalFileSystem(str(tmp_path)),
+    }
+    SlowAgent.peak = SlowAgent.finished = 0
+    started = []
+
+    def on_event(kind, data):
+        events.append((kind, data["filename"]))
+        if kind == "file_start":
+            # Files generating (announced, agent not done) when this one starts
+            started.append(len(started) + 1 - SlowAgent.finished)
+
+    executor = WorkflowExecutor(factory, max_file_workers=workers)
+    result = asyncio.run(executor._run_generate_all_files(context, {"step": "generate_all_files"}, on_event))
+    return files, result, events, started
+
+
+def test_concurrent_generation_keeps_plan_order(tmp_path, agent_factory):
+    files, result, events, started = _run(agent_factory, tmp_path, workers=3)
+
+    expected = [f["filename"] for f in files if "broken" not in f["filename"]]
+    assert [f["filename"] for f in result["generated_files"]] == expected
+    assert result["file_errors"] == [{"filename": "src/bot/broken.py", "error": "Syntax validation failed"}]
+
+    starts = [name for kind, name in events if kind == "file_start"]
+    completes = [name for kind, name in events if kind == "file_complete"]
+    assert sorted(starts) == sorted(f["filename"] for f in files)
+    assert completes == expected
+    # file_start waits for a free worker
+    assert max(started) <= 3
+    assert 1 < SlowAgent.peak <= 3
+    assert (tmp_path / "bot" / "src" / "bot" / "mod_0.py").read_text() == "# src/bot/mod_0.py"
+
+
+def test_serial_generation_matches_concurrent(tmp_path, agent_factory):
+    _, serial, serial_events, _ = _run(agent_factory, tmp_path / "serial", workers=1)
+    _, parallel, parallel_events, _ = _run(agent_factory, tmp_path / "parallel", workers=4)
+
+    assert SlowAgent.peak == 4
+    assert [f["filename"] for f in serial["generated_files"]] == [f["filename"] for f in parallel["generated_files"]]
+    assert [e for e in serial_events if e[0] == "file_complete"] == [e for e in parallel_events if e[0] == "file_complete"]
@@ -0,0 +1,61 @@
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.agents.specialized.code_generator_agent import CodeGeneratorAgent
+from botsmith.llm.concurrency import BackendLimiter
+
+
+def _answer(prompt, system_prompt):
+    if "broken" in prompt:
+        raise RuntimeError("backend error")
+    return f"answer:{prompt}"
+
+
+def _batch_llm(fake_llm):
+    # later prompts finish first
+    return fake_llm(_answer, backend="batch-test", delay=lambda prompt: 0.05 / (1 + len(prompt)), sync=False)
+
+
+def test_results_keep_input_order_and_isolate_errors(fake_llm):
+    llm = _batch_llm(fake_llm)
+    prompts = ["a", "bb", "broken", "dddd"]
+
+    results = llm.generate_many(prompts, max_in_flight=2)
+
+    assert [r.text for r in results] == ["answer:a", "answer:bb", None, "answer:dddd"]
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert str(results[2].error) == "backend error"
+    assert llm.peak == 2
+
+
+def test_default_limit_follows_backend_cap(fake_llm):
+    BackendLimiter.configure({"batch-test": 3})
+    try:
+        llm = _batch_llm(fake_llm)
+        asyncio.run(llm.agenerate_many([str(i) * i for i in range(8)]))
+        assert llm.peak == 3
+    finally:
+        BackendLimiter.configure({"batch-test": None})
+
+
+def test_code_generator_batch_mode_uses_generate_many(fake_llm):
+    llm = _batch_llm(fake_llm)
+    agent = CodeGeneratorAgent(agent_id="coder", agent_type="code", llm=llm, memory_manager=MagicMock())
+    files = [
+        {"filename": "main.py", "description": "entry"},
+        {"description": "no filename, skipped"},
+        {"filename": "broken.py", "description": "fails"},
+    ]
+
+    result = agent.execute("generate_content", {"files": files, "original_request": "r"})
+
+    assert result["count"] == 2
+    assert [f["filename"] for f in result["generated_files"]] == ["main.py", "broken.py"]
+    assert result["generated_files"][1] == {"filename": "broken.py", "error": "backend error", "validated": False}
+    assert llm.peak == 2
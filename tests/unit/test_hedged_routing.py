@@ -0,0 +1,89 @@
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.llm.router import LLMRouter
+from botsmith.llm.stats import BackendStats
+
+
+def _warm(router, backend, latency, n=10):
+    for _ in range(n):
+        router.stats.record(backend, "code", latency, True)
+
+
+def test_stats_percentiles_need_min_samples():
+    stats = BackendStats(window=10, min_samples=3)
+    stats.record("local", "code", 1.0, True)
+    stats.record("local", "code", 2.0, True)
+    assert stats.percentile("local", "code", 95) is None
+
+    stats.record("local", "code", 3.0, True)
+    stats.record("local", "code", 9.0, False)
+    assert stats.percentile("local", "code", 95) == 3.0
+    assert stats.error_rate("local", "code") == 0.25
+    assert stats.snapshot()["local"]["code"]["samples"] == 4
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled(fake_llm):
+    local = fake_llm(name="local", delay=1.0, sync=False)
+    gemini = fake_llm(name="gemini", delay=0.01, sync=False)
+    router = LLMRouter(local, gemini_llm=gemini, hedging=True, hedge_min_delay=0.05)
+    _warm(router, "local", 0.02)
+
+    assert asyncio.run(router.agenerate("implement the module")) == "gemini"
+    assert local.cancelled == 1
+    # the cancelled attempt is not counted against local
+    assert router.breakers["local"].snapshot()["failures"] == 0
+
+
+def test_fast_primary_is_not_hedged(fake_llm):
+    local = fake_llm(name="local", delay=0.01, sync=False)
+    gemini = fake_llm(name="gemini", delay=0.01, sync=False)
+    router = LLMRouter(local, gemini_llm=gemini, hedging=True, hedge_min_delay=0.5)
+    _warm(router, "local", 0.02)
+
+    assert asyncio.run(router.agenerate("implement the module")) == "local"
+    assert not gemini.calls
+
+
+def test_latency_routing_prefers_faster_backend(fake_llm):
+    local = fake_llm(name="local", delay=0.01, sync=False)
+    gemini = fake_llm(name="gemini", delay=0.01, sync=False)
+    router = LLMRouter(local, gemini_llm=gemini, latency_routing=True)
+    _warm(router, "local", 3.0)
+    _warm(router, "gemini", 0.5)
+
+    assert asyncio.run(router.agenerate("implement the module")) == "gemini"
+    # non-code tasks always stay local
+    assert asyncio.run(router.agenerate("summarise the plan")) == "local"
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_stalled_stream_is_hedged(fake_llm):
+    local = fake_llm(name="local", chunks=["lo", "cal"], chunk_delay=1.0, sync=False)
+    gemini = fake_llm(name="gemini", delay=0.01, sync=False)
+    router = LLMRouter(local, gemini_llm=gemini, hedging=True, hedge_min_delay=0.05)
+    _warm(router, "local", 0.02)
+
+    assert asyncio.run(_collect(router.astream("implement the module"))) == ["gemini"]
+    assert local.cancelled == 1
+    assert router.breakers["local"].snapshot()["failures"] == 0
+
+
+def test_stream_that_starts_in_time_wins(fake_llm):
+    local = fake_llm(name="local", chunks=["lo", "cal"], chunk_delay=0.1, sync=False)
+    gemini = fake_llm(name="gemini", delay=1.0, sync=False)
+    router = LLMRouter(local, gemini_llm=gemini, hedging=True, hedge_min_delay=0.05)
+    _warm(router, "local", 0.02)
+
+    assert asyncio.run(_collect(router.astream("implement the module"))) == ["lo", "cal"]
+    assert gemini.cancelled == 1
+    # streams feed the latency stats the hedge delay comes from
+    assert router.stats.snapshot()["local"]["code"]["samples"] == 11
@@ -0,0 +1,133 @@
+import sys
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.llm.cache import CachedLLM, ResponseCache
+from botsmith.utils.filesystem import LocalFileSystem
+from botsmith.workflows.manifest import GenerationManifest
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+class Agent:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def execute(self, task, context):
+        self.calls.append(context["filename"])
+        return {"code": f"# {context['description']}", "validated": True}
+
+
+def _generate(agent_factory, tmp_path, files, request="a bot", model="ollama:a", force=False):
+    calls = []
+    factory = agent_factory(lambda: Agent(calls))
+    factory.model_id_for.return_value = model
+
+    context = {
+        "project_name": "bot",
+        "original_request": request,
+        "files": files,
+        "filesystem": LocalFileSystem(str(tmp_path)),
+        "force_regenerate": force,
+    }
+    result = asyncio.run(
+        WorkflowExecutor(factory, max_file_workers=2)._run_generate_all_files(context, {"step": "generate_all_files"})
+    )
+    return calls, result
+
+
+def _files(**descriptions):
+    return [{"filename": f"{name}.py", "description": desc} for name, desc in descriptions.items()]
+
+
+def test_unchanged_files_are_reused(tmp_path, agent_factory):
+    files = _files(main="entry point", utils="helpers")
+    calls, _ = _generate(agent_factory, tmp_path, files)
+    assert sorted(calls) == ["main.py", "utils.py"]
+
+    manifest = json.loads((tmp_path / "bot" / GenerationManifest.FILENAME).read_text())
+    assert sorted(manifest["files"]) == ["main.py", "utils.py"]
+
+    files[1]["description"] = "string helpers"
+    calls, result = _generate(agent_factory, tmp_path, files)
+
+    assert calls == ["utils.py"]
+    assert result["reused_files"] == ["main.py"]
+    assert [f["filename"] for f in result["generated_files"]] == ["main.py", "utils.py"]
+    assert (tmp_path / "bot" / "utils.py").read_text() == "# string helpers"
+
+
+def test_request_model_and_force_invalidate(tmp_path, agent_factory):
+    files = _files(main="entry point")
+    _generate(agent_factory, tmp_path, files)
+
+    assert _generate(agent_factory, tmp_path, files)[0] == []
+    assert _generate(agent_factory, tmp_path, files, request="another bot")[0] == ["main.py"]
+    assert _generate(agent_factory, tmp_path, files, request="another bot", model="ollama:b")[0] == ["main.py"]
+    assert _generate(agent_factory, tmp_path, files, request="another bot", model="ollama:b", force=True)[0] == ["main.py"]
+
+
+def test_deleted_file_is_regenerated(tmp_path, agent_factory):
+    files = _files(main="entry point")
+    _generate(agent_factory, tmp_path, files)
+    (tmp_path / "bot" / "main.py").unlink()
+
+    assert _generate(agent_factory, tmp_path, files)[0] == ["main.py"]
+
+
+def test_changed_output_is_regenerated(tmp_path, agent_factory):
+    files = _files(main="entry point")
+    _generate(agent_factory, tmp_path, files)
+    (tmp_path / "bot" / "main.py").write_text("# TODO: Add your bot logic here")
+
+    assert _generate(agent_factory, tmp_path, files)[0] == ["main.py"]
+    assert (tmp_path / "bot" / "main.py").read_text() == "# entry point"
+
+
+def test_rescaffolding_keeps_generated_files(tmp_path, agent_factory):
+    from botsmith.agents.specialized.project_scaffold_agent import ProjectScaffoldAgent
+
+    files = [{"filename": "src/bot/main.py", "description": "entry point"}]
+    main = tmp_path / "bot" / "src" / "bot" / "main.py"
+
+    def scaffold():
+        ProjectScaffoldAgent("scaffolder", "logic", None, MagicMock())._execute(
+            "scaffold_project", {"filesystem": LocalFileSystem(str(tmp_path)), "project_name": "bot"}
+        )
+
+    scaffold()
+    assert "TODO" in main.read_text()
+    assert _generate(agent_factory, tmp_path, files)[0] == ["src/bot/main.py"]
+
+    scaffold()
+    calls, result = _generate(agent_factory, tmp_path, files)
+
+    assert calls == []
+    assert result["reused_files"] == ["src/bot/main.py"]
+    assert main.read_text() == "# entry point"
+
+
+def test_force_bypasses_the_response_cache(tmp_path, fake_llm, agent_factory):
+    backend = fake_llm("x = 1\n", name="coder")
+    factory = agent_factory(llm=CachedLLM(backend, ResponseCache(str(tmp_path / "cache.db"))))
+    executor = WorkflowExecutor(factory)
+
+    def generate(force):
+        context = {
+            "project_name": "bot",
+            "files": _files(main="entry"),
+            "filesystem": LocalFileSystem(str(tmp_path / "out")),
+            "force_regenerate": force,
+        }
+        return asyncio.run(executor._run_generate_all_files(context, {"step": "generate_all_files"}))
+
+    generate(force=False)
+    result = generate(force=True)
+
+    assert len(backend.calls) == 2
+    assert result["reused_files"] == []
@@ -0,0 +1,83 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.llm.cache import CachedLLM, ResponseCache
+
+
+def test_identical_requests_hit_the_cache(tmp_path, fake_llm):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    llm = fake_llm(name="m1")
+    cached = CachedLLM(llm, cache)
+
+    first = cached.generate("write code", "sys")
+    assert cached.generate("write code", "sys") == first
+    assert asyncio.run(cached.agenerate("write code", "sys")) == first
+    assert len(llm.calls) == 1
+
+    cached.generate("write code", "other system prompt")
+    CachedLLM(fake_llm(name="m2"), cache).generate("write code", "sys")
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["entries"] == 3
+
+
+def test_cache_persists_across_instances(tmp_path, fake_llm):
+    path = str(tmp_path / "cache.db")
+    CachedLLM(fake_llm(name="m1"), ResponseCache(path)).generate("p")
+
+    llm = fake_llm(name="m1")
+    CachedLLM(llm, ResponseCache(path)).generate("p")
+    assert len(llm.calls) == 0
+
+
+def test_bypass_skips_reads_but_refreshes(tmp_path, fake_llm):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    llm = fake_llm(name="m1")
+    CachedLLM(llm, cache).generate("p")
+
+    refreshed = CachedLLM(llm, cache, bypass=True).generate("p")
+    assert len(llm.calls) == 2
+    assert CachedLLM(llm, cache).generate("p") == refreshed
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.put("a", "m", "1")
+    time.sleep(0.01)
+    cache.put("b", "m", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    cache.put("c", "m", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    cache = ResponseCache(str(tmp_path / "bytes.db"), max_bytes=10)
+    cache.put("a", "m", "x" * 6)
+    cache.put("b", "m", "y" * 6)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+
+    cache = ResponseCache(str(tmp_path / "ttl.db"), ttl_seconds=0.01)
+    cache.put("a", "m", "1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_hits_write_access_times_with_the_next_put(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("a", "m", "1")
+    stored = cache._conn.execute("SELECT last_access FROM llm_cache WHERE key = 'a'").fetchone()[0]
+
+    time.sleep(0.01)
+    assert cache.get("a") == "1"
+    assert not cache._conn.in_transaction
+    assert cache._conn.execute("SELECT last_access FROM llm_cache WHERE key = 'a'").fetchone()[0] == stored
+
+    cache.put("b", "m", "2")
+    assert cache._conn.execute("SELECT last_access FROM llm_cache WHERE key = 'a'").fetchone()[0] > stored
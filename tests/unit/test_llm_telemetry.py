@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.llm.usage import UsageMeter
+from botsmith.llm.wrapper import OllamaLLM
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+SECOND = 1_000_000_000
+
+
+def _ollama_response(monkeypatch):
+    response = MagicMock()
+    response.json.return_value = {
+        "response": "ok",
+        "prompt_eval_count": 200,
+        "eval_count": 50,
+        "total_duration": 4 * SECOND,
+        "load_duration": 1 * SECOND,
+        "prompt_eval_duration": SECOND // 2,
+        "eval_duration": 2 * SECOND,
+    }
+    session = MagicMock()
+    session.post.return_value = response
+    monkeypatch.setattr(OllamaLLM, "_session", lambda self: session)
+    monkeypatch.setattr(OllamaLLM, "is_available", lambda self: True)
+
+
+def test_ollama_timings_become_call_metrics(monkeypatch):
+    _ollama_response(monkeypatch)
+
+    with UsageMeter.track() as usage, UsageMeter.tagged(step="plan_files", agent="file_planner"):
+        OllamaLLM(model="qwen2.5:3b").generate("p")
+
+    call = usage.calls_detail()[0]
+    assert call["model"] == "qwen2.5:3b"
+    assert call["step"] == "plan_files" and call["agent"] == "file_planner"
+    assert call["tokens_per_sec"] == 25.0
+    assert call["prompt_tokens_per_sec"] == 400.0
+    assert call["load_seconds"] == 1.0
+    assert call["queue_seconds"] == 0.5
+
+    timing = usage.to_dict()["timing"]
+    assert timing["timed_calls"] == 1 and timing["eval_seconds"] == 2.0
+
+
+class OllamaAgent:
+    def execute(self, task, context):
+        OllamaLLM(model="qwen2.5-coder:7b").generate(task)
+        return {task: True}
+
+
+def test_executor_log_carries_tagged_calls(monkeypatch, agent_factory):
+    _ollama_response(monkeypatch)
+    factory = agent_factory(OllamaAgent)
+    steps = [{"step": name, "agent": "planner", "retry": 1, "on_failure": "abort"} for name in ("a", "b")]
+
+    result = WorkflowExecutor(factory).execute({"steps": steps}, {})
+
+    calls = result["log"][1]["llm_calls"]
+    assert [(c["step"], c["agent"]) for c in calls] == [("b", "planner")]
+    run_usage = result["usage"]
+    assert run_usage["timing"]["load_seconds"] == 2.0
+    assert run_usage["by_model"]["qwen2.5-coder:7b"]["calls"] == 2
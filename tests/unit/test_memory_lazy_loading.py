@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.memory import MemoryScope
+from botsmith.memory.long_term import KnowledgeMemory
+from botsmith.persistence.agent_memory_repository import AgentMemoryRepository
+
+
+def _repo_with_entries(tmp_path, count):
+    repo = AgentMemoryRepository(str(tmp_path / "memory.db"))
+    repo.init_schema()
+    repo.save_entries([(MemoryScope.PROJECT, f"interaction_{i:03d}", {"n": i}, {}) for i in range(count)])
+    repo.save_entry(MemoryScope.PROJECT, "fact:language", "python", {})
+    return repo
+
+
+def test_opening_a_store_reads_nothing(tmp_path):
+    repo = _repo_with_entries(tmp_path, 50)
+
+    with patch.object(repo, "load_scope", side_effect=AssertionError("full scope load")):
+        store = KnowledgeMemory("p", repository=repo, cache_size=10)
+        assert store.read("interaction_042") == {"n": 42}
+        assert store.read("missing") is None
+
+    assert len(store._data) == 2
+
+
+def test_cache_is_bounded_and_read_through(tmp_path):
+    repo = _repo_with_entries(tmp_path, 50)
+    store = KnowledgeMemory("p", repository=repo, cache_size=5)
+
+    for i in range(20):
+        store.read(f"interaction_{i:03d}")
+    store.write("interaction_000", {"n": "new"})
+
+    assert len(store._data) == 5
+    assert store.read("interaction_000") == {"n": "new"}
+    assert store.read("interaction_003") == {"n": 3}
+
+
+def test_prefetch_and_streaming_snapshot(tmp_path):
+    repo = _repo_with_entries(tmp_path, 50)
+    store = KnowledgeMemory("p", repository=repo, prefetch_prefixes=["fact:"])
+
+    assert list(store._data) == ["fact:language"]
+
+    snapshot = store.snapshot()
+    assert not isinstance(snapshot, dict)
+    keys = [key for key, _ in snapshot]
+    assert len(keys) == 51 and keys == sorted(keys)
+    assert [key for key, _ in repo.iter_scope(MemoryScope.PROJECT, "interaction_04")] == [f"interaction_04{i}" for i in range(10)]
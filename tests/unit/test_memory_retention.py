@@ -0,0 +1,117 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.memory import MemoryScope
+from botsmith.memory import ArtifactStore, MemoryCompactor, RetentionPolicy, SQLiteMemoryManager
+from botsmith.persistence.agent_memory_repository import AgentMemoryRepository
+from botsmith.persistence.database import ConnectionManager, file_size, get_connection
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = AgentMemoryRepository(str(tmp_path / "memory.db"))
+    repo.init_schema()
+    yield repo
+    ConnectionManager.close_all()
+
+
+def _save(repo, key, days_old=0, source="agent:a", value="x"):
+    updated = (datetime.utcnow() - timedelta(days=days_old)).isoformat()
+    repo.save_entries([(MemoryScope.PROJECT, key, value, {"updated_at": updated, "source": source})])
+
+
+def _keys(repo):
+    return [key for key, _ in repo.iter_scope(MemoryScope.PROJECT)]
+
+
+def test_max_age_only_applies_to_the_prefix(repo):
+    _save(repo, "interaction:a:1", days_old=40)
+    _save(repo, "interaction:a:2", days_old=1)
+    _save(repo, "spec", days_old=40)
+
+    compactor = MemoryCompactor(repo, [RetentionPolicy(MemoryScope.PROJECT, "interaction:", max_age_days=30)])
+    result = compactor.compact(vacuum_db=False)
+
+    assert result["deleted"] == 1
+    assert _keys(repo) == ["interaction:a:2", "spec"]
+
+
+def test_newest_entries_are_kept_per_agent(repo):
+    for i in range(4):
+        _save(repo, f"interaction:a:{i}", days_old=4 - i, source="agent:a")
+    _save(repo, "interaction:b:0", days_old=9, source="agent:b")
+
+    assert repo.trim_per_source(MemoryScope.PROJECT, "interaction:", 2) == 2
+    assert _keys(repo) == ["interaction:a:2", "interaction:a:3", "interaction:b:0"]
+
+
+def test_oldest_entries_go_first_over_max_bytes(repo):
+    for i in range(5):
+        _save(repo, f"k{i}", days_old=5 - i, value="v" * 100)
+
+    row_bytes = get_connection(repo.db_path).execute(
+        "SELECT LENGTH(value) + LENGTH(metadata) FROM memory_store WHERE key = 'k0'"
+    ).fetchone()[0]
+
+    assert repo.trim_to_size(MemoryScope.PROJECT, None, row_bytes * 2 + row_bytes // 2) == 3
+    assert _keys(repo) == ["k3", "k4"]
+
+
+def test_store_delete_reaches_the_database(tmp_path):
+    manager = SQLiteMemoryManager(db_path=str(tmp_path / "memory.db"), flush_interval=60)
+    store = manager.get_store(MemoryScope.PROJECT)
+    store.write("a", 1)
+    store.write("b", 2)
+    manager.flush()
+
+    store.delete("a")
+    store.delete("b")
+
+    fresh = SQLiteMemoryManager(db_path=str(tmp_path / "memory.db"))
+    assert fresh.get_store(MemoryScope.PROJECT).read("a") is None
+    assert [key for key, _ in fresh.repository.iter_scope(MemoryScope.PROJECT)] == []
+    ConnectionManager.close_all()
+
+
+def test_compaction_drops_cached_entries_and_reclaims_space(tmp_path):
+    manager = SQLiteMemoryManager(db_path=str(tmp_path / "memory.db"), flush_interval=60)
+    store = manager.get_store(MemoryScope.PROJECT)
+    for i in range(200):
+        store.write(f"interaction:a:{i:03d}", "x" * 2000)
+    assert store.read("interaction:a:000") is not None
+
+    compactor = MemoryCompactor(
+        manager.repository,
+        [RetentionPolicy(MemoryScope.PROJECT, "interaction:", max_entries_per_agent=10)],
+        stores=[store],
+    )
+    result = compactor.compact()
+
+    assert result["deleted"] == 190
+    assert result["size_after"] < result["size_before"]
+    assert result["size_after"] == file_size(manager.repository.db_path)
+    assert store.read("interaction:a:000") is None
+    assert store.read("interaction:a:199") == "x" * 2000
+    ConnectionManager.close_all()
+
+
+def test_unreferenced_artifacts_are_collected(repo, tmp_path, monkeypatch):
+    artifacts = ArtifactStore(str(tmp_path / "artifacts"), inline_limit=10)
+    kept = artifacts.put("kept " * 20)
+    dropped = artifacts.put("dropped " * 20)
+    _save(repo, "file:main.py", value={"code": kept})
+
+    compactor = MemoryCompactor(repo, [], artifact_store=artifacts)
+    assert compactor.compact(vacuum_db=False)["artifacts_deleted"] == 0
+
+    monkeypatch.setattr(MemoryCompactor, "ARTIFACT_GRACE_SECONDS", 0)
+    assert compactor.compact(vacuum_db=False)["artifacts_deleted"] == 1
+    assert artifacts.exists(kept[ArtifactStore.REF_KEY])
+    assert not artifacts.exists(dropped[ArtifactStore.REF_KEY])
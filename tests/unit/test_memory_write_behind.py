@@ -0,0 +1,122 @@
+import sys
+import time
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.memory import MemoryScope
+from botsmith.memory import SQLiteMemoryManager
+from botsmith.memory.write_behind import WriteBehindRepository
+
+
+def test_writes_are_batched_until_flush():
+    repo = MagicMock()
+    buffer = WriteBehindRepository(repo, max_batch=100, flush_interval=60)
+
+    buffer.save_entry(MemoryScope.PROJECT, "a", 1, {})
+    buffer.save_entry(MemoryScope.PROJECT, "b", 2, {})
+    buffer.save_entry(MemoryScope.PROJECT, "a", 3, {})
+
+    repo.save_entries.assert_not_called()
+    assert buffer.flush() == 2
+    (entries,), _ = repo.save_entries.call_args
+    assert [(key, value) for _, key, value, _ in entries] == [("a", 3), ("b", 2)]
+    assert buffer.flush() == 0
+    buffer.close()
+
+
+def test_full_batch_is_flushed_in_the_background():
+    repo = MagicMock()
+    buffer = WriteBehindRepository(repo, max_batch=2, flush_interval=60)
+
+    buffer.save_entry(MemoryScope.PROJECT, "a", 1, {})
+    buffer.save_entry(MemoryScope.PROJECT, "b", 2, {})
+
+    deadline = time.monotonic() + 2
+    while buffer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert repo.save_entries.call_count == 1
+    buffer.close()
+
+
+def test_failed_flush_keeps_entries():
+    repo = MagicMock()
+    repo.save_entries.side_effect = [RuntimeError("locked"), None]
+    buffer = WriteBehindRepository(repo, max_batch=100, flush_interval=60)
+    buffer.save_entry(MemoryScope.USER, "a", 1, {})
+
+    try:
+        buffer.flush()
+    except RuntimeError:
+        pass
+
+    assert buffer.pending == 1
+    assert buffer.flush() == 1
+    buffer.close()
+
+
+def test_write_through_commits_immediately():
+    repo = MagicMock()
+    buffer = WriteBehindRepository(repo, durability="write_through")
+
+    buffer.save_entry(MemoryScope.USER, "a", 1, {})
+
+    repo.save_entry.assert_called_once()
+    assert buffer.pending == 0
+
+
+def test_new_manager_sees_buffered_writes(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    first = SQLiteMemoryManager(db_path=db_path, flush_interval=60)
+    first.get_store(MemoryScope.PROJECT).write("interaction_1", {"task": "t"})
+
+    assert first._repository.pending == 1
+    second = SQLiteMemoryManager(db_path=db_path)
+
+    assert second.get_store(MemoryScope.PROJECT).read("interaction_1") == {"task": "t"}
+    # Read from the pending writes, not by committing them
+    assert first._repository.pending == 1
+
+
+def test_scope_reads_merge_pending_writes_without_flushing(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    first = SQLiteMemoryManager(db_path=db_path, flush_interval=60)
+    second = SQLiteMemoryManager(db_path=db_path, flush_interval=60)
+    first._repository.save_entry(MemoryScope.PROJECT, "b", "stored", {})
+    first.flush()
+
+    first._repository.save_entry(MemoryScope.PROJECT, "c", 1, {})
+    second._repository.save_entry(MemoryScope.PROJECT, "a", 2, {})
+    second._repository.save_entry(MemoryScope.PROJECT, "b", "pending", {})
+    first._repository.save_entry(MemoryScope.USER, "a", 3, {})
+
+    entries = list(first._repository.iter_scope(MemoryScope.PROJECT))
+
+    assert [(key, entry["value"]) for key, entry in entries] == [("a", 2), ("b", "pending"), ("c", 1)]
+    assert first._repository.pending == 2
+    assert second._repository.pending == 2
+
+
+def test_entries_stay_readable_while_being_flushed():
+    repo = MagicMock(db_path="slow.db")
+    repo.load_entry.return_value = None
+    repo.iter_scope.return_value = iter([])
+    writing, release = threading.Event(), threading.Event()
+    repo.save_entries.side_effect = lambda entries: writing.set() or release.wait(5)
+    buffer = WriteBehindRepository(repo, max_batch=100, flush_interval=60)
+    buffer.save_entry(MemoryScope.PROJECT, "a", 1, {})
+
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert writing.wait(5)
+    try:
+        assert buffer.load_entry(MemoryScope.PROJECT, "a")["value"] == 1
+        assert [key for key, _ in buffer.iter_scope(MemoryScope.PROJECT)] == ["a"]
+    finally:
+        release.set()
+        flusher.join()
+    buffer.close()
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import requests
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.app import BotSmithApp
+from botsmith.core.exceptions.custom_exceptions import ConfigurationError, ModelNotFoundError
+from botsmith.factory.agent_factory import AgentFactory
+from botsmith.llm.cache import request_key
+from botsmith.llm.fallback import ModelFallbackLLM
+from botsmith.llm.router import LLMRouter
+from botsmith.llm.wrapper import OllamaLLM
+
+
+def test_tier_options_are_sent_and_keyed():
+    small = OllamaLLM(model="qwen2.5:3b", options={"num_predict": 512})
+    plain = OllamaLLM(model="qwen2.5:3b")
+
+    assert small._build_payload("hi")["options"] == {"num_predict": 512}
+    assert "options" not in plain._build_payload("hi")
+    assert request_key(small, "hi") != request_key(plain, "hi")
+
+
+def test_factory_prefers_tier_llm():
+    local, code, small = MagicMock(model_id="local"), MagicMock(model_id="big"), MagicMock(model_id="small")
+    factory = AgentFactory(local_llm=local, memory_manager=MagicMock(), code_llm=code, tier_llms={"nlp": small})
+
+    assert factory.model_id_for("nlp") == "small"
+    assert factory.model_id_for("coder") == "big"
+    assert factory.model_id_for("validator") == "local"
+
+
+def _app_with_tiers(tiers):
+    app = BotSmithApp.__new__(BotSmithApp)
+    app.config = MagicMock(model_tiers=tiers)
+    app.llm_cache = None
+    app.local_llm = OllamaLLM(model="qwen2.5-coder:7b")
+    app.gemini_llm = app.groq_llm = None
+    return app
+
+
+def test_build_tier_llms(monkeypatch):
+    monkeypatch.setattr(OllamaLLM, "is_installed", lambda self: None)
+    app = _app_with_tiers({
+        "nlp": {"model": "qwen2.5:3b", "options": {"num_ctx": 2048}},
+        "coder": {"model": "qwen2.5-coder:7b"},
+    })
+
+    tiers = app._build_tier_llms(cache_bypass=False, coalesce=False)
+
+    assert tiers["nlp"].model_id == "ollama:qwen2.5:3b"
+    assert tiers["nlp"].options == {"num_ctx": 2048}
+    # File generation tiers are routed, with the tier model as primary
+    assert isinstance(tiers["coder"], LLMRouter)
+    assert tiers["coder"].primary.model_id == "ollama:qwen2.5-coder:7b"
+    assert tiers["coder"].options == {}
+
+
+def test_factory_keys_routed_tiers_by_primary_model():
+    router = LLMRouter(OllamaLLM(model="qwen2.5-coder:7b"), gemini_llm=MagicMock(model_id="gemini"))
+    factory = AgentFactory(local_llm=MagicMock(), memory_manager=MagicMock(), tier_llms={"coder": router})
+
+    assert factory.model_id_for("coder") == "ollama:qwen2.5-coder:7b"
+
+
+def test_tiers_without_installed_model_are_skipped(monkeypatch):
+    monkeypatch.setattr(OllamaLLM, "is_installed", lambda self: self.model != "qwen2.5:3b")
+    app = _app_with_tiers({
+        "nlp": {"model": "qwen2.5:3b"},
+        "coder": {"model": "qwen2.5-coder:7b"},
+    })
+
+    tiers = app._build_tier_llms(cache_bypass=False, coalesce=False)
+
+    assert sorted(tiers) == ["coder"]
+
+
+def test_unknown_model_error_is_detected():
+    response = MagicMock(status_code=404)
+    llm = OllamaLLM(model="qwen2.5:3b")
+
+    assert isinstance(llm._request_failed(requests.HTTPError(response=response)), ModelNotFoundError)
+    assert not isinstance(llm._request_failed(requests.ConnectionError()), ModelNotFoundError)
+
+
+def test_missing_model_falls_back_to_default_llm():
+    tier = MagicMock(model_id="ollama:qwen2.5:3b")
+    tier.generate.side_effect = ModelNotFoundError("not installed")
+    tier.stream.side_effect = ModelNotFoundError("not installed")
+    default = MagicMock(model_id="ollama:qwen2.5-coder:7b")
+    default.generate.return_value = "ok"
+    default.stream.return_value = iter(["o", "k"])
+    llm = ModelFallbackLLM(tier, fallback=default)
+
+    assert llm.model_id == "ollama:qwen2.5:3b"
+    assert llm.generate("p") == "ok"
+    assert llm.model_id == "ollama:qwen2.5-coder:7b"
+    assert list(llm.stream("p")) == ["o", "k"]
+    assert tier.generate.call_count == 1
+    tier.stream.assert_not_called()
+
+
+def test_unknown_tier_backend_is_rejected():
+    app = _app_with_tiers({"nlp": {"model": "x", "backend": "openai"}})
+
+    with pytest.raises(ConfigurationError):
+        app._build_tier_llms(cache_bypass=False, coalesce=False)
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError, ModelNotFoundError
+from botsmith.llm.cache import CachedLLM
+from botsmith.llm.single_flight import CoalescingLLM
+from botsmith.llm.warmup import ModelWarmer
+from botsmith.llm.wrapper import OllamaLLM
+
+
+def test_keep_alive_is_sent_per_request(monkeypatch):
+    monkeypatch.setattr(OllamaLLM, "KEEP_ALIVE", "30m")
+
+    assert OllamaLLM(model="a")._build_payload("p")["keep_alive"] == "30m"
+    assert OllamaLLM(model="a", keep_alive=-1)._build_payload("p")["keep_alive"] == -1
+
+
+def test_is_loaded_matches_latest_tag():
+    loaded = {"qwen2.5-coder:latest": {}, "qwen2.5:3b": {}}
+
+    assert OllamaLLM(model="qwen2.5-coder").is_loaded(loaded)
+    assert OllamaLLM(model="qwen2.5:3b").is_loaded(loaded)
+    assert not OllamaLLM(model="qwen2.5-coder:7b").is_loaded(loaded)
+
+
+def _warmer(monkeypatch, resident, failing=(), missing=()):
+    def preload(self):
+        if self.model in missing:
+            raise ModelNotFoundError("not installed")
+        if self.model in failing:
+            raise LLMUnavailableError("model not found")
+        resident.add(self.model)
+
+    monkeypatch.setattr(OllamaLLM, "preload", preload)
+    monkeypatch.setattr(OllamaLLM, "loaded_models", lambda self: {name: {} for name in resident})
+
+    big, small = OllamaLLM(model="big"), OllamaLLM(model="small")
+    wrapped_big = CoalescingLLM(CachedLLM(OllamaLLM(model="big"), MagicMock()))
+    return ModelWarmer([big, wrapped_big, small, MagicMock()])
+
+
+def test_warmer_loads_each_model_once(monkeypatch):
+    resident = set()
+    warmer = _warmer(monkeypatch, resident)
+
+    assert warmer.status()["ready"] is False
+    warmer.start()
+    warmer.join(5)
+
+    status = warmer.status()
+    assert status["ready"] is True
+    assert sorted(status["models"]) == ["big", "small"]
+    assert status["models"]["big"]["state"] == "ready"
+
+
+def test_failed_or_evicted_models_are_not_ready(monkeypatch):
+    resident = set()
+    warmer = _warmer(monkeypatch, resident, failing={"small"})
+
+    warmer.warm()
+    status = warmer.status()
+    assert status["ready"] is False
+    assert status["models"]["small"] == {"state": "failed", "error": "model not found", "resident": False}
+
+    # keep_alive expired after a successful warm-up
+    resident.clear()
+    assert warmer.status()["models"]["big"]["resident"] is False
+
+
+def test_missing_models_do_not_block_readiness(monkeypatch):
+    warmer = _warmer(monkeypatch, set(), missing={"small"})
+
+    warmer.warm()
+    status = warmer.status()
+    assert status["ready"] is True
+    assert status["models"]["small"]["state"] == "missing"
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.wrapper import OllamaLLM
+
+
+class FakeResponse:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"response": "ok"}
+
+
+class FakeSession:
+    def __init__(self):
+        self.gets = 0
+        self.fail_post = False
+
+    def get(self, url, timeout=None):
+        self.gets += 1
+        return FakeResponse()
+
+    def post(self, url, json=None, timeout=None):
+        if self.fail_post:
+            raise requests.ConnectionError("connection reset")
+        return FakeResponse()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(OllamaLLM, "_sessions", {"http://pool-test:11434": fake})
+    monkeypatch.setattr(OllamaLLM, "_availability", {})
+    return fake
+
+
+def test_wrappers_share_one_session_per_server(session):
+    local = OllamaLLM(model="a", base_url="http://pool-test:11434/")
+    code = OllamaLLM(model="b", base_url="http://pool-test:11434")
+    assert local._session() is code._session() is session
+
+
+def test_availability_probe_is_cached_and_invalidated(session):
+    local = OllamaLLM(base_url="http://pool-test:11434")
+    code = OllamaLLM(model="b", base_url="http://pool-test:11434")
+
+    for _ in range(3):
+        assert local.generate("p") == "ok"
+        assert code.generate("p") == "ok"
+    assert session.gets == 1
+
+    session.fail_post = True
+    with pytest.raises(LLMUnavailableError):
+        local.generate("p")
+
+    session.fail_post = False
+    assert code.generate("p") == "ok"
+    assert session.gets == 2
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.agents.specialized.code_generator_agent import CodeGeneratorAgent
+from botsmith.llm.prompt_budget import PromptBudget, truncate
+from botsmith.llm.usage import UsageMeter
+
+
+def test_lowest_priority_sections_are_cut_first():
+    budget = PromptBudget(60)
+    budget.add("task", "t" * 100, required=True)
+    budget.add("request", "r" * 80, priority=2, shrink=truncate)
+    budget.add("notes", "n" * 400, priority=1)
+
+    built = budget.build()
+
+    assert built["dropped"] == ["notes"]
+    assert built["trimmed"] == []
+    assert built["prompt"] == "t" * 100 + "\n\n" + "r" * 80
+    assert built["tokens"] <= built["budget"]
+
+
+def test_required_sections_survive_a_tiny_budget():
+    built = PromptBudget(5).add("task", "t" * 100, required=True).add("request", "r" * 100, shrink=truncate).build()
+
+    assert built["prompt"] == "t" * 100
+    assert built["dropped"] == ["request"]
+
+
+def test_budget_follows_model_options(monkeypatch):
+    monkeypatch.setattr(PromptBudget, "_context_windows", {"big": 16000})
+
+    assert PromptBudget.for_llm(MagicMock(options={"num_ctx": 2048, "num_predict": 512}, model="big")).max_tokens == 1536
+    assert PromptBudget.for_llm(MagicMock(options={}, model="big"), "s" * 399).max_tokens == 16000 - 1024 - 100
+    assert PromptBudget.for_llm(MagicMock(options={"num_predict": -1}, model="other")).max_tokens == 4096 - 1024
+
+
+def _recorded(prompt, system_prompt):
+    UsageMeter.record("recording", len(prompt) // 4, 10, model="tiny")
+    return "x = 1"
+
+
+def test_code_generator_fits_prompt_and_reports_it(fake_llm):
+    llm = fake_llm(_recorded, name="tiny", backend="recording", options={"num_ctx": 1400, "num_predict": 256})
+    agent = CodeGeneratorAgent(agent_id="coder", agent_type="code", llm=llm, memory_manager=MagicMock())
+    files = [f"pkg/sub{i // 10}/module_{i}.py" for i in range(200)] + ["main.py"]
+
+    with UsageMeter.track() as usage:
+        result = agent.execute("generate", {
+            "filename": "pkg/sub0/module_0.py",
+            "description": "Helpers",
+            "original_request": "Build a bot",
+            "project_structure": files,
+        })
+
+    prompt, system_prompt = llm.calls[0]
+    assert system_prompt.startswith(CodeGeneratorAgent.SYSTEM_PROMPT)
+    assert "Project Request:\nBuild a bot" in system_prompt
+    assert "- main.py" in system_prompt and "- pkg/sub1/ (10 files)" in system_prompt
+    assert "Rules:" not in prompt
+    assert "- pkg/sub0/module_9.py" in prompt
+    assert result["prompt"]["trimmed"] == ["project_structure"]
+    assert result["prompt"]["tokens"] <= result["prompt"]["budget"]
+
+    call = usage.calls_detail()[0]
+    assert call["prompt_estimate"] == result["prompt"]["tokens"]
+    assert call["prompt_shared"] == result["prompt"]["shared_tokens"]
+    assert call["prompt_cut"] == ["project_structure"]
+
+
+def test_files_of_a_project_share_the_system_prompt(fake_llm):
+    llm = fake_llm(_recorded, name="tiny", backend="recording", options={"num_ctx": 8192})
+    agent = CodeGeneratorAgent(agent_id="coder", agent_type="code", llm=llm, memory_manager=MagicMock())
+    files = ["config.py", "bot/client.py", "main.py"]
+
+    for filename in files:
+        agent.execute("generate", {
+            "filename": filename,
+            "description": f"Purpose of {filename}",
+            "original_request": "Build a bot",
+            "project_structure": files,
+        })
+
+    prompts = [prompt for prompt, _ in llm.calls]
+    system_prompts = {system_prompt for _, system_prompt in llm.calls}
+    assert len(system_prompts) == 1
+    assert "- bot/client.py" in system_prompts.pop()
+    # only the per-file part differs between calls
+    assert all(prompt.startswith(f"Generate production-grade code for: {name}") for prompt, name in zip(prompts, files))
+    assert all("Project Request" not in prompt for prompt in prompts)
@@ -0,0 +1,54 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.llm.rate_limiter import RateLimiter, TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def reset_limits(monkeypatch):
+    monkeypatch.setattr(RateLimiter, "_requests", {})
+    monkeypatch.setattr(RateLimiter, "_tokens", {})
+    monkeypatch.setattr(RateLimiter, "_blocked_until", {})
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate_per_minute=60)  # one per second
+    now = 100.0
+    bucket.updated = now
+
+    waits = [bucket.reserve(1, now) for _ in range(62)]
+    assert waits[:60] == [0.0] * 60
+    # queued callers get increasing, distinct waits instead of one shared retry time
+    assert waits[60] == pytest.approx(1.0)
+    assert waits[61] == pytest.approx(2.0)
+
+
+def test_requests_and_tokens_are_both_limited():
+    RateLimiter.configure({"cloud": {"requests_per_minute": 6000, "tokens_per_minute": 600}})
+
+    assert RateLimiter._reserve("cloud", 600) == 0.0
+    # 10 tokens/sec refill: 100 more tokens need ~10s
+    assert RateLimiter._reserve("cloud", 100) == pytest.approx(10.0, rel=0.01)
+    # unconfigured providers are not throttled
+    assert RateLimiter._reserve("other", 10**6) == 0.0
+
+
+def test_penalize_pauses_all_callers_with_jitter():
+    RateLimiter.configure({"cloud": {"requests_per_minute": 6000}})
+
+    delays = {RateLimiter.penalize("cloud", attempt=2) for _ in range(20)}
+    assert all(2.0 <= d <= 4.0 for d in delays)
+    assert len(delays) > 1
+    assert RateLimiter._reserve("cloud", 0) > 1.0
+
+    RateLimiter.penalize("fast", attempt=0, retry_after=0.05)
+    started = time.monotonic()
+    RateLimiter.acquire("fast")
+    assert time.monotonic() - started >= 0.04
@@ -0,0 +1,110 @@
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.single_flight import CoalescingLLM
+
+
+def _slow_llm(fake_llm, fail=False):
+    """Answers "<prompt>#<call>" after 100ms; streams a, b, c."""
+    llm = fake_llm(lambda prompt, _: f"{prompt}#{len(llm.calls)}", name="m", delay=0.1,
+                   fail=fail, chunks=["a", "b", "c"], chunk_delay=0.03)
+    return llm
+
+
+def test_concurrent_identical_sync_calls_share_one_request(fake_llm):
+    llm = _slow_llm(fake_llm)
+    coalescing = CoalescingLLM(llm)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(coalescing.generate("p"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(llm.calls) == 1
+    assert results == ["p#1"] * 5
+    assert coalescing.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+    # nothing is stored once the request finished
+    assert coalescing.generate("p") == "p#2"
+
+
+def test_async_calls_coalesce_only_identical_requests(fake_llm):
+    llm = _slow_llm(fake_llm)
+    coalescing = CoalescingLLM(llm)
+
+    async def run():
+        return await asyncio.gather(
+            coalescing.agenerate("p"),
+            coalescing.agenerate("p"),
+            coalescing.agenerate("p", "other system prompt"),
+        )
+
+    first, second, third = asyncio.run(run())
+    assert first == second
+    assert len(llm.calls) == 2
+
+
+def test_errors_reach_every_waiter(fake_llm):
+    coalescing = CoalescingLLM(_slow_llm(fake_llm, fail=True))
+
+    async def run():
+        return await asyncio.gather(*(coalescing.agenerate("p") for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(e, LLMUnavailableError) for e in errors)
+
+
+def test_cancelled_leader_releases_waiters(fake_llm):
+    coalescing = CoalescingLLM(_slow_llm(fake_llm))
+
+    async def run():
+        leader = asyncio.create_task(coalescing.agenerate("p"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(coalescing.agenerate("p"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(LLMUnavailableError):
+            await follower
+
+    asyncio.run(run())
+    assert coalescing.stats()["in_flight"] == 0
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_identical_streams_fan_out_from_one_request(fake_llm):
+    llm = _slow_llm(fake_llm)
+    coalescing = CoalescingLLM(llm)
+
+    async def run():
+        first = asyncio.create_task(_collect(coalescing.astream("p")))
+        await asyncio.sleep(0.05)
+        # joins after the first chunk and still gets every chunk
+        late = asyncio.create_task(_collect(coalescing.astream("p")))
+        return await asyncio.gather(first, late)
+
+    assert asyncio.run(run()) == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(llm.calls) == 1
+    assert coalescing.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+
+def test_stream_errors_reach_followers(fake_llm):
+    coalescing = CoalescingLLM(_slow_llm(fake_llm, fail=True))
+
+    async def run():
+        return await asyncio.gather(*(_collect(coalescing.astream("p")) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(e, LLMUnavailableError) for e in asyncio.run(run()))
@@ -0,0 +1,70 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.persistence.database import ConnectionManager, get_connection, init_db
+from botsmith.persistence.models import WorkflowStepResult
+from botsmith.persistence.repository import WorkflowRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    yield WorkflowRepository(db_path)
+    ConnectionManager.close_all()
+
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_one_tuned_connection_per_thread(repo):
+    conn = get_connection(repo.db_path)
+
+    assert get_connection(repo.db_path) is conn
+    assert _in_thread(lambda: get_connection(repo.db_path)) is not conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == ConnectionManager.BUSY_TIMEOUT_MS
+
+    # Legacy close() calls leave the shared connection usable
+    conn.close()
+    assert repo.create_run("wf", "running") == 1
+
+
+def test_transaction_commits_once_at_the_end(repo):
+    with repo.transaction():
+        run_id = repo.create_run("wf", "running")
+        repo.save_step(WorkflowStepResult(run_id, "plan", "planner", "success", "{}"))
+        # other connections do not see the unit of work until it commits
+        assert _in_thread(lambda: repo.get_run(run_id)) is None
+
+    assert _in_thread(lambda: [s.step_name for s in repo.list_steps(run_id)]) == ["plan"]
+
+
+def test_failed_transaction_rolls_back(repo):
+    with pytest.raises(RuntimeError):
+        with repo.transaction():
+            run_id = repo.create_run("wf", "running")
+            raise RuntimeError("boom")
+
+    assert repo.get_run(run_id) is None
+    assert repo.create_run("wf", "running") == run_id
+
+
+def test_close_all_reopens_on_next_use(repo):
+    run_id = repo.create_run("wf", "running")
+    ConnectionManager.close_all()
+
+    assert repo.get_run(run_id).status == "running"
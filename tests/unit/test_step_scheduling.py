@@ -0,0 +1,93 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.workflows.step_graph import resolve_dependencies
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+def step(name, **fields):
+    return {"step": name, "agent": "executor", "retry": 1, "on_failure": "abort", **fields}
+
+
+def test_legacy_steps_stay_linear():
+    steps = [step("a"), step("b"), step("c")]
+    assert resolve_dependencies(steps) == [set(), {0}, {1}]
+
+
+def test_reads_after_writes_create_edges():
+    steps = [
+        step("a", depends_on=[], writes=["x"]),
+        step("b", depends_on=[], writes=["y"]),
+        step("c", depends_on=["a"], reads=["y"]),
+    ]
+    assert resolve_dependencies(steps) == [set(), set(), {0, 1}]
+
+
+def test_forward_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_dependencies([step("a", depends_on=["b"]), step("b", depends_on=[])])
+
+
+class Agent:
+    def __init__(self, delays, running, failures):
+        self.delays = delays
+        self.running = running
+        self.failures = failures
+
+    def execute(self, task, context):
+        self.running.append(("start", task))
+        time.sleep(self.delays.get(task, 0))
+        self.running.append(("end", task))
+        if task in self.failures:
+            raise RuntimeError(f"{task} broke")
+        return {task: True, "seen": sorted(k for k in context if k in ("s1", "s2", "s3"))}
+
+
+def _executor(agent_factory, delays, failures=(), workers=4):
+    trace = []
+    factory = agent_factory(lambda: Agent(delays, trace, failures))
+    return WorkflowExecutor(factory, max_parallel_steps=workers), trace
+
+
+def test_independent_steps_overlap_and_commit_in_order(agent_factory):
+    steps = [
+        step("s1", depends_on=[], writes=["s1"]),
+        step("s2", depends_on=[], writes=["s2"]),
+        step("s3", depends_on=[], reads=["s1"], writes=["s3"]),
+    ]
+    executor, trace = _executor(agent_factory, {"s1": 0.2, "s2": 0.05})
+    events = []
+
+    result = executor.execute({"steps": steps}, {}, lambda t, d: events.append((t, d.get("step"))))
+
+    assert result["status"] == "success"
+    # s2 ran while s1 was still running, s3 waited for s1
+    assert trace.index(("start", "s2")) < trace.index(("end", "s1"))
+    assert trace.index(("start", "s3")) > trace.index(("end", "s1"))
+    assert [entry["step"] for entry in result["log"]] == ["s1", "s2", "s3"]
+    assert [d for t, d in events if t == "step_complete"] == ["s1", "s2", "s3"]
+    # s3 saw the output of its dependency
+    assert result["context"]["seen"] == ["s1", "s2"]
+
+
+def test_abort_stops_scheduling_and_continue_does_not(agent_factory):
+    steps = [
+        step("s1", depends_on=[], writes=["s1"], on_failure="continue"),
+        step("s2", depends_on=["s1"], writes=["s2"]),
+        step("s3", depends_on=["s2"], writes=["s3"]),
+    ]
+    executor, trace = _executor(agent_factory, {}, failures={"s1", "s2"})
+
+    result = executor.execute({"steps": steps}, {})
+
+    assert result["status"] == "failed"
+    assert result["failed_step"] == "s2"
+    assert ("start", "s3") not in trace
+    assert [entry["status"] for entry in result["log"]] == ["failed", "failed"]
@@ -0,0 +1,98 @@
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import LLMUnavailableError
+from botsmith.llm.wrapper import OllamaLLM
+from botsmith.utils.filesystem import LocalFileSystem
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+class FakeSession:
+    def __init__(self, lines):
+        self.lines = lines
+        self.posted = {}
+
+    def post(self, url, json=None, timeout=None, stream=False):
+        self.posted.update(json)
+        return FakeStreamResponse(self.lines)
+
+
+class FakeStreamResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+def _ollama(monkeypatch, records):
+    session = FakeSession([json.dumps(r).encode() for r in records])
+    monkeypatch.setattr(OllamaLLM, "_session", lambda self: session)
+    monkeypatch.setattr(OllamaLLM, "is_available", lambda self: True)
+    return session.posted
+
+
+def test_ollama_stream_decodes_ndjson(monkeypatch):
+    posted = _ollama(monkeypatch, [
+        {"response": "def "},
+        {"response": "run"},
+        {"response": "():", "done": False},
+        {"response": "", "done": True, "eval_count": 3},
+    ])
+
+    assert list(OllamaLLM().stream("p", "sys")) == ["def ", "run", "():"]
+    assert posted["stream"] is True
+
+
+def test_ollama_stream_surfaces_errors(monkeypatch):
+    _ollama(monkeypatch, [{"response": "x"}, {"error": "model not found"}])
+
+    with pytest.raises(LLMUnavailableError):
+        list(OllamaLLM().stream("p"))
+
+
+def _not_streamed(prompt, system_prompt):
+    raise AssertionError("streaming path expected")
+
+
+def test_executor_emits_file_progress(tmp_path, fake_llm, agent_factory):
+    llm = fake_llm(_not_streamed, chunks=["def ", "run", "():\n", "    ", "return 1\n"], sync=False)
+    executor = WorkflowExecutor(agent_factory(llm=llm))
+    executor.PROGRESS_INTERVAL = 3600
+
+    events = []
+    context = {
+        "project_name": "bot",
+        "files": [{"filename": "main.py", "description": "entry"}],
+        "filesystem": LocalFileSystem(str(tmp_path)),
+    }
+    result = asyncio.run(
+        executor._run_generate_all_files(context, {"step": "generate_all_files"}, lambda t, d: events.append((t, d)))
+    )
+
+    assert (tmp_path / "bot" / "main.py").read_text() == "def run():\n    return 1"
+    assert [f["filename"] for f in result["generated_files"]] == ["main.py"]
+
+    progress = [d for t, d in events if t == "file_progress"]
+    # first chunk immediately, then the throttled remainder at completion
+    assert [p["tokens"] for p in progress] == [1, 5]
+    assert progress[-1]["bytes"] == len("def run():\n    return 1\n")
+    assert progress[-1]["tokens_per_sec"] > 0
+    assert [t for t, _ in events] == ["file_start", "file_progress", "file_progress", "file_complete"]
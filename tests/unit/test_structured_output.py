@@ -0,0 +1,85 @@
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.core.exceptions.custom_exceptions import StructuredOutputError
+from botsmith.agents.specialized.file_plan_agent import FilePlanAgent
+from botsmith.nlp.semantic_parser import SemanticParser
+from botsmith.llm.wrapper import OllamaLLM
+from botsmith.utils.json_schema import extract_json, validate
+
+
+def test_extract_json_tolerates_fences_and_chatter():
+    assert extract_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert extract_json('Sure! Here it is: {"a": [1, 2]} Hope that helps.') == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        extract_json("no json here")
+
+
+def test_validate_reports_paths():
+    errors = validate(
+        {"files": [{"filename": 3}], "confidence": True},
+        {**FilePlanAgent.FILE_PLAN_SCHEMA, "properties": {
+            **FilePlanAgent.FILE_PLAN_SCHEMA["properties"],
+            "confidence": {"type": "number"},
+        }},
+    )
+    assert errors == [
+        "$.files[0]: missing required key 'description'",
+        "$.files[0].filename: expected string, got int",
+        "$.confidence: expected number, got bool",
+    ]
+
+
+def test_invalid_response_gets_one_repair_reask(fake_llm):
+    llm = fake_llm(['{"intent": "build_bot"}', '{"intent": "build_bot", "entities": {}, "confidence": 0.9}'])
+
+    result = llm.generate_json("make a bot", SemanticParser.INTENT_SCHEMA)
+
+    assert result["confidence"] == 0.9
+    repair_prompt, system_prompt = llm.calls[1]
+    assert "missing required key 'entities'" in repair_prompt
+    assert '"intent"' in system_prompt
+
+
+def test_second_failure_raises(fake_llm):
+    llm = fake_llm(["not json", "still not json"])
+
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(llm.agenerate_json("p", {"type": "object"}))
+    assert len(llm.calls) == 2
+
+
+def test_semantic_parser_falls_back_after_repair(fake_llm):
+    parser = SemanticParser(fake_llm(["nope", '{"intent": "fly"}']))
+    assert parser.parse("hi")["intent"] == "unknown"
+
+
+def test_file_plan_agent_uses_schema(fake_llm):
+    llm = fake_llm(['{"files": [{"filename": "src/bot/main.py", "description": "entry"}]}'])
+    agent = FilePlanAgent("planner", "file_planner", llm, MagicMock())
+
+    result = agent.execute("plan", {"project_name": "bot"})
+
+    assert result["files"] == [{"filename": "src/bot/main.py", "description": "entry"}]
+
+
+def test_ollama_sends_schema_as_format(monkeypatch):
+    posted = {}
+    response = MagicMock()
+    response.json.return_value = {"response": '{"files": []}'}
+    session = MagicMock()
+    session.post.side_effect = lambda url, json=None, timeout=None: posted.update(json) or response
+    monkeypatch.setattr(OllamaLLM, "_session", lambda self: session)
+    monkeypatch.setattr(OllamaLLM, "is_available", lambda self: True)
+
+    schema = {"type": "object"}
+    assert OllamaLLM().complete_json("p", schema) == '{"files": []}'
+    assert posted["format"] == schema
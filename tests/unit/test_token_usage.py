@@ -0,0 +1,131 @@
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from botsmith.agents.specialized.cost_estimator_agent import CostEstimatorAgent
+from botsmith.llm.usage import UsageMeter
+from botsmith.llm.wrapper import OllamaLLM
+from botsmith.persistence.database import init_db
+from botsmith.persistence.models import StepUsageRecord
+from botsmith.persistence.repository import WorkflowRepository
+from botsmith.workflows.workflow_executor import WorkflowExecutor
+
+
+def test_nested_tracking_and_task_isolation(monkeypatch):
+    monkeypatch.setattr(UsageMeter, "_prices", {"gemini": {"prompt": 1.0, "completion": 2.0}})
+
+    async def step(tokens):
+        with UsageMeter.track() as usage:
+            await asyncio.sleep(0)
+            UsageMeter.record("gemini", tokens, tokens)
+        return usage.to_dict()
+
+    async def run():
+        with UsageMeter.track() as total:
+            steps = await asyncio.gather(step(1000), step(10))
+        return total.to_dict(), steps
+
+    total, (first, second) = asyncio.run(run())
+
+    assert first["total_tokens"] == 2000 and second["total_tokens"] == 20
+    assert {k: total[k] for k in ("prompt_tokens", "completion_tokens", "calls", "cost")} == {
+        "prompt_tokens": 1010, "completion_tokens": 1010, "calls": 2, "cost": 3.03,
+    }
+
+
+def test_ollama_reports_eval_counts(monkeypatch):
+    response = MagicMock()
+    response.json.return_value = {"response": "ok", "prompt_eval_count": 12, "eval_count": 30}
+    session = MagicMock()
+    session.post.return_value = response
+    monkeypatch.setattr(OllamaLLM, "_session", lambda self: session)
+    monkeypatch.setattr(OllamaLLM, "is_available", lambda self: True)
+
+    with UsageMeter.track() as usage:
+        assert OllamaLLM().generate("p") == "ok"
+
+    assert usage.to_dict()["prompt_tokens"] == 12
+    assert usage.to_dict()["completion_tokens"] == 30
+
+
+class TokenSpendingAgent:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def execute(self, task, context):
+        self.calls.append(task)
+        UsageMeter.record("ollama", 40, 60)
+        return {task: True}
+
+
+def _run(agent_factory, tmp_path, token_budget=None):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    repo = WorkflowRepository(db_path)
+    calls = []
+    executor = WorkflowExecutor(agent_factory(lambda: TokenSpendingAgent(calls)), workflow_repo=repo, token_budget=token_budget)
+
+    steps = [{"step": name, "agent": "executor", "retry": 1, "on_failure": "abort"} for name in ("a", "b", "c")]
+    return executor.execute({"steps": steps}, {}), calls, repo
+
+
+def test_usage_is_reported_per_step_and_run(tmp_path, agent_factory):
+    result, _, repo = _run(agent_factory, tmp_path)
+
+    assert result["status"] == "success"
+    assert result["usage"]["total_tokens"] == 300
+    assert [entry["usage"]["total_tokens"] for entry in result["log"]] == [100, 100, 100]
+    assert repo.average_step_usage("b")["tokens_per_unit"] == 100
+
+
+def test_token_budget_stops_the_run(tmp_path, agent_factory):
+    result, calls, _ = _run(agent_factory, tmp_path, token_budget=150)
+
+    assert result["status"] == "failed"
+    assert result["budget_exceeded"] is True
+    assert result["failed_step"] == "b"
+    assert calls == ["a", "b"]
+
+
+def test_estimator_uses_history(tmp_path):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    repo = WorkflowRepository(db_path)
+    repo.save_step_usage(StepUsageRecord(1, "generate_all_files", "coder", 1000, 3000, 4, 0.2, units=4))
+    repo.save_step_usage(StepUsageRecord(2, "generate_all_files", "coder", 1000, 1000, 2, 0.0, units=1))
+
+    agent = CostEstimatorAgent("cost", "cost_estimator", MagicMock(), MagicMock())
+    result = agent.execute("estimate", {
+        "steps": [{"step": "generate_all_files"}, {"step": "deployment"}],
+        "file_count": 10,
+        # Scaffold output, not the plan
+        "files": [{"filename": f"f{i}.py"} for i in range(8)],
+        "usage_history": repo,
+    })
+
+    generate, deployment = result["breakdown"]
+    # 6000 tokens / 5 files, scaled to 10 planned files
+    assert generate == {"step": "generate_all_files", "cost": 0.4, "tokens": 12000, "source": "history"}
+    assert deployment["source"] == "default"
+    assert result["estimated_cost"] == 3.4
+
+
+def test_estimator_assumes_default_file_count_before_planning(tmp_path):
+    db_path = str(tmp_path / "runs.db")
+    init_db(db_path)
+    repo = WorkflowRepository(db_path)
+    repo.save_step_usage(StepUsageRecord(1, "generate_all_files", "coder", 500, 500, 1, 0.1, units=1))
+
+    agent = CostEstimatorAgent("cost", "cost_estimator", MagicMock(), MagicMock())
+    context = {"steps": [{"step": "generate_all_files"}], "usage_history": repo}
+
+    before_plan = agent.execute("cost_estimation", {**context, "files": ["bot/run.py"] * 8})
+    after_plan = agent.execute("cost_recheck", {**context, "file_count": 2})
+
+    assert before_plan["estimated_tokens"] == 1000 * CostEstimatorAgent.DEFAULT_FILE_COUNT
+    assert after_plan["estimated_tokens"] == 2000